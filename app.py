@@ -8,9 +8,13 @@ from flask import Flask
 from flask_socketio import SocketIO
 from chat import chat_bp, register_socketio_events  # Add register_socketio_events
 from nhl_routes import nhl_bp
+from nhl_routes.live import register_live_scores
+from nhl_routes.scheduler import register_nhl_scheduler
 from weather import weather_bp
 from game import game_bp
 from photos import photos_bp
+from layout import assets_bp
+from compress import init_compression
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB upload limit
@@ -22,10 +26,12 @@ app.register_blueprint(nhl_bp)
 app.register_blueprint(weather_bp)
 app.register_blueprint(game_bp)
 app.register_blueprint(photos_bp)
+app.register_blueprint(assets_bp)
+init_compression(app)  # gzip/brotli for HTML/JSON/CSS
 
 @app.route("/")
 def home():
-    from utils import TH3, TH2, TH1, alpha
+    from layout import page
     cat_dir = "static/cats"
     bg_url = ""
     try:
@@ -38,51 +44,22 @@ def home():
     except FileNotFoundError:
         pass
 
-    html = f"""<!DOCTYPE html><html>
-    <head>
-    <link rel="apple-touch-icon" href="/static/apple-touch-icon.png">
-    <link rel="icon" type="image/png" href="/static/apple-touch-icon.png">
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width,initial-scale=1">
-    <title>Max's App</title>
-    <style>
-      body {{
-        font-family:sans-serif;
-        text-align:center;
-        background:{TH3} url('{bg_url}') center/cover no-repeat;
-        color:{TH2};
-        height:100vh;
-        margin:0;
-        display:flex;
-        flex-direction:column;
-        justify-content:center;
-        backdrop-filter:brightness(0.35) blur(2px);
-      }}
-      a {{
-        display:block;
-        margin:1em auto;
-        padding:1em 2em;
-        width:160px;
-        background:{alpha(TH1, 0.8)};
-        color:{TH2};
-        text-decoration:none;
-        border-radius:7px;
-        font-weight:bold;
-        font-size: clamp(20px, 3vw, 22px);
-      }}
-      a:active {{ background:{TH2}; }}
-    </style>
-    </head>
-    <body>
+    html = """
       <a href="/weather">Weather</a>
       <a href="/nhl">NHL</a>
       <a href="/game">Game</a>
       <a href="/cats">Photos</a>
       <a href="/chat">Chat</a>
-    </body>
-    </html>"""
-    return html
+"""
+    head = (
+        '<link rel="apple-touch-icon" href="/static/apple-touch-icon.png">\n'
+        '<link rel="icon" type="image/png" href="/static/apple-touch-icon.png">\n'
+    )
+    body_attrs = f"style=\"background-image:url('{bg_url}')\"" if bg_url else ""
+    return page(html, "pg-home", title="Max's App", head=head, body_attrs=body_attrs)
 
 if __name__ == "__main__":
     register_socketio_events(socketio)  # Add chat SocketIO events
+    register_live_scores(socketio)      # /live namespace: scoreboard deltas
+    register_nhl_scheduler(socketio)    # game-day aware results/stats updater
     socketio.run(app, host="0.0.0.0", port=8080)
@@ -23,14 +23,14 @@ history = load_history()
 
 @chat_bp.route("/chat")
 def chat_page():
-    from utils import TH1
+    from layout import HEAD_LINKS, SOCKETIO_URL
     html = f"""
     <!DOCTYPE html>
     <html>
     <head>
       <meta name="viewport" content="width=device-width,initial-scale=1,viewport-fit=cover">
       <title>Chat Room</title>
-      <link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Rajdhani:wght@600&display=swap">
+      {HEAD_LINKS}
       <style>
         html,body{{
           margin:0;
@@ -115,7 +115,7 @@ def chat_page():
         .time{{color:#888;font-size:0.8em;margin-right:0.4em;}}
         .sys{{color:#666;}}
       </style>
-      <script src="https://cdn.socket.io/4.7.5/socket.io.min.js"></script>
+      <script src="{SOCKETIO_URL}"></script>
       <script>
         let socket;
         let username = localStorage.getItem("chat_name") || "";
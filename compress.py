@@ -0,0 +1,115 @@
+# compress.py
+# gzip / brotli response compression for HTML, CSS, JS and JSON.
+# - small bodies (< MIN_SIZE) are sent as-is
+# - responses carrying an ETag (e.g. /assets/app.<hash>.css) are compressed
+#   once and served from memory afterwards
+# - bytes in/out are counted per endpoint, see /metrics/compression
+from flask import Blueprint, request, jsonify
+import gzip, threading
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+compress_bp = Blueprint("compress", __name__)
+
+MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSIBLE = {
+    "text/html", "text/css", "text/plain", "text/javascript",
+    "application/javascript", "application/json",
+}
+_PRECOMPRESSED_MAX = 64
+
+_lock = threading.Lock()
+_precompressed = {}   # (etag, encoding) -> bytes
+_stats = {}           # endpoint -> {"responses", "raw_bytes", "sent_bytes"}
+
+
+def _pick_encoding(accept):
+    """Best encoding for an Accept-Encoding header (werkzeug Accept: q-values,
+    "*" and ";q=0" refusals honoured); brotli wins ties."""
+    q = {"br": accept["br"] if brotli is not None else 0, "gzip": accept["gzip"]}
+    best = max(q, key=lambda enc: (q[enc], enc == "br"))
+    return best if q[best] > 0 else None
+
+
+def _compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def _record(endpoint, raw, sent):
+    with _lock:
+        st = _stats.setdefault(endpoint or "?", {"responses": 0, "raw_bytes": 0, "sent_bytes": 0})
+        st["responses"] += 1
+        st["raw_bytes"] += raw
+        st["sent_bytes"] += sent
+
+
+def compress_response(response):
+    """after_request hook: compress eligible responses in place."""
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_SIZE:
+        _record(request.endpoint, len(data), len(data))
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = _pick_encoding(request.accept_encodings)
+    if encoding is None:
+        _record(request.endpoint, len(data), len(data))
+        return response
+
+    etag, weak = response.get_etag()
+    if etag:
+        key = (etag, encoding)
+        body = _precompressed.get(key)
+        if body is None:
+            body = _compress(data, encoding)
+            with _lock:
+                if len(_precompressed) >= _PRECOMPRESSED_MAX:
+                    _precompressed.pop(next(iter(_precompressed)))
+                _precompressed[key] = body
+        # the encoded body is a different representation -> different validator
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    else:
+        body = _compress(data, encoding)
+
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    _record(request.endpoint, len(data), len(body))
+    if etag:
+        # revalidation of the encoded variant -> 304
+        response.make_conditional(request)
+    return response
+
+
+def init_compression(app):
+    app.after_request(compress_response)
+    app.register_blueprint(compress_bp)
+
+
+@compress_bp.route("/metrics/compression")
+def compression_metrics():
+    with _lock:
+        routes = {
+            ep: dict(st, saved_bytes=st["raw_bytes"] - st["sent_bytes"])
+            for ep, st in sorted(_stats.items())
+        }
+    return jsonify({
+        "brotli": brotli is not None,
+        "min_size": MIN_SIZE,
+        "routes": routes,
+    })
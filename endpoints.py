@@ -0,0 +1,25 @@
+# endpoints.py
+# Upstream API URLs in one place.
+# Each host can be overridden from the environment, e.g. to point every data
+# path at the local replay server (stuff/replay_server.py):
+#       UPSTREAM_BASE=http://127.0.0.1:8765 python app.py
+# UPSTREAM_BASE overrides all three; ESPN_API_BASE / NHLE_API_BASE /
+# METEO_API_BASE override one host each.
+import os
+
+_ALL = os.environ.get("UPSTREAM_BASE", "").rstrip("/")
+
+
+def _base(var, default):
+    return (os.environ.get(var) or _ALL or default).rstrip("/")
+
+
+ESPN_BASE = _base("ESPN_API_BASE", "https://site.api.espn.com")
+NHLE_BASE = _base("NHLE_API_BASE", "https://api-web.nhle.com")
+METEO_BASE = _base("METEO_API_BASE", "https://api.open-meteo.com")
+
+ESPN_SCOREBOARD = f"{ESPN_BASE}/apis/site/v2/sports/hockey/nhl/scoreboard"
+ESPN_STANDINGS = f"{ESPN_BASE}/apis/site/v2/sports/hockey/nhl/standings"
+NHL_STATS_LEADERS = f"{NHLE_BASE}/v1/skater-stats-leaders/current"
+NHL_ROSTER = f"{NHLE_BASE}/v1/roster/{{team}}/current"     # .format(team=<NHL abbreviation>)
+METEO_FORECAST = f"{METEO_BASE}/v1/forecast"
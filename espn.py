@@ -0,0 +1,123 @@
+# espn.py
+# One parser for ESPN NHL scoreboard payloads.
+# Every reader (results updater, schedule ingester, live scoreboard, archive
+# rebuild, nhl.py) turns events into Game records here, instead of each
+# re-deriving home/away, scores and OT/SO from lowercased detail strings.
+# - decodes with orjson when it is installed (falls back to json)
+# - reads status.type.state ("pre" / "in" / "post") and the short detail
+#   ("Final/OT", "Final/SO") instead of scanning six joined strings
+# - only the fields the app uses are copied into a slotted record
+import datetime, json, zoneinfo
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+TZ = zoneinfo.ZoneInfo("America/Edmonton")
+REGULAR_SEASON = 2
+
+
+class Game:
+    """One scoreboard event. state is 'upcoming', 'live', 'final' or 'postponed'."""
+    __slots__ = ("gid", "start", "season_type", "state", "away", "home",
+                 "a_score", "h_score", "note", "detail")
+
+    def __init__(self, gid, start, season_type, state, away, home, a_score, h_score, note, detail):
+        self.gid = gid
+        self.start = start              # ISO UTC puck drop ("2025-10-08T01:00Z")
+        self.season_type = season_type  # 1 pre, 2 regular, 3 playoffs
+        self.state = state
+        self.away = away
+        self.home = home
+        self.a_score = a_score          # str, as ESPN sends it ("" before puck drop)
+        self.h_score = h_score
+        self.note = note                # "OT", "SO" or ""
+        self.detail = detail            # ESPN short detail ("Final/OT", "2nd 12:04", ...)
+
+    def start_local(self, tz=TZ):
+        """Puck drop as an aware local datetime (None if unknown)."""
+        if not self.start:
+            return None
+        try:
+            return datetime.datetime.fromisoformat(self.start.replace("Z", "+00:00")).astimezone(tz)
+        except ValueError:
+            return None
+
+    def __repr__(self):
+        return f"<Game {self.gid} {self.away} {self.a_score} @ {self.home} {self.h_score} {self.state} {self.note}>"
+
+
+def _note(text):
+    text = text.lower()
+    if "shootout" in text or "/so" in text or " so" in text:
+        return "SO"
+    if "overtime" in text or "/ot" in text or " ot" in text:
+        return "OT"
+    return ""
+
+
+def _legacy_state(text):
+    # payloads without status.type.state (old fixtures): the text heuristics
+    if "postponed" in text:
+        return "postponed"
+    if "final" in text:
+        return "final"
+    if any(w in text for w in ("in progress", "live", "1st", "2nd", "3rd", " ot", " so")):
+        return "live"
+    return "upcoming"
+
+
+def parse_events(data, regular_only=True):
+    """Scoreboard payload (dict, or raw bytes/str) -> [Game]."""
+    if isinstance(data, (bytes, bytearray, str)):
+        data = loads(data)
+    games = []
+    for ev in data.get("events", ()):
+        season_type = (ev.get("season") or {}).get("type")
+        if regular_only and season_type != REGULAR_SEASON:
+            continue
+        comp = (ev.get("competitions") or ({},))[0]
+        home = away = None
+        for t in comp.get("competitors", ()):
+            side = t.get("homeAway")
+            if side == "home":
+                home = t
+            elif side == "away":
+                away = t
+        if home is None or away is None:
+            continue
+
+        st = (ev.get("status") or {}).get("type") or {}
+        cst = (comp.get("status") or {}).get("type") or {}
+        short = st.get("shortDetail") or cst.get("shortDetail") or ""
+        state = st.get("state") or cst.get("state")
+        name = st.get("name") or ""
+        if state == "post":
+            state = "postponed" if ("POSTPONED" in name or "CANCELED" in name) else "final"
+        elif state == "in":
+            state = "live"
+        elif state == "pre":
+            state = "postponed" if "POSTPONED" in name else "upcoming"
+        else:
+            text = " ".join(str(s.get(k, "")) for s in (st, cst)
+                            for k in ("shortDetail", "detail", "description")).lower()
+            state = _legacy_state(text)
+            if state == "final" and not short:
+                short = text
+        note = _note(short or st.get("detail") or "") if state == "final" else ""
+
+        games.append(Game(
+            ev.get("id") or "",
+            ev.get("date", ""),
+            season_type,
+            state,
+            (away.get("team") or {}).get("abbreviation", "???"),
+            (home.get("team") or {}).get("abbreviation", "???"),
+            str(away.get("score", "")),
+            str(home.get("score", "")),
+            note,
+            short,
+        ))
+    return games
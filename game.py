@@ -1,7 +1,7 @@
 # game.py
 from flask import Blueprint, request
 import random
-from utils import TH3, TH1, TH2
+from layout import page
 
 game_bp = Blueprint('game', __name__)
 
@@ -13,111 +13,27 @@ def get_client_ip():
 
 @game_bp.route("/game")
 def game_home():
-    html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<style>
-  body {{
-    background:{TH3};
-    color:#eee;
-    font-family: monospace;
-    margin:0;
-    padding:2em;
-    text-align:center;
-    display:flex;
-    flex-direction:column;
-    justify-content:center;
-    height:100vh;
-  }}
-  a.button {{
-    display:inline-block;
-    color:#000;
-    background:{TH1};
-    border:none;
-    border-radius:12px;
-    padding:1em 2.5em;
-    margin:1em auto;
-    font-weight:bold;
-    text-decoration:none;
-    font-size: clamp(16px,4vw,22px);
-    width:200px;
-  }}
-  a.back {{
-    background:{TH2};
-    color:#eee;
-  }}
-</style>
-</head>
-<body>
+    html = """
   <h2>Rock Paper Scissors</h2>
   <a class="button" href="/game/prepare">PLAY</a>
   <a class="button back" href="/">← MENU</a>
-</body>
-</html>
 """
-    return html
+    return page(html, "pg-game center")
 
 @game_bp.route("/game/prepare")
 def game_prepare():
-    html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<meta http-equiv="refresh" content="2;url=/game/choose">
-<style>
-  body {{
-    background:{TH3};
-    color:#eee;
-    font-family: monospace;
-    margin:0;
-    padding:2em;
-    text-align:center;
-  }}
-</style>
-</head>
-<body>
+    html = """
   <h3>AI is preparing...</h3>
   <p>(please wait a moment)</p>
   <script>
-    setTimeout(() => {{window.location='/game/choose'}}, 1500);
+    setTimeout(() => {window.location='/game/choose'}, 1500);
   </script>
-</body>
-</html>
 """
-    return html
+    return page(html, "pg-game", head='<meta http-equiv="refresh" content="2;url=/game/choose">\n')
 
 @game_bp.route("/game/choose")
 def game_choose():
-    html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<style>
-  body {{
-    background:{TH3};
-    color:#eee;
-    font-family: monospace;
-    margin:0;
-    padding:2em;
-    text-align:center;
-  }}
-  button {{
-    color:#000;
-    background:{TH1};
-    border:none;
-    border-radius:12px;
-    padding:1em 2em;
-    margin:0.5em;
-    font-weight:bold;
-    font-size: clamp(14px,3vw,18px);
-  }}
-</style>
-</head>
-<body>
+    html = """
   <h3>AI is ready.</h3>
   <p>Please choose:</p>
   <form action="/game/play" method="get">
@@ -125,10 +41,8 @@ def game_choose():
     <button name="move" value="paper">📄 PAPER</button>
     <button name="move" value="scissors">✂️ SCISSORS</button>
   </form>
-</body>
-</html>
 """
-    return html
+    return page(html, "pg-game")
 
 @game_bp.route("/game/play")
 def game_play():
@@ -164,53 +78,6 @@ def game_play():
     }[outcome]
 
     html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<style>
-  body {{
-    background:{TH3};
-    color:#eee;
-    font-family: monospace;
-    margin:0;
-    padding:2em;
-    text-align:center;
-    display:flex;
-    flex-direction:column;
-    align-items:center;
-    justify-content:center;
-    min-height:100vh;
-  }}
-  h2, h3, p {{
-    margin:0.5em 0;
-  }}
-  .buttons {{
-    margin-top:2em;
-    display:flex;
-    flex-direction:column;
-    align-items:center;
-    gap:1em;
-  }}
-  a.button {{
-    display:inline-block;
-    color:#000;
-    background:{TH1};
-    border:none;
-    border-radius:12px;
-    padding:1em 2.5em;
-    font-weight:bold;
-    text-decoration:none;
-    font-size: clamp(16px,4vw,22px);
-    width:200px;
-  }}
-  a.back {{
-    background:{TH2};
-    color:#eee;
-  }}
-</style>
-</head>
-<body>
   <h3>RESULT</h3>
   <p>You chose: <b>{player_move.upper()}</b></p>
   <p>AI chose: <b>{ai_move.upper()}</b></p>
@@ -220,7 +87,5 @@ def game_play():
     <a class="button" href="/game/prepare">Play Again</a>
     <a class="button back" href="/">← MENU</a>
   </div>
-</body>
-</html>
 """
-    return html
+    return page(html, "pg-game center")
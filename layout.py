@@ -0,0 +1,552 @@
+# layout.py
+# Shared page shell for every blueprint.
+# The CSS only depends on the theme colours in utils, so it is rendered ONCE
+# at import time and served as a fingerprinted file (/assets/app.<hash>.css)
+# with a one-year cache; per request we only concatenate the dynamic body.
+from flask import Blueprint, request, make_response, send_from_directory, abort
+import os, hashlib
+from utils import TH1, TH2, TH3, alpha
+
+assets_bp = Blueprint("assets", __name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FONTS_DIR = os.path.join(BASE_DIR, "static", "fonts")
+FONT_FILE = "rajdhani-600.woff2"   # fetch once with: python stuff/fetch_fonts.py
+JS_DIR = os.path.join(BASE_DIR, "static", "js")
+SOCKETIO_FILE = "socket.io.min.js"  # fetch once with: python stuff/fetch_socketio.py
+LONG_CACHE = "public, max-age=31536000, immutable"
+
+
+def _fingerprint(data):
+    return hashlib.sha1(data).hexdigest()[:10]
+
+
+# --- Self-hosted font (no third-party request; works on the offline LAN) ---
+# Required: without it every page would silently lose Rajdhani.
+try:
+    with open(os.path.join(FONTS_DIR, FONT_FILE), "rb") as f:
+        FONT_URL = f"/assets/fonts/{_fingerprint(f.read())}/{FONT_FILE}"
+except FileNotFoundError:
+    raise RuntimeError(f"static/fonts/{FONT_FILE} is missing; fetch it once with: "
+                       "python stuff/fetch_fonts.py") from None
+
+# --- Vendored Socket.IO client (live scores, chat); required for the same reason ---
+try:
+    with open(os.path.join(JS_DIR, SOCKETIO_FILE), "rb") as f:
+        SOCKETIO_URL = f"/assets/js/{_fingerprint(f.read())}/{SOCKETIO_FILE}"
+except FileNotFoundError:
+    raise RuntimeError(f"static/js/{SOCKETIO_FILE} is missing; fetch it once with: "
+                       "python stuff/fetch_socketio.py") from None
+
+FONT_FACE = f"""
+  @font-face {{
+    font-family:'Rajdhani';
+    font-style:normal;
+    font-weight:600;
+    font-display:swap;
+    src:url('{FONT_URL}') format('woff2');
+  }}
+"""
+
+# ------------------------------------------------------
+#  Stylesheet (one copy for the whole app, scoped per page
+#  with a body class: pg-scores, pg-standings, ...)
+# ------------------------------------------------------
+CSS = FONT_FACE + f"""
+  /* --- BASE (NHL pages) --- */
+  body.nhl {{
+    background:{TH3};
+    color:#eee;
+    font-family:'Rajdhani',sans-serif;
+    margin:0;
+    padding:1em;
+    text-align:left;
+  }}
+
+  /* --- NAVIGATION --- */
+  .nav {{
+    text-align:left;
+    margin-bottom:1.2em;
+  }}
+  .menu-btn {{
+    background:none;
+    color:{TH1};
+    text-decoration:none;
+    font-weight:bold;
+    font-size:clamp(22px,4vw,26px);
+    display:inline-block;
+    margin-bottom:0.5em;
+  }}
+  .submenu {{
+    display:flex;
+    justify-content:flex-start;
+    flex-wrap:wrap;
+    gap:0.6em;
+  }}
+  .submenu a {{
+    background:{alpha(TH1,0.13)};
+    color:{TH1};
+    padding:0.3em 0.8em;
+    border-radius:8px;
+    text-decoration:none;
+    font-weight:bold;
+    font-size:clamp(17px,3.3vw,19px);
+    transition:background 0.2s ease,color 0.2s ease;
+  }}
+  .submenu a:hover {{
+    background:{alpha(TH2,0.25)};
+    color:{TH2};
+  }}
+  .submenu a.active {{
+    background:{TH2};
+    color:#000;
+  }}
+  .season-pick {{
+    background:{alpha(TH1,0.13)};
+    color:{TH1};
+    border:none;
+    border-radius:8px;
+    padding:0.3em 0.5em;
+    font:inherit;
+    font-weight:bold;
+    font-size:clamp(17px,3.3vw,19px);
+    cursor:pointer;
+  }}
+  .nhl a.back {{
+    color:{TH1};
+    font-weight:bold;
+    text-decoration:none;
+    display:inline-block;
+    margin-bottom:1em;
+    font-size:clamp(20px,3.5vw,24px);
+  }}
+
+  /* --- SCOREBOARD --- */
+  .pg-scores h3 {{
+    color:{TH1};
+    margin:0.8em 0 0.4em;
+  }}
+  .gamerow {{
+    display:inline-block;
+    width:100%;
+    font-size:clamp(20px,3vw,22px);
+    line-height:1.6em;
+  }}
+  .rev {{
+    vertical-align:middle;
+    margin-right:.35em;
+    transform:scale(1.0);
+    cursor:pointer;
+  }}
+  .gamerow .reveal {{ color:{TH3}; transition:color .15s ease; }}
+  .gamerow .rev:checked ~ .reveal {{ color:#eee; }}
+
+  /* --- STANDINGS (compact table) --- */
+  .table-container {{
+    width:100%;
+    overflow-x:auto;
+    -webkit-overflow-scrolling:touch;
+    text-align:left;
+  }}
+  .pg-standings table {{
+    border-collapse:collapse;
+    font-size:clamp(16px,2.6vw,15px);
+    min-width:550px;
+    margin-left:0;
+    margin-right:auto;
+    table-layout:auto;
+  }}
+  .pg-standings th, .pg-standings td {{
+    border-bottom:1px solid #333;
+    padding:0.2em 0.4em;
+    white-space:nowrap;
+    text-align:left;
+  }}
+  .pg-standings th {{
+    background:{alpha(TH1,0.3)};
+    color: {TH2};
+    position:sticky;
+    top:0;
+    text-align:left;
+    cursor:pointer;
+    user-select:none;
+    font-weight: bold;
+    letter-spacing: 0.04em;
+  }}
+  .pg-standings tr:hover td {{
+    background:{alpha(TH1,0.13)};
+  }}
+  .pg-standings .asof {{
+    display:flex;
+    align-items:center;
+    gap:0.6em;
+    margin:0 0 0.8em;
+  }}
+  .pg-standings .asof input[type=range] {{ flex:1; max-width:420px; accent-color:{TH2}; }}
+  .pg-standings .asof input[type=date] {{
+    background:{TH3}; color:#eee; border:1px solid #333; font:inherit;
+  }}
+  .pg-standings .views {{ margin:0 0 0.8em; }}
+  .pg-standings .views a {{ color:{TH2}; }}
+  .pg-standings tr.cutline td {{ border-bottom:2px dashed {TH2}; padding:0; }}
+  .pg-standings caption {{
+    caption-side:top;
+    color:{TH1};
+    margin-bottom:0.8em;
+    font-size:1.3em;
+    font-weight:bold;
+    text-align:center;
+  }}
+  .pg-h2h table {{ font-size:clamp(11px,1.6vw,13px); }}
+  .pg-h2h th, .pg-h2h td {{ padding:0.15em 0.3em; text-align:center; }}
+  .pg-h2h th a {{ color:inherit; text-decoration:none; }}
+  .pg-h2h td.pos {{ color:#7c7; }}
+  .pg-h2h td.neg {{ color:#c77; }}
+  .pg-h2h td.self {{ background:#222; }}
+
+  /* --- STATS --- */
+  body.pg-stats {{
+    min-height:100vh;
+    overflow-y:auto;
+    -webkit-overflow-scrolling:touch;
+  }}
+  .pg-stats pre {{
+    font-size:clamp(15px,2.5vw,18px);
+    line-height:1.5em;
+    white-space:pre-wrap;
+    word-break:break-word;
+  }}
+  .pg-stats select {{
+    padding:0.3em;
+    border-radius:6px;
+    font-size:1em;
+  }}
+
+  /* --- MORE / RESULTS MENU --- */
+  .pg-more h2, .pg-results h2 {{
+    color:{TH1};
+  }}
+  .pg-results h2 {{
+    margin:0.3em 0 0.6em;
+  }}
+  .pg-more ul, .pg-results ul {{
+    list-style:none;
+    padding-left:0;
+  }}
+  .pg-more li {{
+    margin-bottom:0.5em;
+  }}
+  .pg-results li {{
+    margin:0.4em 0;
+  }}
+  a.menu-item, a.month {{
+    color:{TH2};
+    font-weight:bold;
+    text-decoration:none;
+    font-size:clamp(18px,3vw,20px);
+  }}
+  a.menu-item:hover, a.month:hover {{
+    text-decoration:underline;
+  }}
+
+  /* --- MONTHLY RESULTS --- */
+  .pg-month h2 {{
+    color:{TH1};
+    margin-top:0.3em;
+  }}
+  .pg-month table {{
+    width:100%;
+    border-collapse:collapse;
+    font-size:clamp(16px,2.6vw,17px);
+  }}
+  .pg-month th, .pg-month td {{
+    border-bottom:1px solid #333;
+    padding:0.25em 0.4em;
+    text-align:left;
+  }}
+  .pg-month th {{
+    background:{alpha(TH1,0.25)};
+    color:{TH2}; /* orange header text */
+    text-align:left;
+  }}
+  .pg-month tr:hover td {{
+    background:{alpha(TH1,0.1)};
+  }}
+
+  /* --- TEAM PAGES (on top of pg-month tables) --- */
+  .pg-team h3 {{ color:{TH1}; margin:1em 0 0.4em; }}
+  .pg-team .summary {{ color:{TH2}; font-size:clamp(17px,2.8vw,19px); }}
+  .pg-team td a {{ color:#eee; text-decoration:none; }}
+  .pg-team td.w {{ color:#4CAF50; }}
+  .pg-team td.l {{ color:#e57373; }}
+  .pg-team td.otl {{ color:{TH2}; }}
+  .pg-team .divs {{
+    display:grid;
+    grid-template-columns:repeat(auto-fit,minmax(140px,1fr));
+    gap:0.5em 1.5em;
+  }}
+
+  /* --- UPDATER PANEL --- */
+  .pg-updater h2 {{ color:{TH1}; margin-top:0.3em; }}
+  .pg-updater .row {{
+    display:flex;
+    align-items:center;
+    flex-wrap:wrap;
+    gap:0.8em;
+    margin-bottom:0.9em;
+  }}
+  .pg-updater button {{
+    background:{TH1};
+    color:#000;
+    font-weight:bold;
+    border:none;
+    border-radius:8px;
+    padding:0.6em 1.2em;
+    font-size:clamp(16px,2.5vw,18px);
+    cursor:pointer;
+    transition:background 0.2s ease;
+  }}
+  .pg-updater button:hover {{ background:{TH2}; }}
+  .pg-updater .stamp {{
+    color:{TH2};
+    font-size:clamp(14px,2.2vw,16px);
+    opacity:0.8;
+  }}
+  .pg-updater #msg {{ color:{TH2}; margin-top:1em; }}
+  .pg-updater #log {{
+    font-size:clamp(13px,2vw,15px);
+    max-height:40vh;
+    overflow-y:auto;
+    opacity:0.85;
+  }}
+  .pg-updater .slow {{ color:#ff5252; }}
+
+  /* --- WEATHER --- */
+  body.pg-weather {{
+    background:{TH3};
+    color:#eee;
+    font-family: monospace;
+    margin:0;
+    font-size:1.3em;
+    padding:1em;
+    text-align:left;
+  }}
+  .pg-weather a {{
+    color:{TH1};
+    text-decoration:none;
+    display:inline-block;
+    margin-bottom:1em;
+  }}
+  .pg-weather pre {{
+    font-size: clamp(15px, 3vw, 18px);
+    line-height: 1.6em;
+    white-space: pre-wrap;
+    word-break: break-word;
+  }}
+
+  /* --- GAME --- */
+  body.pg-game {{
+    background:{TH3};
+    color:#eee;
+    font-family: monospace;
+    margin:0;
+    padding:2em;
+    text-align:center;
+  }}
+  body.pg-game.center {{
+    display:flex;
+    flex-direction:column;
+    align-items:center;
+    justify-content:center;
+    min-height:100vh;
+  }}
+  .pg-game h2, .pg-game h3, .pg-game p {{
+    margin:0.5em 0;
+  }}
+  .pg-game .buttons {{
+    margin-top:2em;
+    display:flex;
+    flex-direction:column;
+    align-items:center;
+    gap:1em;
+  }}
+  .pg-game a.button {{
+    display:inline-block;
+    color:#000;
+    background:{TH1};
+    border:none;
+    border-radius:12px;
+    padding:1em 2.5em;
+    margin:1em auto;
+    font-weight:bold;
+    text-decoration:none;
+    font-size: clamp(16px,4vw,22px);
+    width:200px;
+  }}
+  .pg-game .buttons a.button {{ margin:0; }}
+  .pg-game a.back {{
+    background:{TH2};
+    color:#eee;
+  }}
+  .pg-game button {{
+    color:#000;
+    background:{TH1};
+    border:none;
+    border-radius:12px;
+    padding:1em 2em;
+    margin:0.5em;
+    font-weight:bold;
+    font-size: clamp(14px,3vw,18px);
+  }}
+
+  /* --- PHOTOS --- */
+  body.pg-photos {{background:{TH3};color:#eee;font-family:monospace;margin:0;padding:1em;text-align:center}}
+  .pg-photos a{{color:{TH1};text-decoration:none;display:inline-block;margin:1em}}
+  .pg-photos .buttons a{{font-size:1.6em}}
+  .pg-photos h2{{margin:0.5em 0 0.25em}}
+  .pg-photos .buttons{{margin:1em 0}}
+  .pg-photos .msg{{color:{TH2};font-weight:bold;margin:1em 0;}}
+  .pg-photos img{{width:min(900px,96%);max-width:100%;margin:0.75em auto;display:block;border-radius:12px;}}
+  .pg-photos form{{margin:2em 0;}}
+  .pg-photos input[type="file"]{{margin:1em 0;}}
+  .pg-photos button{{background:{TH1};color:#000;padding:0.7em 1.5em;border:none;border-radius:6px;font-size:1.2em;}}
+  .pg-photos .note{{opacity:0.7;font-size:0.9em;margin-top:1em;}}
+
+  /* --- HOME MENU --- */
+  body.pg-home {{
+    font-family:sans-serif;
+    text-align:center;
+    background-color:{TH3};
+    background-position:center;
+    background-size:cover;
+    background-repeat:no-repeat;
+    color:{TH2};
+    height:100vh;
+    margin:0;
+    display:flex;
+    flex-direction:column;
+    justify-content:center;
+    backdrop-filter:brightness(0.35) blur(2px);
+  }}
+  .pg-home a {{
+    display:block;
+    margin:1em auto;
+    padding:1em 2em;
+    width:160px;
+    background:{alpha(TH1, 0.8)};
+    color:{TH2};
+    text-decoration:none;
+    border-radius:7px;
+    font-weight:bold;
+    font-size: clamp(20px, 3vw, 22px);
+  }}
+  .pg-home a:active {{ background:{TH2}; }}
+"""
+
+# ------------------------------------------------------
+#  Prerendered shell pieces
+# ------------------------------------------------------
+_CSS_BYTES = CSS.encode()
+CSS_HASH = _fingerprint(_CSS_BYTES)
+CSS_URL = f"/assets/app.{CSS_HASH}.css"
+
+# Stylesheet + font preload, for pages that build their own <head> (chat)
+HEAD_LINKS = (
+    f'<link rel="preload" href="{FONT_URL}" as="font" type="font/woff2" crossorigin>\n'
+    + f'<link rel="stylesheet" href="{CSS_URL}">\n'
+)
+
+_HEAD = (
+    "<!DOCTYPE html>\n<html>\n<head>\n"
+    '<meta charset="UTF-8">\n'
+    '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+    + HEAD_LINKS
+)
+
+NHL_TABS = [
+    ("/nhl", "SCORES"),
+    ("/nhl/standings", "STANDINGS"),
+    ("/nhl/stats", "STATS"),
+    ("/nhl/more", "MORE"),
+]
+
+
+def _build_nav(active):
+    """Tab bar up to the season selector (closed by _NAV_END)."""
+    links = "\n".join(
+        f'      <a href="{href}" class="{"active" if href == active else ""}">{label}</a>'
+        for href, label in NHL_TABS
+    )
+    return (
+        '  <div class="nav">\n'
+        '    <a href="/" class="menu-btn">← MENU</a>\n'
+        '    <div class="submenu">\n'
+        f"{links}\n"
+    )
+
+
+# one prebuilt copy per active tab (plus "none active")
+_NAVS = {href: _build_nav(href) for href, _ in NHL_TABS}
+_NAV_NONE = _build_nav(None)
+_NAV_END = "    </div>\n  </div>\n"
+
+
+def nhl_nav(path=None, season=None):
+    """Return the NHL tab bar with the current page highlighted and the
+    season selector (season: default the one the request selected)."""
+    from nhl_routes import seasons  # lazy: nhl_routes imports layout
+    if path is None:
+        path = request.path
+    return _NAVS.get(path, _NAV_NONE) + seasons.selector(season or seasons.selected()) + _NAV_END
+
+
+def page(body, page_class, title=None, head="", body_attrs=""):
+    """Wrap a page body in the shared shell.
+
+    page_class -- body class(es) selecting the page's CSS, e.g. "nhl pg-scores"
+    head       -- extra <head> markup (meta refresh, scripts, ...)
+    body_attrs -- extra attributes for <body> (e.g. an inline background)
+    """
+    parts = [_HEAD]
+    if title:
+        parts.append(f"<title>{title}</title>\n")
+    if head:
+        parts.append(head)
+    parts.append(f'</head>\n<body class="{page_class}"{" " + body_attrs if body_attrs else ""}>\n')
+    parts.append(body)
+    parts.append("\n</body>\n</html>")
+    return "".join(parts)
+
+
+# ------------------------------------------------------
+#  Asset routes (long-lived cache; the hash in the URL changes with content)
+# ------------------------------------------------------
+@assets_bp.route("/assets/app.<digest>.css")
+def app_css(digest):
+    response = make_response(_CSS_BYTES)
+    response.headers["Content-Type"] = "text/css; charset=utf-8"
+    if digest == CSS_HASH:
+        response.headers["Cache-Control"] = LONG_CACHE
+    else:
+        # stale hash from an old page: serve current CSS but don't pin it
+        response.headers["Cache-Control"] = "no-cache"
+    response.set_etag(CSS_HASH)
+    return response.make_conditional(request)
+
+
+@assets_bp.route("/assets/fonts/<digest>/<name>")
+def font_file(digest, name):
+    if name != FONT_FILE:
+        abort(404)
+    response = send_from_directory(FONTS_DIR, name, mimetype="font/woff2")
+    response.headers["Cache-Control"] = LONG_CACHE
+    return response
+
+
+@assets_bp.route("/assets/js/<digest>/<name>")
+def js_file(digest, name):
+    if name != SOCKETIO_FILE:
+        abort(404)
+    response = send_from_directory(JS_DIR, name, mimetype="text/javascript")
+    response.headers["Cache-Control"] = LONG_CACHE
+    return response
@@ -9,6 +9,10 @@ from flask_socketio import SocketIO
 import requests, datetime, zoneinfo, textwrap, os, random, json, time
 import threading
 from datetime import date, timedelta
+from nhl_routes.updater import update_completed_games, RESULTS_FILE
+from nhl_routes.schedule import SEASON_START
+from nhl_routes.results import parse_result_line
+from espn import parse_events
 
 
 # ================================================================
@@ -48,88 +52,17 @@ history = load_history()
 # ================================================================
 # Update NHL games results - to text file 
 # ================================================================
-UPDATE_FILE = "espn_games_2025_26.txt"
+# The writer is the app's own updater: shared ESPN parser (espn.py), the
+# 'results' lease and the current season's file (nhl_routes/seasons.py).
+UPDATE_FILE = RESULTS_FILE
 UPDATE_TOKEN = os.environ.get("NHL_UPDATE_TOKEN", "")  # optional simple auth
 _update_lock = threading.Lock()
 _last_run = 0
 
-def update_espn_games_file(season_start=date(2025, 10, 7), out_file=UPDATE_FILE):
+def update_espn_games_file(season_start=SEASON_START, out_file=UPDATE_FILE):
     """Incrementally append FINAL regular-season games to out_file.
        Returns a human-readable status string."""
-    tz = zoneinfo.ZoneInfo("America/Edmonton")
-    today = date.today()
-    base_url = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard"
-
-    # Read existing ids
-    existing_lines, known_ids = [], set()
-    if os.path.exists(out_file):
-        with open(out_file) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                existing_lines.append(line)
-                parts = line.split()
-                if parts and parts[0].isdigit():
-                    known_ids.add(parts[0])
-
-    all_lines = existing_lines[:]
-    added = 0
-    d = season_start
-    while d <= today:
-        datestr = d.strftime("%Y%m%d")
-        try:
-            resp = requests.get(f"{base_url}?dates={datestr}", timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            for ev in data.get("events", []):
-                gid = ev.get("id")
-                if not gid or gid in known_ids:
-                    continue
-
-                st = ev.get("status", {}).get("type", {})
-                desc = (st.get("description") or "").lower()
-                if "final" not in desc:
-                    continue
-                if ev.get("season", {}).get("type") != 2:  # regular season only
-                    continue
-
-                comp = ev.get("competitions", [{}])[0]
-                # detect OT/SO from any shortDetail/detail fields we can find
-                detail_text = " ".join([
-                    str(st.get(x, "")) for x in ("shortDetail", "detail", "description")
-                ] + [
-                    str(comp.get("status", {}).get("type", {}).get(x, "")) for x in ("shortDetail","detail","description")
-                ]).lower()
-                note = "SO" if ("shootout" in detail_text or " so" in detail_text or "/so" in detail_text) \
-                    else ("OT" if ("overtime" in detail_text or " ot" in detail_text or "/ot" in detail_text) else "")
-
-                teams = comp.get("competitors", [])
-                if len(teams) < 2:
-                    continue
-                home = next((t for t in teams if t.get("homeAway") == "home"), {})
-                away = next((t for t in teams if t.get("homeAway") == "away"), {})
-
-                h_name = home.get("team", {}).get("abbreviation", "???")
-                a_name = away.get("team", {}).get("abbreviation", "???")
-                h_score = home.get("score", "?")
-                a_score = away.get("score", "?")
-
-                line = f"{gid} {a_name} {a_score} @ {h_name} {h_score}"
-                if note:
-                    line += f" {note}"
-                all_lines.append(line)
-                known_ids.add(gid)
-                added += 1
-        except Exception as e:
-            print(f"[NHL update] {datestr} error: {e}")
-        d += timedelta(days=1)
-
-    if added:
-        with open(out_file, "w") as f:
-            f.write("\n".join(all_lines))
-    now = datetime.datetime.now(tz).strftime("%-I:%M %p %b %d, %Y")
-    return f"Added {added} new games. Total lines: {len(all_lines)}. Updated {now}."
+    return update_completed_games(season_start=season_start, out_file=out_file)
 
 
 # ================================================================
@@ -697,64 +630,24 @@ def nhl():
     # --- Helper: Format events (adds checkbox reveal) ---
     def format_events(events, show_scores=True, reveal_scores=False):
         lines = []
+        # Game records (espn.py) for teams/scores/state/OT-SO; the raw status
+        # only for the live clock and period
+        clocks = {ev.get("id"): ev.get("status", {}) for ev in events}
 
-        def safe_score(team):
-            if team.get("score"):
-                return team["score"]
-            val = team.get("linescores", [{}])[-1].get("value")
-            if val not in (None, ""):
-                return val
-            val = team.get("statistics", [{}])[0].get("displayValue")
-            if val and str(val).isdigit():
-                return val
-            val = team.get("records", [{}])[0].get("summary", "")
-            if "-" in val:
-                try:
-                    return val.split("-")[-1].strip()
-                except Exception:
-                    pass
-            return ""
-
-        for i, ev in enumerate(events):
-            comp = ev.get("competitions", [{}])[0]
-            teams = comp.get("competitors", [])
-            if len(teams) < 2:
-                continue
-
-            home = next((t for t in teams if t.get("homeAway") == "home"), None)
-            away = next((t for t in teams if t.get("homeAway") == "away"), None)
-            if not home or not away:
-                continue
-
-            h_name, a_name = home["team"]["abbreviation"], away["team"]["abbreviation"]
-            h_score = str(safe_score(home))
-            a_score = str(safe_score(away))
+        for i, g in enumerate(parse_events({"events": events}, regular_only=False)):
+            h_name, a_name = g.home, g.away
+            h_score, a_score = g.h_score, g.a_score
 
-            status_obj = ev.get("status", {})
-            status_type = status_obj.get("type", {})
-            desc = (status_type.get("description") or "").lower()
+            status_obj = clocks.get(g.gid, {})
             clock = status_obj.get("displayClock", "")
             period = status_obj.get("period", 0)
 
-            # Detect OT/SO
-            detail_text = " ".join([
-                str(status_type.get(x, "")) for x in ("shortDetail", "detail", "description")
-            ] + [
-                str(comp.get("status", {}).get("type", {}).get(x, "")) for x in ("shortDetail", "detail", "description")
-            ]).lower()
-
-            note = ""
-            if "shootout" in detail_text or " so" in detail_text or "/so" in detail_text:
-                note = "SO"
-            elif "overtime" in detail_text or " ot" in detail_text or "/ot" in detail_text:
-                note = "OT"
-
             # Build readable status string
-            if "final" in desc:
+            if g.state == "final":
                 status_str = "FINAL"
-                if note:
-                    status_str += f" {note}"
-            elif "in progress" in desc or "live" in desc:
+                if g.note:
+                    status_str += f" {g.note}"
+            elif g.state == "live":
                 period_names = {1: "1ST", 2: "2ND", 3: "3RD", 4: "OT", 5: "2OT"}
                 per_str = period_names.get(period, f"P{period}")
                 if clock == "0:00":
@@ -763,15 +656,11 @@ def nhl():
                     status_str = f"{clock} {per_str}".strip()
                 else:
                     status_str = "LIVE"
-            elif "scheduled" in desc or "pre" in desc:
-                try:
-                    date = ev.get("date", "")
-                    dt = datetime.datetime.fromisoformat(date.replace("Z", "+00:00")).astimezone(tz)
-                    status_str = dt.strftime("%-I:%M %p").lower()
-                except Exception:
-                    status_str = "TBD"
+            elif g.state == "upcoming":
+                start = g.start_local(tz)
+                status_str = start.strftime("%-I:%M %p").lower() if start else "TBD"
             else:
-                status_str = desc.upper() or "TBD"
+                status_str = (g.detail or g.state).upper()
 
             if not show_scores:
                 lines.append(f"{a_name} @ {h_name}  {status_str}")
@@ -927,7 +816,7 @@ def nhl():
 
 @app.route("/nhl/standings")
 def nhl_standings_html():
-    INPUT_FILE = "espn_games_2025_26.txt"
+    INPUT_FILE = RESULTS_FILE
     tz = zoneinfo.ZoneInfo("America/Edmonton")
 
     # --- helper to update teams ---
@@ -956,18 +845,10 @@ def nhl_standings_html():
         return f"<pre>File '{INPUT_FILE}' not found.</pre>"
 
     for line in lines:
-        parts = line.split()
-        if len(parts) < 6 or "@" not in parts:
-            continue
-        at_index = parts.index("@")
-        try:
-            away_abbr = parts[1]
-            away_score = int(parts[2])
-            home_abbr = parts[at_index + 1]
-            home_score = int(parts[at_index + 2])
-            note = parts[at_index + 3].upper() if len(parts) > at_index + 3 else ""
-        except Exception:
+        g = parse_result_line(line)  # dated and older undated lines
+        if not g:
             continue
+        _, _, away_abbr, away_score, home_abbr, home_score, note = g
 
         if home_score > away_score:
             if note in ("OT", "SO"):
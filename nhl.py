@@ -1,23 +1,25 @@
 # nhl.py
 from flask import Blueprint, request, make_response
-import requests, datetime, zoneinfo, os, threading, time, json
+import requests, datetime, zoneinfo, os, time, json
 from datetime import date, timedelta
 from utils import TH3, TH1, TH2, alpha
+from endpoints import ESPN_SCOREBOARD, ESPN_STANDINGS, NHL_STATS_LEADERS
+from espn import parse_events
+from nhl_routes import seasons
 
 nhl_bp = Blueprint('nhl', __name__)
 
-UPDATE_FILE = "espn_games_2025_26.txt"
-STANDINGS_FILE = "espn_standings_2025_26.txt"
+# current season partition (see nhl_routes/seasons.py)
+UPDATE_FILE = seasons.path("results")
+STANDINGS_FILE = seasons.path("standings")
 UPDATE_TOKEN = os.environ.get("NHL_UPDATE_TOKEN", "")
-_update_lock = threading.Lock()
-_last_run = 0
 
-def update_espn_games_file(season_start=date(2025, 10, 7), out_file=UPDATE_FILE):
+def update_espn_games_file(season_start=seasons.get()["start"], out_file=UPDATE_FILE):
     """Incrementally append FINAL regular-season games to out_file.
        Returns a human-readable status string."""
     tz = zoneinfo.ZoneInfo("America/Edmonton")
-    today = date.today()
-    base_url = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard"
+    today = min(date.today(), seasons.get()["end"])
+    base_url = ESPN_SCOREBOARD
 
     existing_lines, known_ids = [], set()
     if os.path.exists(out_file):
@@ -40,43 +42,14 @@ def update_espn_games_file(season_start=date(2025, 10, 7), out_file=UPDATE_FILE)
             resp = requests.get(f"{base_url}?dates={datestr}", timeout=10)
             resp.raise_for_status()
             data = resp.json()
-            for ev in data.get("events", []):
-                gid = ev.get("id")
-                if not gid or gid in known_ids:
+            for g in parse_events(data):
+                if g.state != "final" or not g.gid or g.gid in known_ids:
                     continue
-
-                st = ev.get("status", {}).get("type", {})
-                desc = (st.get("description") or "").lower()
-                if "final" not in desc:
-                    continue
-                if ev.get("season", {}).get("type") != 2:
-                    continue
-
-                comp = ev.get("competitions", [{}])[0]
-                detail_text = " ".join([
-                    str(st.get(x, "")) for x in ("shortDetail", "detail", "description")
-                ] + [
-                    str(comp.get("status", {}).get("type", {}).get(x, "")) for x in ("shortDetail", "detail", "description")
-                ]).lower()
-                note = "SO" if ("shootout" in detail_text or " so" in detail_text or "/so" in detail_text) \
-                    else ("OT" if ("overtime" in detail_text or " ot" in detail_text or "/ot" in detail_text) else "")
-
-                teams = comp.get("competitors", [])
-                if len(teams) < 2:
-                    continue
-                home = next((t for t in teams if t.get("homeAway") == "home"), {})
-                away = next((t for t in teams if t.get("homeAway") == "away"), {})
-
-                h_name = home.get("team", {}).get("abbreviation", "???")
-                a_name = away.get("team", {}).get("abbreviation", "???")
-                h_score = home.get("score", "?")
-                a_score = away.get("score", "?")
-
-                line = f"{gid} {a_name} {a_score} @ {h_name} {h_score}"
-                if note:
-                    line += f" {note}"
+                line = f"{g.gid} {g.away} {g.a_score or '?'} @ {g.home} {g.h_score or '?'}"
+                if g.note:
+                    line += f" {g.note}"
                 all_lines.append(line)
-                known_ids.add(gid)
+                known_ids.add(g.gid)
                 added += 1
         except Exception as e:
             print(f"[NHL update] {datestr} error: {e}")
@@ -91,7 +64,7 @@ def update_espn_games_file(season_start=date(2025, 10, 7), out_file=UPDATE_FILE)
 def update_espn_standings_file(out_file=STANDINGS_FILE):
     """Fetch and save current NHL standings to out_file."""
     tz = zoneinfo.ZoneInfo("America/Edmonton")
-    standings_url = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/standings"
+    standings_url = ESPN_STANDINGS
     try:
         resp = requests.get(standings_url, timeout=10)
         resp.raise_for_status()
@@ -104,6 +77,8 @@ def update_espn_standings_file(out_file=STANDINGS_FILE):
                     stats = {s["name"]: s["value"] for s in entry.get("stats", [])}
                     teams.append({
                         "name": t.get("abbreviation", "???"),
+                        "conference": conf.get("name", ""),
+                        "division": div.get("name", ""),
                         "wins": int(stats.get("wins", 0)),
                         "losses": int(stats.get("losses", 0)),
                         "otLosses": int(stats.get("otLosses", 0)),
@@ -111,12 +86,18 @@ def update_espn_standings_file(out_file=STANDINGS_FILE):
                         "goalsAgainst": int(stats.get("goalsAgainst", 0)),
                         "points": int(stats.get("points", 0))
                     })
+        # keep the conference/division grouping, by points within each division
         teams.sort(key=lambda x: x["points"], reverse=True)
-        lines = [f"NHL STANDINGS (Generated {datetime.datetime.now(tz).strftime('%Y-%m-%d %H:%M:%S')})"]
-        lines.append("-" * 50)
-        lines.append("Team     W   L   OTL    GF    GA   PTS")
+        groups = {}
         for team in teams:
-            lines.append(f"{team['name']:<8} {team['wins']:>3} {team['losses']:>3} {team['otLosses']:>3} {team['goalsFor']:>4} {team['goalsAgainst']:>4} {team['points']:>3}")
+            groups.setdefault((team["conference"], team["division"]), []).append(team)
+        lines = [f"NHL STANDINGS (Generated {datetime.datetime.now(tz).strftime('%Y-%m-%d %H:%M:%S')})"]
+        for (conf, div), members in sorted(groups.items()):
+            lines.append("-" * 50)
+            lines.append(f"{conf} / {div}".strip(" /") or "League")
+            lines.append("Team     W   L   OTL    GF    GA   PTS")
+            for team in members:
+                lines.append(f"{team['name']:<8} {team['wins']:>3} {team['losses']:>3} {team['otLosses']:>3} {team['goalsFor']:>4} {team['goalsAgainst']:>4} {team['points']:>3}")
         with open(out_file, "w") as f:
             f.write("\n".join(lines))
         return f"Standings updated with {len(teams)} teams. {datetime.datetime.now(tz).strftime('%-I:%M %p %b %d, %Y')}."
@@ -124,72 +105,30 @@ def update_espn_standings_file(out_file=STANDINGS_FILE):
         print(f"[NHL standings update] error: {e}")
         return f"Standings update failed: {e}"
 
-def _should_run_now_edmonton():
-    tz = zoneinfo.ZoneInfo("America/Edmonton")
-    now = datetime.datetime.now(tz)
-    return (18 <= now.hour <= 23) or (now.hour == 0) or (now.hour == 1) or (now.hour == 8)
-
 def auto_updater_loop():
-    global _last_run
-    while True:
-        try:
-            if _should_run_now_edmonton():
-                with _update_lock:
-                    if time.time() - _last_run > 3600:  # Run at most once per hour
-                        print("[NHL update] Running auto update...")
-                        status_games = update_espn_games_file()
-                        status_standings = update_espn_standings_file()
-                        print(f"[NHL update] Games: {status_games}")
-                        print(f"[NHL update] Standings: {status_standings}")
-                        _last_run = time.time()
-            time.sleep(300)  # Check every 5 minutes
-        except Exception as e:
-            print(f"[NHL update] auto loop error: {e}")
-            time.sleep(300)
+    """Superseded by the game-day aware scheduler in nhl_routes/scheduler.py."""
+    from nhl_routes.scheduler import scheduler_loop
+    scheduler_loop(time.sleep)
 
 @nhl_bp.route("/nhl")
 def nhl_scoreboard():
     tz = zoneinfo.ZoneInfo("America/Edmonton")
     today = date.today().strftime("%Y%m%d")
-    base_url = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard"
+    base_url = ESPN_SCOREBOARD
     try:
         resp = requests.get(f"{base_url}?dates={today}", timeout=10)
         resp.raise_for_status()
         data = resp.json()
-        events = data.get("events", [])
         games = []
-        for ev in events:
-            if ev.get("season", {}).get("type") != 2:  # regular season only
-                continue
-            st = ev.get("status", {}).get("type", {})
-            desc = (st.get("description") or "").lower()
-            comp = ev.get("competitions", [{}])[0]
-            detail_text = " ".join([
-                str(st.get(x, "")) for x in ("shortDetail", "detail", "description")
-            ] + [
-                str(comp.get("status", {}).get("type", {}).get(x, "")) for x in ("shortDetail", "detail", "description")
-            ]).lower()
-            note = "SO" if ("shootout" in detail_text or " so" in detail_text or "/so" in detail_text) \
-                else ("OT" if ("overtime" in detail_text or " ot" in detail_text or "/ot" in detail_text) else "")
-
-            teams = comp.get("competitors", [])
-            if len(teams) < 2:
-                continue
-            home = next((t for t in teams if t.get("homeAway") == "home"), {})
-            away = next((t for t in teams if t.get("homeAway") == "away"), {})
-
-            h_name = home.get("team", {}).get("abbreviation", "???")
-            a_name = away.get("team", {}).get("abbreviation", "???")
-            h_score = home.get("score", "0")
-            a_score = away.get("score", "0")
-            status_class = "scheduled" if "scheduled" in desc else ("live" if "progress" in desc else "final")
-            score_line = f"{a_name} {a_score} @ {h_name} {h_score}"
-            if note:
-                score_line += f" {note}"
+        for g in parse_events(data):
+            status_class = {"upcoming": "scheduled", "postponed": "scheduled"}.get(g.state, g.state)
+            score_line = f"{g.away} {g.a_score or '0'} @ {g.home} {g.h_score or '0'}"
+            if g.note:
+                score_line += f" {g.note}"
             games.append({
                 "line": score_line,
                 "status": status_class,
-                "gid": ev.get("id")
+                "gid": g.gid
             })
     except Exception as e:
         games = [{"line": f"Error fetching today's games: {e}", "status": "error", "gid": None}]
@@ -271,7 +210,7 @@ Last updated: {now}
 def nhl_standings():
     import textwrap
     tz = zoneinfo.ZoneInfo("America/Edmonton")
-    standings_url = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/standings"
+    standings_url = ESPN_STANDINGS
     try:
         resp = requests.get(standings_url, timeout=10)
         resp.raise_for_status()
@@ -284,6 +223,8 @@ def nhl_standings():
                     stats = {s["name"]: s["value"] for s in entry.get("stats", [])}
                     teams.append({
                         "name": t.get("abbreviation", "???"),
+                        "conference": conf.get("name", ""),
+                        "division": div.get("name", ""),
                         "wins": int(stats.get("wins", 0)),
                         "losses": int(stats.get("losses", 0)),
                         "otLosses": int(stats.get("otLosses", 0)),
@@ -349,7 +290,7 @@ def nhl_standings():
 @nhl_bp.route("/nhl/stats")
 def nhl_stats():
     import textwrap
-    url = "https://api-web.nhle.com/v1/skater-stats-leaders/current"
+    url = NHL_STATS_LEADERS
     limit = int(request.args.get("limit", 15))
     try:
         data = requests.get(url, params={"limit": limit}, timeout=8).json()
@@ -421,4 +362,5 @@ def nhl_stats():
     return response
 
 def register_nhl_updater(socketio):
-    socketio.start_background_task(auto_updater_loop)
+    from nhl_routes.scheduler import register_nhl_scheduler
+    register_nhl_scheduler(socketio)
@@ -5,7 +5,6 @@ from flask import Blueprint
 nhl_bp = Blueprint("nhl", __name__)
 
 # Import submodules so their routes automatically register
-from . import scoreboard, standings, stats, updater, updater_page, more
+from . import scoreboard, standings, stats, jobs, updater, updater_page, more, ratings, team, h2h, stats_history, players
 
 from . import results_menu
-from .months import oct2025, nov2025, dec2025, jan2026, feb2026, mar2026, apr2026
@@ -0,0 +1,172 @@
+# nhl_routes/archive.py
+# Raw upstream response archive + offline rebuild.
+# Every new upstream body seen by upstream.get_json(..., archive=<endpoint>)
+# is stored gzip-compressed, one file per endpoint and date:
+#       archive/<endpoint>/<YYYYMMDD>.json.gz
+# (the latest body wins; dateless endpoints such as stats use today's date;
+# rosters are archived per team under rosters/<TEAM>).
+# `python -m nhl_routes.archive [--season 2025_26]` regenerates a season's
+# derived files (espn_games_<season>.txt, espn_schedule_<season>.txt,
+# nhl_stats_<season>.json, nhl_rosters_<season>.json) from the archived days
+# inside that season's dates, with no network, decoding days in parallel
+# across cores.
+# Standings are computed from the results file at request time, so they
+# follow automatically.
+import argparse, contextlib, datetime, gzip, hashlib, json, os, threading, time, zoneinfo
+from concurrent.futures import ProcessPoolExecutor
+from .lease import atomic_write, lease, Busy
+from . import seasons
+from espn import loads
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_DIR = os.path.join(BASE_DIR, "archive")
+TZ = zoneinfo.ZoneInfo("America/Edmonton")
+LEVEL = 6                   # gzip level: ~10x smaller, a few ms per payload
+
+_lock = threading.Lock()
+_archived = {}              # path -> blake2b of the body stored there
+
+
+def archive_path(endpoint, day):
+    return os.path.join(ARCHIVE_DIR, endpoint, f"{day}.json.gz")
+
+
+def _digest(body):
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def has(endpoint, day):
+    """True if a body is archived for endpoint on day (None = today)."""
+    path = archive_path(endpoint, day or datetime.datetime.now(TZ).strftime("%Y%m%d"))
+    with _lock:
+        return path in _archived or os.path.exists(path)
+
+
+def store(endpoint, day, body):
+    """Archive a raw response body (bytes) unless that exact body is already stored."""
+    day = day or datetime.datetime.now(TZ).strftime("%Y%m%d")
+    path = archive_path(endpoint, day)
+    digest = _digest(body)
+    with _lock:
+        if path not in _archived and os.path.exists(path):
+            try:
+                with gzip.open(path, "rb") as f:
+                    _archived[path] = _digest(f.read())
+            except (OSError, EOFError):
+                pass
+        if _archived.get(path) == digest:
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, gzip.compress(body, LEVEL))
+        _archived[path] = digest
+    return True
+
+
+def load(path):
+    with gzip.open(path, "rb") as f:
+        return loads(f.read())
+
+
+def days(endpoint):
+    """Sorted [(YYYYMMDD, path)] archived for endpoint."""
+    folder = os.path.join(ARCHIVE_DIR, endpoint)
+    try:
+        names = sorted(n for n in os.listdir(folder) if n.endswith(".json.gz"))
+    except FileNotFoundError:
+        return []
+    return [(n[:8], os.path.join(folder, n)) for n in names]
+
+
+# ---------------- Rebuild ----------------
+def _rebuild_day(item):
+    """Worker: one archived scoreboard day -> (datestr, results, schedule lines)."""
+    # imported here: upstream imports this module, and updater/schedule import upstream
+    from .updater import final_game_lines
+    from .schedule import schedule_game_lines
+    datestr, path = item
+    data = load(path)
+    d = datetime.datetime.strptime(datestr, "%Y%m%d").date()
+    return datestr, final_game_lines(data, d), [line for _, line in schedule_game_lines(data, datestr)]
+
+
+def _rebuild_rosters(first, last):
+    """Latest archived roster per team within [first, last] -> rosters store (None if none)."""
+    # imported here for the same cycle as above (rosters imports upstream)
+    from .rosters import archive_endpoint, normalize, roster_hash
+    from .teams import TEAMS
+    teams = {}
+    for team in TEAMS:
+        snaps = [item for item in days(archive_endpoint(team)) if first <= item[0] <= last]
+        if not snaps:
+            continue
+        path = snaps[-1][1]
+        players = normalize(load(path))
+        teams[team] = {"hash": roster_hash(players), "fetched": round(os.path.getmtime(path)),
+                       "players": players}
+    if not teams:
+        return None
+    return {"updated": max(t["fetched"] for t in teams.values()),
+            "teams": {t: teams[t] for t in sorted(teams)}}
+
+
+def rebuild(out_dir=None, workers=None, season=None):
+    """Regenerate a season's derived files (default: current season, into its
+    partition) from the archive. Returns a status string."""
+    s = seasons.get(season)
+    first, last = s["start"].strftime("%Y%m%d"), s["end"].strftime("%Y%m%d")
+    t0 = time.perf_counter()
+    scoreboard = [item for item in days("scoreboard") if first <= item[0] <= last]
+    stats = [item for item in days("stats") if first <= item[0] <= last]
+    rosters = _rebuild_rosters(first, last)
+    if not scoreboard and not stats and not rosters:
+        return f"Archive has nothing for {s['label']}; nothing to rebuild."
+
+    results, known, schedule = [], set(), []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for datestr, finals, sched in pool.map(_rebuild_day, scoreboard, chunksize=8):
+            for gid, line in finals:
+                if gid not in known:  # late games can show up on two days
+                    known.add(gid)
+                    results.append(line)
+            schedule.extend(sched)
+    t_parse = time.perf_counter() - t0
+
+    partition = os.path.dirname(seasons.path("results", s["key"]))
+    out_dir = out_dir or partition
+    live = os.path.abspath(out_dir) == partition
+    os.makedirs(out_dir, exist_ok=True)
+    with contextlib.ExitStack() as held:
+        if live:  # don't race the updaters on the real files
+            for name in ("results", "schedule", "stats", "rosters"):
+                held.enter_context(lease(name))
+        out = lambda kind: os.path.join(out_dir, os.path.basename(seasons.path(kind, s["key"])))
+        if scoreboard:
+            atomic_write(out("results"), "\n".join(results))
+            atomic_write(out("schedule"), "\n".join(schedule))
+        if stats:
+            with gzip.open(stats[-1][1], "rb") as f:
+                atomic_write(out("stats"), f.read())
+        if rosters:
+            atomic_write(out("rosters"), json.dumps(rosters, separators=(",", ":")))
+
+    n_teams = len(rosters["teams"]) if rosters else 0
+    return (f"Rebuilt from {len(scoreboard)} scoreboard days + {len(stats)} stats snapshots + "
+            f"{n_teams} team rosters: "
+            f"{len(results)} results, {len(schedule)} scheduled games in "
+            f"{time.perf_counter() - t0:.2f}s (decode {t_parse:.2f}s) -> {out_dir}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Rebuild derived NHL files from the raw response archive.")
+    ap.add_argument("--out", default=None, help="output directory (default: the season's live files)")
+    ap.add_argument("--season", default=None, help="season key, e.g. 2025_26 (default: current)")
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    args = ap.parse_args()
+    try:
+        print(rebuild(args.out, args.workers, args.season))
+    except Busy as holder:
+        print(f"An update is running ({holder}); try again later or use --out.")
+
+
+if __name__ == "__main__":
+    main()
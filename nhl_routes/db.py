@@ -0,0 +1,390 @@
+# nhl_routes/db.py
+# Embedded SQLite store (WAL) for games, schedule and skater leaders, one
+# per season partition (nhl_<season>.sqlite3 next to that season's files).
+# - the text files stay the interchange format; the updaters upsert what
+#   they write into the current season's store (idempotent: the same lines
+#   twice are a no-op, games no longer in the file are removed)
+# - readers query it behind their mtime caches: results.load_season /
+#   team_games, the scoreboard's schedule by day and team, stats leaders.
+#   On a cache miss synced() first re-imports a file the store has not seen
+#   (hand-edited, restored, rebuilt from the archive): each table records the
+#   mtime and size of the file it was loaded from
+# - any sqlite error is logged and the reader parses the text file instead
+# - WAL mode: readers never block the writer and vice versa; one connection
+#   per thread and database
+#   python -m nhl_routes.db import [--season KEY]        (text files -> db)
+#   python -m nhl_routes.db export [DIR] [--season KEY]  (db -> text files)
+# Export writes the files in the formats the updaters write, so files they
+# wrote round-trip byte-for-byte; lines the parsers reject, and repeated game
+# ids in the results file, are not kept.
+import argparse, contextlib, json, os, sqlite3, threading, time
+from .results import parse_result_line
+from .schedule import parse_schedule_line, read_schedule_days
+from .lease import atomic_write, lease, Busy
+from . import seasons
+
+DB_FILE = seasons.path("db")            # current season
+CATEGORIES = ("points", "goals", "assists")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    gid      TEXT PRIMARY KEY,
+    day      TEXT NOT NULL,          -- YYYY-MM-DD ('' for old undated lines)
+    away     TEXT NOT NULL,
+    a_score  INTEGER NOT NULL,
+    home     TEXT NOT NULL,
+    h_score  INTEGER NOT NULL,
+    note     TEXT NOT NULL DEFAULT '',
+    seq      INTEGER NOT NULL        -- line order in the results file
+);
+CREATE INDEX IF NOT EXISTS games_day ON games(day, seq);
+CREATE INDEX IF NOT EXISTS games_away ON games(away, day);
+CREATE INDEX IF NOT EXISTS games_home ON games(home, day);
+
+CREATE TABLE IF NOT EXISTS schedule (
+    key      TEXT PRIMARY KEY,       -- ESPN game id, or day-away-home for old lines
+    gid      TEXT NOT NULL DEFAULT '',
+    day      TEXT NOT NULL,          -- YYYYMMDD
+    away     TEXT NOT NULL,
+    home     TEXT NOT NULL,
+    time     TEXT NOT NULL,          -- '7:00 PM', 'PPD', 'TBD'
+    seq      INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS schedule_day ON schedule(day, seq);
+CREATE INDEX IF NOT EXISTS schedule_away ON schedule(away, day);
+CREATE INDEX IF NOT EXISTS schedule_home ON schedule(home, day);
+
+CREATE TABLE IF NOT EXISTS leaders (
+    category TEXT NOT NULL,
+    rank     INTEGER NOT NULL,
+    first    TEXT NOT NULL,
+    last     TEXT NOT NULL,
+    team     TEXT NOT NULL,
+    value    TEXT NOT NULL,          -- as the NHL sends it
+    PRIMARY KEY (category, rank)
+);
+CREATE INDEX IF NOT EXISTS leaders_team ON leaders(team);
+
+CREATE TABLE IF NOT EXISTS blobs (
+    name     TEXT PRIMARY KEY,       -- 'stats': the leaders file as written
+    body     TEXT NOT NULL,
+    updated  REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sources (
+    kind     TEXT PRIMARY KEY,       -- 'results', 'schedule', 'stats'
+    mtime    REAL NOT NULL,          -- of the file the table was loaded from
+    size     INTEGER NOT NULL
+);
+"""
+
+_local = threading.local()
+_sync_lock = threading.Lock()
+
+
+def connect(path=DB_FILE):
+    """Per-thread connection (WAL, created on first use)."""
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; fine for derived data
+        conn.executescript(SCHEMA)
+        conns[path] = conn
+    return conn
+
+
+def for_file(path, kind):
+    """Store of the season whose `kind` file is path (None for other paths)."""
+    path = os.path.normpath(os.path.abspath(path))
+    for key in seasons.keys():
+        if seasons.path(kind, key) == path:
+            return seasons.path("db", key)
+    return None
+
+
+def _version(source):
+    st = os.stat(source)
+    return st.st_mtime, st.st_size
+
+
+def _stamp(conn, kind, version):
+    conn.execute("INSERT INTO sources (kind, mtime, size) VALUES (?,?,?) "
+                 "ON CONFLICT(kind) DO UPDATE SET mtime=excluded.mtime, size=excluded.size",
+                 (kind,) + tuple(version))
+
+
+def stamped(kind, mtime, path=DB_FILE):
+    """True if the store holds the `kind` file as of mtime."""
+    row = connect(path).execute("SELECT mtime FROM sources WHERE kind = ?", (kind,)).fetchone()
+    return row is not None and row[0] == mtime
+
+
+# ---------------- Upserts (called by the updaters) ----------------
+def upsert_games(lines, source=None, path=DB_FILE):
+    """Store the results file's lines (idempotent). source is the file they
+    were just written to: its version is recorded, so readers don't re-import it."""
+    version = _version(source) if source else None
+    rows = []
+    for seq, line in enumerate(lines):
+        g = parse_result_line(line)
+        if g and g[0]:
+            rows.append(g + (seq,))
+    conn = connect(path)
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_games (gid TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM keep_games")
+        conn.executemany("INSERT OR IGNORE INTO keep_games VALUES (?)", [(r[0],) for r in rows])
+        conn.execute("DELETE FROM games WHERE gid NOT IN (SELECT gid FROM keep_games)")
+        conn.executemany(
+            "INSERT INTO games (gid, day, away, a_score, home, h_score, note, seq) VALUES (?,?,?,?,?,?,?,?) "
+            "ON CONFLICT(gid) DO UPDATE SET day=excluded.day, away=excluded.away, a_score=excluded.a_score, "
+            "home=excluded.home, h_score=excluded.h_score, note=excluded.note, seq=excluded.seq "
+            "WHERE (day, away, a_score, home, h_score, note, seq) IS NOT "
+            "(excluded.day, excluded.away, excluded.a_score, excluded.home, excluded.h_score, "
+            "excluded.note, excluded.seq)",  # unchanged rows are not rewritten
+            rows)
+        if version:
+            _stamp(conn, "results", version)
+    return len(rows)
+
+
+def replace_schedule(days, source=None, path=DB_FILE):
+    """Store a full {YYYYMMDD: [schedule line]} map (games no longer listed are removed)."""
+    version = _version(source) if source else None
+    rows = []
+    seq = 0
+    for day in sorted(days):
+        for line in days[day]:
+            p = parse_schedule_line(line)
+            if not p:
+                continue
+            d, away, home, time_text, gid = p
+            rows.append((gid or f"{d}-{away}-{home}", gid, d, away, home, time_text, seq))
+            seq += 1
+    conn = connect(path)
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep (key TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM keep")
+        conn.executemany("INSERT OR IGNORE INTO keep VALUES (?)", [(r[0],) for r in rows])
+        conn.execute("DELETE FROM schedule WHERE key NOT IN (SELECT key FROM keep)")
+        conn.executemany(
+            "INSERT INTO schedule (key, gid, day, away, home, time, seq) VALUES (?,?,?,?,?,?,?) "
+            "ON CONFLICT(key) DO UPDATE SET gid=excluded.gid, day=excluded.day, away=excluded.away, "
+            "home=excluded.home, time=excluded.time, seq=excluded.seq "
+            "WHERE (gid, day, away, home, time, seq) IS NOT "
+            "(excluded.gid, excluded.day, excluded.away, excluded.home, excluded.time, excluded.seq)",
+            rows)
+        if version:
+            _stamp(conn, "schedule", version)
+    return len(rows)
+
+
+def save_stats(body, source=None, path=DB_FILE):
+    """Store the leaders file (its text, as written) and its per-category rows."""
+    version = _version(source) if source else None
+    data = json.loads(body)
+    rows = []
+    for cat in CATEGORIES:
+        for rank, p in enumerate(data.get(cat, []) or [], 1):
+            rows.append((cat, rank, p.get("firstName", {}).get("default", ""),
+                         p.get("lastName", {}).get("default", ""), p.get("teamAbbrev", ""),
+                         str(p.get("value", "?"))))
+    conn = connect(path)
+    with conn:
+        conn.execute("DELETE FROM leaders")
+        conn.executemany("INSERT INTO leaders VALUES (?,?,?,?,?,?)", rows)
+        conn.execute("INSERT INTO blobs (name, body, updated) VALUES ('stats', ?, ?) "
+                     "ON CONFLICT(name) DO UPDATE SET body=excluded.body, updated=excluded.updated",
+                     (body, time.time()))
+        if version:
+            _stamp(conn, "stats", version)
+    return len(rows)
+
+
+def mirror(fn, *args, **kwargs):
+    """Run an upsert for an updater; the text file is already written, so a
+    db problem is logged rather than failing the update."""
+    try:
+        return fn(*args, **kwargs)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"[DB] {fn.__name__} failed: {e}")
+        return 0
+
+
+# ---------------- Sync (readers' cache misses) ----------------
+def _load_results(source, path):
+    with open(source) as f:
+        return upsert_games([ln.strip() for ln in f if ln.strip()], path=path)
+
+
+def _load_schedule(source, path):
+    return replace_schedule(read_schedule_days(source), path=path)
+
+
+def _load_stats(source, path):
+    with open(source) as f:
+        return save_stats(f.read(), path=path)
+
+
+IMPORTERS = {"results": _load_results, "schedule": _load_schedule, "stats": _load_stats}
+
+
+def synced(source, kind):
+    """Store holding the current contents of a season's `kind` file, importing
+    it first if the store has not seen this version. None if source is not a
+    season file, is missing, or the store fails (the caller reads the file)."""
+    path = for_file(source, kind)
+    if path is None:
+        return None
+    try:
+        version = _version(source)
+        conn = connect(path)
+        query = "SELECT mtime, size FROM sources WHERE kind = ?"
+        if conn.execute(query, (kind,)).fetchone() != version:
+            with _sync_lock:
+                if conn.execute(query, (kind,)).fetchone() != version:
+                    t0 = time.perf_counter()
+                    n = IMPORTERS[kind](source, path)
+                    with conn:
+                        _stamp(conn, kind, version)  # as of before the read: a newer write re-imports
+                    print(f"[DB] imported {n} {kind} rows from {os.path.basename(source)} "
+                          f"in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        return path
+    except FileNotFoundError:
+        return None
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"[DB] {kind} sync failed: {e}")
+        return None
+
+
+def read(fn, *args):
+    """Run a query for a reader; None (the reader falls back to the file) on a db error."""
+    try:
+        return fn(*args)
+    except sqlite3.Error as e:
+        print(f"[DB] {fn.__name__} failed: {e}")
+        return None
+
+
+# ---------------- Queries ----------------
+GAME = "SELECT gid, day, away, a_score, home, h_score, note FROM games"
+
+
+def games(path=DB_FILE):
+    """Every game as (gid, day, away, a_score, home, h_score, note), by day then file order."""
+    return connect(path).execute(f"{GAME} ORDER BY day, seq").fetchall()
+
+
+def games_on(day, path=DB_FILE):
+    """Completed games on YYYY-MM-DD."""
+    return connect(path).execute(f"{GAME} WHERE day = ? ORDER BY seq", (day,)).fetchall()
+
+
+def games_for_team(abbr, path=DB_FILE):
+    """Finished games involving abbr, by day then file order."""
+    return connect(path).execute(
+        f"{GAME} WHERE (away = ?1 OR home = ?1) AND a_score != h_score ORDER BY day, seq", (abbr,)
+    ).fetchall()
+
+
+def game(gid, path=DB_FILE):
+    return connect(path).execute(f"{GAME} WHERE gid = ?", (gid,)).fetchone()
+
+
+def schedule_on(day, path=DB_FILE):
+    """[(away, home, time)] scheduled on YYYYMMDD."""
+    return connect(path).execute(
+        "SELECT away, home, time FROM schedule WHERE day = ? ORDER BY seq", (day,)).fetchall()
+
+
+def schedule_for_team(abbr, path=DB_FILE):
+    """[(day, away, home, time, gid)] for one team, in date order."""
+    return connect(path).execute(
+        "SELECT day, away, home, time, gid FROM schedule WHERE away = ?1 OR home = ?1 "
+        "ORDER BY day, seq", (abbr,)).fetchall()
+
+
+def leaders(category, limit=15, path=DB_FILE):
+    """[(first, last, team, value)] for one category, best first."""
+    return connect(path).execute(
+        "SELECT first, last, team, value FROM leaders WHERE category = ? ORDER BY rank LIMIT ?",
+        (category, limit)).fetchall()
+
+
+def blob(name, path=DB_FILE):
+    row = connect(path).execute("SELECT body FROM blobs WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+# ---------------- Import / export ----------------
+def import_files(key=None):
+    """Load a season's text files into its store (replacing what it holds)."""
+    path = seasons.path("db", key)
+    counts = {}
+    for kind, load in IMPORTERS.items():
+        source = seasons.path(kind, key)
+        try:
+            version = _version(source)
+            counts[kind] = load(source, path)
+        except FileNotFoundError:
+            counts[kind] = 0
+            continue
+        conn = connect(path)
+        with conn:
+            _stamp(conn, kind, version)
+    return counts
+
+
+def export_files(out_dir=None, key=None):
+    """Write a season's three text files from its store (default: over the live files)."""
+    live = os.path.dirname(seasons.path("db", key))
+    out_dir = out_dir or live
+    with contextlib.ExitStack() as held:
+        if os.path.abspath(out_dir) == live:  # don't race the updaters on the real files
+            for name in ("results", "schedule", "stats"):
+                held.enter_context(lease(name))
+        return _export(out_dir, key)
+
+
+def _export(out_dir, key):
+    path = seasons.path("db", key)
+    out = lambda kind: os.path.join(out_dir, os.path.basename(seasons.path(kind, key)))
+    conn = connect(path)
+    lines = []
+    for gid, day, away, a_score, home, h_score, note in conn.execute(f"{GAME} ORDER BY seq"):
+        line = f"{gid} {day + ' ' if day else ''}{away} {a_score} @ {home} {h_score}"
+        lines.append(line + (f" {note}" if note else ""))
+    atomic_write(out("results"), "\n".join(lines))
+
+    sched = [f"{day} {away} @ {home} {t}" + (f" #{gid}" if gid else "")
+             for day, away, home, t, gid in conn.execute(
+                 "SELECT day, away, home, time, gid FROM schedule ORDER BY day, seq")]
+    atomic_write(out("schedule"), "\n".join(sched))
+
+    body = blob("stats", path)
+    if body is not None:
+        atomic_write(out("stats"), body)
+    return {"games": len(lines), "schedule": len(sched), "stats": body is not None}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Import/export a season's NHL SQLite store.")
+    ap.add_argument("action", choices=("import", "export"))
+    ap.add_argument("out", nargs="?", default=None, help="export directory (default: the live files)")
+    ap.add_argument("--season", default=None, help="season key, e.g. 2025_26 (default: current)")
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    try:
+        counts = import_files(args.season) if args.action == "import" else export_files(args.out, args.season)
+    except Busy as holder:
+        print(f"An update is running ({holder}); try again later or export elsewhere.")
+        return
+    print(f"[DB] {args.action}: {counts} in {time.perf_counter() - t0:.2f}s ({seasons.path('db', args.season)})")
+
+
+if __name__ == "__main__":
+    main()
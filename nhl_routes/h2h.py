@@ -0,0 +1,149 @@
+# nhl_routes/h2h.py
+# Head-to-head matrix: MATRIX[f, i, j] = field f (results.FIELDS: GP, W, L,
+# OTL, RW, ROW, GF, GA, PTS) for team i in its games against team j, indexes
+# as in teams.INDEX. One dense int32 array, so a pair lookup is O(1) and the
+# full grid is O(teams^2); no request ever scans the games.
+# - refresh() keeps it current per results-file mtime; when the file only
+#   grew (same bytes up to the old size), just the new tail is read and added
+# - one matrix per results file (season partition, see seasons.py); the pages
+#   show the selected season's, built on first use
+# - the updater calls refresh() after writing new games, so the page and the
+#   standings tiebreaks find it built
+# NumPy is optional: without it there is no matrix (the page answers 501).
+import os, threading
+from flask import jsonify, make_response, request
+from . import nhl_bp, seasons
+from .results import RESULTS_FILE, FIELDS, parse_result_line, _result
+from .teams import TEAMS, INDEX, canon
+from layout import page, nhl_nav
+from utils import TH2
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+F = {name: k for k, name in enumerate(FIELDS)}
+TAIL = 256                  # bytes compared to tell an append from a rewrite
+
+_lock = threading.Lock()
+_states = {}                # results path -> {"mtime", "size", "tail", "games", "matrix"}
+
+
+def _add_lines(matrix, lines):
+    """Add results lines to matrix in place (vectorised) -> games added."""
+    n = len(TEAMS)
+    cells, rows = [], []
+    for line in lines:
+        g = parse_result_line(line)
+        if not g or g[3] == g[5]:
+            continue
+        _, _, away, a_score, home, h_score, note = g
+        a, h = INDEX.get(canon(away)), INDEX.get(canon(home))
+        if a is None or h is None:
+            continue
+        cells += (a * n + h, h * n + a)
+        rows += (_result(a_score, h_score, note), _result(h_score, a_score, note))
+    if cells:
+        rows = np.array(rows, np.int32)
+        flat = matrix.reshape(len(FIELDS), n * n)
+        for k in range(len(FIELDS)):
+            flat[k] += np.bincount(cells, weights=rows[:, k], minlength=n * n).astype(np.int32)
+    return len(cells) // 2
+
+
+def refresh(path=RESULTS_FILE):
+    """Bring the matrix up to date with the results file -> matrix (or None)."""
+    if np is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    with _lock:
+        _state = _states.setdefault(path, {"mtime": None, "size": 0, "tail": b"", "games": 0, "matrix": None})
+        if _state["mtime"] == st.st_mtime:
+            return _state["matrix"]
+        with open(path, "rb") as f:
+            start = _state["size"] if _state["matrix"] is not None and st.st_size >= _state["size"] else 0
+            if start:
+                f.seek(start - len(_state["tail"]))
+                if f.read(len(_state["tail"])) != _state["tail"]:
+                    start = 0  # rewritten, not appended
+            if start:
+                matrix, games = _state["matrix"].copy(), _state["games"]
+            else:
+                matrix, games = np.zeros((len(FIELDS), len(TEAMS), len(TEAMS)), np.int32), 0
+            f.seek(start)
+            data = f.read()
+        games += _add_lines(matrix, data.decode().splitlines())
+        size = start + len(data)
+        tail = (_state["tail"] + data)[-TAIL:] if start else data[-TAIL:]
+        _state.update(mtime=st.st_mtime, size=size, tail=tail, games=games, matrix=matrix)
+        if start:
+            print(f"[H2H] appended {len(data)} bytes ({games} games)")
+        return matrix
+
+
+def record(a, b, path=RESULTS_FILE):
+    """{field: value} for team a against team b (O(1))."""
+    matrix = refresh(path)
+    if matrix is None:
+        return None
+    return {name: int(v) for name, v in zip(FIELDS, matrix[:, INDEX[a], INDEX[b]])}
+
+
+# ---------------- Routes ----------------
+@nhl_bp.route("/nhl/h2h.json")
+def nhl_h2h_json():
+    season = seasons.selected()
+    path = seasons.path("results", season)
+    matrix = refresh(path)
+    if matrix is None:
+        return jsonify({"status": "error", "message": "Head-to-head needs NumPy and a results file"}), 501
+    a, b = request.args.get("a"), request.args.get("b")
+    if a and b:
+        a, b = canon(a), canon(b)
+        if a not in INDEX or b not in INDEX:
+            return jsonify({"status": "error", "message": "Unknown team"}), 404
+        return jsonify({"team": a, "opponent": b, "season": season, "record": record(a, b, path)})
+    return jsonify({"teams": TEAMS, "fields": FIELDS, "season": season, "matrix": matrix.tolist()})
+
+
+@nhl_bp.route("/nhl/h2h")
+def nhl_h2h_html():
+    path = seasons.path("results", seasons.selected())
+    matrix = refresh(path)
+    if matrix is None:
+        return f"<pre>Head-to-head needs NumPy and '{os.path.basename(path)}'.</pre>", 501
+    gp, w, otl = matrix[F["GP"]].tolist(), matrix[F["W"]].tolist(), matrix[F["OTL"]].tolist()
+    diff = (matrix[F["GF"]] - matrix[F["GA"]]).tolist()
+
+    def cell(i, j):
+        if i == j:
+            return "<td class='self'></td>"
+        if not gp[i][j]:
+            return "<td></td>"
+        d = diff[i][j]
+        cls = "pos" if d > 0 else "neg" if d < 0 else ""
+        return (f"<td class='{cls}' title='{TEAMS[i]} vs {TEAMS[j]}: {d:+d} goals'>"
+                f"{w[i][j]}-{gp[i][j] - w[i][j] - otl[i][j]}-{otl[i][j]}</td>")
+
+    head = "".join(f"<th>{t}</th>" for t in TEAMS)
+    rows = "\n".join(
+        (f"<tr style='color:{TH2};'>" if team == "EDM" else "<tr>")
+        + f"<th><a href='/nhl/team/{team}'>{team}</a></th>"
+        + "".join(cell(i, j) for j in range(len(TEAMS))) + "</tr>"
+        for i, team in enumerate(TEAMS)
+    )
+    html = nhl_nav() + f"""
+  <div class="table-container">
+    <table>
+      <caption>Head-to-Head (row team's W-L-OTL vs column team)</caption>
+      <tr><th></th>{head}</tr>
+      {rows}
+    </table>
+  </div>"""
+    response = make_response(page(html, "nhl pg-standings pg-h2h", title="NHL Head-to-Head"))
+    response.headers["Cache-Control"] = "public, max-age=80"
+    return response
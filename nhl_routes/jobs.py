@@ -0,0 +1,147 @@
+# nhl_routes/jobs.py
+# Background job runner for the updater control panel.
+# POST /nhl/update-* enqueues a job and returns its id right away; a second
+# submit of the same job while it is queued/running gets the same id back.
+# The panel follows a job over Server-Sent Events (GET /nhl/jobs/<id>/stream)
+# or polls GET /nhl/jobs/<id>.
+from flask import jsonify, Response
+import threading, time, uuid, json
+from . import nhl_bp
+
+MAX_JOBS = 20               # finished jobs kept for the panel
+MAX_LOG = 400               # per-job log entries kept (one per fetched day; a season fits)
+                            # each entry has a "seq" (1, 2, ...), so readers resume after trimming
+STREAM_TICK = 0.25          # seconds between SSE checks
+
+_lock = threading.Lock()
+_jobs = {}                  # id -> job dict (insertion ordered)
+_active = {}                # name -> id of the queued/running job
+
+
+def _public(job, after=0):
+    """Public view of a job, with the log entries whose seq is > after."""
+    out = {k: v for k, v in job.items() if not k.startswith("_") and k != "log"}
+    out["log"] = [e for e in list(job["log"]) if e["seq"] > after]
+    end = job["finished"] or time.time()
+    out["elapsed"] = round(end - job["started"], 1) if job["started"] else 0.0
+    if job["progress"].get("fetching"):
+        # age of the in-flight upstream request (server clock)
+        out["fetch_age"] = round(time.time() - job["progress"]["fetch_started"], 1)
+    return out
+
+
+def _prune():
+    done = [jid for jid, j in _jobs.items() if j["state"] in ("done", "error")]
+    for jid in done[:max(0, len(done) - MAX_JOBS)]:
+        del _jobs[jid]
+
+
+def _run(job):
+    def progress(log=None, **fields):
+        job["progress"].update(fields)
+        if log is not None:
+            job["_seq"] += 1
+            job["log"].append(dict(log, seq=job["_seq"]))
+            del job["log"][:-MAX_LOG]
+        job["_version"] += 1
+
+    job["state"] = "running"
+    job["started"] = time.time()
+    try:
+        job["message"] = job["_fn"](*job["_args"], progress=progress)
+        job["state"] = "done"
+    except Exception as e:
+        job["message"] = f"{job['label']} failed: {e}"
+        job["state"] = "error"
+        print(f"[Jobs] {job['name']} error: {e}")
+    finally:
+        job["finished"] = time.time()
+        job["_version"] += 1
+        with _lock:
+            _active.pop(job["name"], None)
+            _prune()
+
+
+def submit(name, label, fn, *args):
+    """Start fn(*args, progress=cb) in the background; returns (job, is_new).
+    fn must accept a progress keyword and return a status string; it calls
+    progress(log={...}, **fields) to update fields and append a log entry."""
+    with _lock:
+        jid = _active.get(name)
+        if jid:
+            return _jobs[jid], False
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "name": name,
+            "label": label,
+            "state": "queued",
+            "progress": {},
+            "log": [],
+            "message": "",
+            "submitted": time.time(),
+            "started": None,
+            "finished": None,
+            "_fn": fn,
+            "_args": args,
+            "_version": 0,
+            "_seq": 0,
+        }
+        _jobs[job["id"]] = job
+        _active[name] = job["id"]
+    threading.Thread(target=_run, args=(job,), daemon=True).start()
+    return job, True
+
+
+def job_response(job, is_new):
+    """JSON body returned by the POST endpoints."""
+    verb = "Started" if is_new else "Already running:"
+    return {"status": "queued", "job": job["id"], "message": f"{verb} {job['label']}"}
+
+
+@nhl_bp.route("/nhl/jobs")
+def list_jobs():
+    with _lock:
+        jobs = [_public(j) for j in reversed(list(_jobs.values()))]
+    return jsonify(jobs)
+
+
+@nhl_bp.route("/nhl/jobs/<jid>")
+def job_status(jid):
+    job = _jobs.get(jid)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+    return jsonify(_public(job))
+
+
+@nhl_bp.route("/nhl/jobs/<jid>/stream")
+def job_stream(jid):
+    """Server-Sent Events: one 'progress' event per change (new log entries
+    only), then a final 'end' event."""
+    job = _jobs.get(jid)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+
+    def events():
+        seen_version, sent_seq, last_sent = -1, 0, 0.0
+        while True:
+            version = job["_version"]
+            finished = job["state"] in ("done", "error")
+            # send on change; while a request is in flight also send a 1s
+            # heartbeat so a stuck upstream call shows its growing age
+            stale = job["progress"].get("fetching") and time.time() - last_sent >= 1.0
+            if version != seen_version or stale:
+                data = _public(job, after=sent_seq)
+                if data["log"]:
+                    sent_seq = data["log"][-1]["seq"]
+                seen_version = version
+                last_sent = time.time()
+                yield f"event: progress\ndata: {json.dumps(data)}\n\n"
+            if finished:
+                yield "event: end\ndata: {}\n\n"
+                return
+            time.sleep(STREAM_TICK)
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,106 @@
+# nhl_routes/lease.py
+# Cross-process coordination for the updaters.
+# Every update (auto scheduler, manual panel routes, any worker process) takes
+# an exclusive flock on locks/<name>.lock before touching the data files; a
+# second caller gets a "busy" message instead of running a duplicate scan.
+# The lock file holds the current lease (pid, host, since) for diagnostics;
+# the kernel drops the flock if the holder dies, so no lease goes stale.
+# Last-run times are persisted in locks/state.json and shared by all workers.
+import fcntl, functools, json, os, socket, time, datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCK_DIR = os.path.join(BASE_DIR, "locks")
+STATE_FILE = os.path.join(LOCK_DIR, "state.json")
+
+
+class Busy(Exception):
+    """Raised when another worker holds the lease."""
+
+
+def _lock_path(name):
+    return os.path.join(LOCK_DIR, f"{name}.lock")
+
+
+def atomic_write(path, text):
+    """Write text (or bytes) to path via a temp file + rename (readers never see a partial file)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb" if isinstance(text, bytes) else "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def last_run(name, field="finished"):
+    """Epoch seconds the last successful run of `name` finished (or, with
+    field="started", started); 0 if never."""
+    return _read_state().get(name, {}).get(field, 0)
+
+
+def _record_run(name, started, message):
+    # callers hold the 'state' lease, so read-modify-write is safe across workers
+    with lease("state", wait=True):
+        state = _read_state()
+        state[name] = {"started": started, "finished": time.time(), "pid": os.getpid(),
+                       "message": message}
+        atomic_write(STATE_FILE, json.dumps(state, indent=1))
+
+
+class lease:
+    """Context manager: exclusive lease on `name` (raises Busy unless wait=True)."""
+
+    def __init__(self, name, wait=False):
+        self.name = name
+        self.wait = wait
+        self.f = None
+
+    def __enter__(self):
+        os.makedirs(LOCK_DIR, exist_ok=True)
+        self.f = open(_lock_path(self.name), "a+")
+        try:
+            fcntl.flock(self.f, fcntl.LOCK_EX if self.wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.f.seek(0)
+            holder = self.f.read().strip()
+            self.f.close()
+            raise Busy(holder or "another worker")
+        self.f.seek(0)
+        self.f.truncate()
+        self.f.write(f"pid {os.getpid()} on {socket.gethostname()} since "
+                     f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S}")
+        self.f.flush()
+        return self
+
+    def __exit__(self, *exc):
+        self.f.truncate(0)
+        fcntl.flock(self.f, fcntl.LOCK_UN)
+        self.f.close()
+        return False
+
+
+def exclusive(name, label):
+    """Decorator: run the update under the `name` lease and record its last run.
+    If another worker holds it, return a 'busy' status string instead."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            started = time.time()
+            try:
+                with lease(name):
+                    msg = fn(*args, **kwargs)
+            except Busy as holder:
+                msg = f"{label} update already running ({holder})."
+                print(f"[Lease] {msg}")
+                return msg
+            _record_run(name, started, msg)
+            return msg
+        return inner
+    return wrap
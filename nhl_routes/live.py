@@ -0,0 +1,77 @@
+# nhl_routes/live.py
+# Live-score channel on the Socket.IO "/live" namespace.
+# One background poller fetches today's scoreboard and pushes only the games
+# whose score/status changed, so ESPN load is independent of viewer count.
+# The poller runs only while at least one client is subscribed.
+from flask import request
+from flask_socketio import join_room
+import datetime, threading
+from .scoreboard import get_todays_games, TZ
+
+NAMESPACE = "/live"
+ROOM = "live_scores"
+POLL_LIVE = 20       # seconds between polls while a game is in progress
+POLL_IDLE = 120      # ... when nothing is live (pre-game / all final)
+
+_lock = threading.Lock()
+_subscribers = set()     # sids
+_snapshot = {}           # gid -> game dict (last pushed state)
+_poller_running = False
+
+
+def _changed_games(games):
+    """Update the snapshot and return only games that differ from it."""
+    changed = []
+    for g in games:
+        if _snapshot.get(g["gid"]) != g:
+            _snapshot[g["gid"]] = g
+            changed.append(g)
+    return changed
+
+
+def _now_text():
+    return datetime.datetime.now(TZ).strftime("%-I:%M %p")
+
+
+def _poll_loop(socketio):
+    global _poller_running
+    print("[Live] poller started")
+    while True:
+        with _lock:
+            if not _subscribers:
+                _poller_running = False
+                _snapshot.clear()
+                print("[Live] no subscribers, poller stopped")
+                return
+        games = get_todays_games(datetime.date.today(), max_age=0)
+        with _lock:
+            changed = _changed_games(games)
+        if changed:
+            socketio.emit("delta", {"games": changed, "time": _now_text()},
+                          to=ROOM, namespace=NAMESPACE)
+        live = any(g["state"] == "live" for g in games)
+        socketio.sleep(POLL_LIVE if live else POLL_IDLE)
+
+
+def register_live_scores(socketio):
+    @socketio.on("subscribe", namespace=NAMESPACE)
+    def on_subscribe():
+        global _poller_running
+        join_room(ROOM)
+        with _lock:
+            _subscribers.add(request.sid)
+            snapshot = list(_snapshot.values())
+            start = not _poller_running
+            _poller_running = True
+        if snapshot:
+            # late joiner: bring the page up to date right away
+            socketio.emit("delta", {"games": snapshot, "time": _now_text()},
+                          to=request.sid, namespace=NAMESPACE)
+        if start:
+            socketio.start_background_task(_poll_loop, socketio)
+
+    @socketio.on("disconnect", namespace=NAMESPACE)
+    def on_disconnect():
+        # Socket.IO drops the sid from its rooms itself
+        with _lock:
+            _subscribers.discard(request.sid)
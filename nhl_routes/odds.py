@@ -0,0 +1,194 @@
+# nhl_routes/odds.py
+# Monte Carlo playoff odds: plays out the remaining schedule SIMS times.
+# - played games: espn_games_<season>.txt (via results.py); remaining games:
+#   espn_schedule_<season>.txt lines whose game id is not in the results yet
+#   (current season only: seasons.py)
+# - per game: P(home win) from log5 of each team's regressed points% plus a
+#   home edge; OT_RATE of games go past regulation (loser gets a point)
+# - all seasons are simulated as arrays (sims x games), CHUNK at a time;
+#   points / regulation wins come from one matmul against team incidence
+# - qualification (top 3 per division + 2 wild cards per conference) is
+#   resolved with argpartition on a points / RW / random-draw key
+# Results are cached per data version (file mtimes) in memory and in
+# cache/playoff_odds.json, so every worker reuses one run.
+# NumPy is optional: without it the standings page simply has no odds.
+import json, os, threading, time
+from .results import RESULTS_FILE, read_results, standings_as_of, load_season
+from .schedule import SCHEDULE_FILE, read_schedule_days, parse_schedule_line
+from .teams import TEAMS, INDEX, DIVISIONS, CONFERENCES
+from .lease import atomic_write
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_FILE = os.path.join(BASE_DIR, "cache", "playoff_odds.json")
+
+SIMS = 100_000
+CHUNK = 10_000              # seasons per batch (bounds memory; yields between batches)
+OT_RATE = 0.23              # share of NHL games decided in OT/SO
+HOME_EDGE = 0.03            # added to the home side's win probability
+REGRESS_GP = 10             # regress points% toward .500 by this many games
+
+_lock = threading.Lock()
+_memo = {"version": None, "odds": None}
+_running = set()
+
+
+def data_version():
+    try:
+        return f"{os.path.getmtime(RESULTS_FILE):.3f}-{os.path.getmtime(SCHEDULE_FILE):.3f}-{SIMS}"
+    except OSError:
+        return None
+
+
+def remaining_games(played):
+    """[(home_idx, away_idx)] for scheduled games that are not in the results."""
+    played_ids = {g[0] for g in played if g[0]}
+    played_keys = {(g[1].replace("-", ""), g[2], g[4]) for g in played}
+    out = []
+    for lines in read_schedule_days(SCHEDULE_FILE).values():
+        for line in lines:
+            day, away, home, _, gid = parse_schedule_line(line)
+            if gid in played_ids or (day, away, home) in played_keys:
+                continue
+            if home in INDEX and away in INDEX:
+                out.append((INDEX[home], INDEX[away]))
+    return out
+
+
+def strengths(table):
+    """Regressed points% per team (array in TEAMS order)."""
+    s = np.full(len(TEAMS), 0.5)
+    for team, st in table.items():
+        if team in INDEX:
+            s[INDEX[team]] = (st["PTS"] + REGRESS_GP) / (2.0 * (st["GP"] + REGRESS_GP))
+    return s
+
+
+def win_probs(home, away, s):
+    """log5 home-win probability for index arrays home/away."""
+    a, b = s[home], s[away]
+    p = (a - a * b) / (a + b - 2 * a * b)
+    return np.clip(p + HOME_EDGE, 0.05, 0.95)
+
+
+def simulate(base_pts, base_rw, home, away, p_home, sims=SIMS, seed=0, yield_=None):
+    """Play the remaining games sims times -> (playoff, division_win, mean_pts) per team."""
+    rng = np.random.default_rng(seed)
+    n_teams, n_games = len(base_pts), len(home)
+    H = np.zeros((n_games, n_teams), np.float32)
+    A = np.zeros((n_games, n_teams), np.float32)
+    H[np.arange(n_games), home] = 1
+    A[np.arange(n_games), away] = 1
+    p = p_home.astype(np.float32)
+    p_reg = p * (1 - OT_RATE)                  # home wins in regulation
+    p_ot = p + (1 - p) * OT_RATE               # below this: home win or away OT win
+
+    div_cols = [np.array([INDEX[t] for t in DIVISIONS[d]]) for d in DIVISIONS]
+    conf_cols = [np.array([INDEX[t] for d in divs for t in DIVISIONS[d]]) for divs in CONFERENCES.values()]
+    playoff = np.zeros(n_teams)
+    div_win = np.zeros(n_teams)
+    pts_sum = np.zeros(n_teams)
+
+    done = 0
+    while done < sims:
+        n = min(CHUNK, sims - done)
+        u = rng.random((n, n_games), dtype=np.float32)
+        home_w = (u < p).astype(np.float32)
+        home_pts = 2 * home_w + ((u >= p) & (u < p_ot))          # 2 win, 1 OT loss
+        away_pts = 2 - 2 * home_w + ((u < p) & (u >= p_reg))
+        pts = base_pts + home_pts @ H + away_pts @ A
+        rw = base_rw + (u < p_reg).astype(np.float32) @ H + (u >= p_ot).astype(np.float32) @ A
+        key = pts * 1000 + rw * 10 + rng.random((n, n_teams))  # points, RW, then a coin flip
+
+        made = np.zeros((n, n_teams), bool)
+        rows = np.arange(n)[:, None]
+        for cols in div_cols:
+            sub = key[:, cols]
+            top3 = np.argpartition(-sub, 2, axis=1)[:, :3]
+            made[rows, cols[top3]] = True
+            div_win[cols] += np.bincount(sub.argmax(axis=1), minlength=len(cols))
+        for cols in conf_cols:
+            rest = np.where(made[:, cols], -np.inf, key[:, cols])
+            wild = np.argpartition(-rest, 1, axis=1)[:, :2]
+            made[rows, cols[wild]] = True
+
+        playoff += made.sum(axis=0)
+        pts_sum += pts.sum(axis=0)
+        done += n
+        if yield_:
+            yield_()  # let other green threads run between batches
+    return playoff / sims, div_win / sims, pts_sum / sims
+
+
+def compute(sims=SIMS):
+    """Run the simulation for the current files -> {team: {playoff, division, points}}."""
+    t0 = time.perf_counter()
+    played = read_results()
+    table = standings_as_of(None, load_season())
+    games = remaining_games(played)
+    base_pts = np.zeros(len(TEAMS), np.float32)
+    base_rw = np.zeros(len(TEAMS), np.float32)
+    for team, st in table.items():
+        if team in INDEX:
+            base_pts[INDEX[team]] = st["PTS"]
+            base_rw[INDEX[team]] = st["RW"]
+    s = strengths(table)
+    home = np.array([g[0] for g in games], int)
+    away = np.array([g[1] for g in games], int)
+    playoff, div_win, points = simulate(base_pts, base_rw, home, away, win_probs(home, away, s),
+                                        sims, seed=len(played), yield_=lambda: time.sleep(0))
+    odds = {t: {"playoff": round(float(playoff[i]), 4), "division": round(float(div_win[i]), 4),
+                "points": round(float(points[i]), 1)} for t, i in INDEX.items()}
+    print(f"[Odds] {sims} seasons x {len(games)} games in {time.perf_counter() - t0:.2f}s")
+    return odds
+
+
+def _run(version):
+    try:
+        odds = compute()
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        atomic_write(CACHE_FILE, json.dumps({"version": version, "odds": odds}))
+        with _lock:
+            _memo.update(version=version, odds=odds)
+    except Exception as e:
+        print(f"[Odds] failed: {e}")
+    finally:
+        with _lock:
+            _running.discard(version)
+
+
+def playoff_odds(wait=False):
+    """Odds for the current data version, or None while they are being computed
+    (the first call for a new version starts the run in the background)."""
+    if np is None:
+        return None
+    version = data_version()
+    if version is None:
+        return None
+    with _lock:
+        if _memo["version"] == version:
+            return _memo["odds"]
+    try:
+        with open(CACHE_FILE) as f:
+            cached = json.load(f)
+        if cached.get("version") == version:
+            with _lock:
+                _memo.update(version=version, odds=cached["odds"])
+            return cached["odds"]
+    except (FileNotFoundError, ValueError):
+        pass
+
+    with _lock:
+        start = version not in _running
+        _running.add(version)
+    if wait:
+        if start:
+            _run(version)
+        return _memo["odds"] if _memo["version"] == version else None
+    if start:
+        threading.Thread(target=_run, args=(version,), daemon=True).start()
+    return None
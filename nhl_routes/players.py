@@ -0,0 +1,138 @@
+# nhl_routes/players.py
+# Player search over the stats leaders (nhl_stats_<season>.json) and the
+# rosters (nhl_rosters_<season>.json, once fetched) of the current season, for typeahead lookups:
+#   GET /nhl/players?q=mcd  -> best matches as JSON
+# The index is rebuilt when either file's mtime changes:
+# - prefix: sorted (token, player) pairs for every name word and the full
+#   name, so "mcd" / "connor mc" are two bisects into one list
+# - trigrams: trigram -> player set, for substrings ("avid") and typos
+#   ("mcdavdi"); candidates are ranked by shared trigrams
+# Names are folded to lowercase ASCII, so "stutzle" finds "Stützle".
+import json, os, time, unicodedata
+from bisect import bisect_left
+from flask import jsonify, request
+from . import nhl_bp, seasons
+from .stats import STATS_FILE, SECTIONS, load_stats
+
+ROSTERS_FILE = seasons.path("rosters")  # current season
+MAX_RESULTS = 10
+MIN_SHARED = 0.5            # fuzzy matches need this share of the query's trigrams
+
+_index = {"key": None, "players": [], "prefix": [], "trigrams": {}}
+
+
+def fold(text):
+    """Lowercase ASCII form used for matching."""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).lower().strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _players():
+    """Merged player list: {id: {"id", "name", "team", "pos", "number"}}; rosters win over stats."""
+    players = {}
+    stats = load_stats() or {}  # parsed once per mtime by stats.py
+    for key, _ in SECTIONS:
+        for p in stats.get(key, []) or []:
+            name = f"{p.get('firstName', {}).get('default', '')} {p.get('lastName', {}).get('default', '')}".strip()
+            pid = str(p.get("id") or name)
+            players.setdefault(pid, {"id": pid, "name": name, "team": p.get("teamAbbrev", ""),
+                                     "pos": p.get("position", ""), "number": None})
+    try:
+        with open(ROSTERS_FILE) as f:
+            rosters = json.load(f)
+    except (OSError, ValueError):
+        rosters = {}
+    for team, roster in (rosters.get("teams") or {}).items():
+        for p in roster.get("players", []):
+            pid = str(p["id"])
+            players[pid] = {"id": pid, "name": p["name"], "team": team,
+                            "pos": p.get("pos", ""), "number": p.get("number")}
+    return list(players.values())
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def load_index():
+    """The search index for the current files (rebuilt when they change)."""
+    key = (_mtime(STATS_FILE), _mtime(ROSTERS_FILE))
+    if _index["key"] != key:
+        t0 = time.perf_counter()
+        players = _players()
+        prefix, grams = [], {}
+        for i, p in enumerate(players):
+            name = fold(p["name"])
+            p["folded"] = name
+            for token in set(name.split()) | {name}:
+                prefix.append((token, i))
+            for g in trigrams(name):
+                grams.setdefault(g, set()).add(i)
+        prefix.sort()
+        _index.update(key=key, players=players, prefix=prefix, trigrams=grams)
+        print(f"[Players] indexed {len(players)} players in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    return _index
+
+
+def _prefix_hits(index, q):
+    """{player: rank} for names or name words starting with q (0 = full name)."""
+    prefix = index["prefix"]
+    hits = {}
+    i = bisect_left(prefix, (q,))
+    while i < len(prefix) and prefix[i][0].startswith(q):
+        token, p = prefix[i]
+        rank = 0 if token == index["players"][p]["folded"] else 1
+        hits[p] = min(hits.get(p, rank), rank)
+        i += 1
+    return hits
+
+
+def search(query, limit=MAX_RESULTS):
+    """Best matches for query: prefix hits first, then substring / fuzzy trigram matches."""
+    q = " ".join(fold(query).split())
+    if not q:
+        return []
+    index = load_index()
+    players = index["players"]
+    scored = {p: (rank, 0.0) for p, rank in _prefix_hits(index, q).items()}
+    words = q.split()
+    if len(words) > 1:  # "con mcd": every word starts some name word
+        for p in set.intersection(*(set(_prefix_hits(index, w)) for w in words)):
+            scored.setdefault(p, (1, 0.0))
+    if len(scored) < limit and len(q) >= 3:
+        want = trigrams(q)
+        counts = {}
+        for g in want:
+            for p in index["trigrams"].get(g, ()):
+                counts[p] = counts.get(p, 0) + 1
+        for p, n in counts.items():
+            if p in scored:
+                continue
+            if q in players[p]["folded"]:
+                scored[p] = (2, -n)
+            elif n >= MIN_SHARED * len(want):
+                scored[p] = (3, -n / len(want))
+    best = sorted(scored, key=lambda p: (scored[p], players[p]["name"]))[:limit]
+    return [{k: players[p][k] for k in ("id", "name", "team", "pos", "number")} for p in best]
+
+
+@nhl_bp.route("/nhl/players")
+def nhl_players_search():
+    """JSON typeahead: /nhl/players?q=<text>[&limit=N]."""
+    q = request.args.get("q", "")
+    try:
+        limit = max(1, min(int(request.args.get("limit", MAX_RESULTS)), 50))
+    except ValueError:
+        limit = MAX_RESULTS
+    t0 = time.perf_counter()
+    results = search(q, limit)
+    return jsonify({"query": q, "results": results,
+                    "ms": round((time.perf_counter() - t0) * 1000, 3)})
@@ -0,0 +1,270 @@
+# nhl_routes/ratings.py
+# Elo-style team ratings.
+# - update_completed_games hands every new results line to apply_lines():
+#   O(1) per game, state in cache/ratings.json, and one 14-byte record per
+#   game appended to cache/ratings_history.bin (gid, home, away, new ratings)
+# - replay() re-rates a whole season from compiled games; it is a tight
+#   loop over int tuples (<1 ms per season), so tune() can grid-search
+#   thousands of parameter sets
+# - the page / JSON read the persisted state when it matches the results
+#   file, otherwise they replay in memory (never stale); the persisted state
+#   and history are the current season's, older seasons are always replayed
+#   python -m nhl_routes.ratings tune
+import argparse, itertools, json, math, os, struct, time
+from flask import jsonify, make_response, request
+from . import nhl_bp, seasons
+from .results import RESULTS_FILE, parse_result_line
+from .teams import TEAMS, INDEX, canon
+from .lease import atomic_write
+from layout import page, nhl_nav
+from utils import TH2
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_FILE = os.path.join(BASE_DIR, "cache", "ratings.json")
+HISTORY_FILE = os.path.join(BASE_DIR, "cache", "ratings_history.bin")
+RECORD = struct.Struct("<IBBff")   # gid, home idx, away idx, home rating after, away rating after
+
+PARAMS = {
+    "k": 8.0,          # base step
+    "home": 35.0,      # home-ice edge (rating points)
+    "ot_win": 0.6,     # actual score for an OT/SO winner (loser gets 1 - this)
+    "mov": 1.0,        # weight of the margin-of-victory multiplier (0 = off)
+    "start": 1500.0,
+}
+
+
+# ---------------- Engine ----------------
+def compile_line(line):
+    """Results line -> (gid, home_idx, away_idx, h_score, a_score, ot) or None."""
+    g = parse_result_line(line)
+    if not g or g[3] == g[5]:
+        return None
+    gid, _, away, a_score, home, h_score, note = g
+    away, home = canon(away), canon(home)
+    if home not in INDEX or away not in INDEX:
+        return None
+    return int(gid or 0), INDEX[home], INDEX[away], h_score, a_score, note in ("OT", "SO")
+
+
+def compile_file(path=RESULTS_FILE):
+    games = []
+    try:
+        with open(path) as f:
+            for line in f:
+                g = compile_line(line)
+                if g:
+                    games.append(g)
+    except FileNotFoundError:
+        pass
+    return games
+
+
+def rate_game(r, g, p=PARAMS):
+    """Apply one compiled game to ratings list r in place; returns the home
+    side's pre-game win expectation (for scoring parameter sets)."""
+    _, h, a, hs, as_, ot = g
+    diff = r[h] + p["home"] - r[a]
+    expect = 1.0 / (1.0 + 10.0 ** (-diff / 400.0))
+    win = hs > as_
+    actual = (p["ot_win"] if win else 1 - p["ot_win"]) if ot else (1.0 if win else 0.0)
+    mult = 1.0 + p["mov"] * (math.log(abs(hs - as_) + 1) - math.log(2)) if not ot else 1.0
+    delta = p["k"] * mult * (actual - expect)
+    r[h] += delta
+    r[a] -= delta
+    return expect
+
+
+def replay(games, p=PARAMS, score=False):
+    """Rate compiled games from scratch -> (ratings list, log loss or None)."""
+    r = [p["start"]] * len(TEAMS)
+    k, home, ot_win, mov = p["k"], p["home"], p["ot_win"], p["mov"]
+    log2 = math.log(2)
+    loss = 0.0
+    for _, h, a, hs, as_, ot in games:  # rate_game inlined: this is the hot loop
+        expect = 1.0 / (1.0 + 10.0 ** ((r[a] - r[h] - home) / 400.0))
+        win = hs > as_
+        if ot:
+            actual = ot_win if win else 1 - ot_win
+            mult = 1.0
+        else:
+            actual = 1.0 if win else 0.0
+            mult = 1.0 + mov * (math.log(abs(hs - as_) + 1) - log2)
+        if score:
+            loss -= math.log(expect if win else 1 - expect)
+        delta = k * mult * (actual - expect)
+        r[h] += delta
+        r[a] -= delta
+    return r, (loss / len(games) if score and games else None)
+
+
+def tune(games, grid=None):
+    """Grid search -> [(log loss, params)] best first."""
+    grid = grid or {"k": [4, 6, 8, 10, 12, 16], "home": [0, 15, 25, 35, 50],
+                    "ot_win": [0.5, 0.55, 0.6, 0.65], "mov": [0.0, 0.5, 1.0]}
+    names = list(grid)
+    out = []
+    for combo in itertools.product(*(grid[n] for n in names)):
+        p = dict(PARAMS, **dict(zip(names, combo)))
+        out.append((replay(games, p, score=True)[1], p))
+    return sorted(out, key=lambda x: x[0])
+
+
+# ---------------- Persisted state (incremental) ----------------
+def _load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _save_state(state):
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    atomic_write(STATE_FILE, json.dumps(state))
+
+
+def apply_lines(all_lines, p=PARAMS):
+    """Bring the persisted ratings up to date with the results lines (file order).
+    Only lines past state['applied'] are rated; a rewritten file (different
+    prefix) or changed params trigger a full rebuild. Called with the
+    'results' lease held."""
+    state = _load_state()
+    n = len(all_lines)
+    fresh = (state is None or state.get("params") != p or state["applied"] > n
+             or (state["applied"] and all_lines[state["applied"] - 1] != state.get("last_line")))
+    if not fresh:
+        if state["applied"] == n:
+            return 0
+        kept = state.get("history_games", 0) * RECORD.size
+        try:
+            fresh = os.path.getsize(HISTORY_FILE) < kept  # history lost: rebuild it too
+        except OSError:
+            fresh = True
+    if fresh:
+        state = {"params": p, "ratings": [p["start"]] * len(TEAMS), "applied": 0, "last_line": ""}
+        kept = 0
+
+    os.makedirs(os.path.dirname(HISTORY_FILE), exist_ok=True)
+    with open(HISTORY_FILE, "ab") as hist:
+        hist.truncate(kept)  # drops a torn tail (or everything, on a rebuild)
+        r = state["ratings"]
+        for line in all_lines[state["applied"]:]:
+            g = compile_line(line)
+            if g:
+                rate_game(r, g, p)
+                hist.write(RECORD.pack(g[0], g[1], g[2], r[g[1]], r[g[2]]))
+        hist.flush()
+        state["history_games"] = os.path.getsize(HISTORY_FILE) // RECORD.size
+    new = n - state["applied"]
+    state.update(applied=n, last_line=all_lines[-1] if all_lines else "", updated=time.time())
+    _save_state(state)
+    return new
+
+
+def history(team):
+    """[(gid, rating after)] for one team from the history file."""
+    i = INDEX[team]
+    out = []
+    try:
+        with open(HISTORY_FILE, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return out
+    for gid, h, a, rh, ra in RECORD.iter_unpack(data[:len(data) - len(data) % RECORD.size]):
+        if h == i:
+            out.append((gid, round(rh, 1)))
+        elif a == i:
+            out.append((gid, round(ra, 1)))
+    return out
+
+
+_memos = {}                 # results path -> {"mtime", "ratings"}
+
+
+def current_ratings(path=RESULTS_FILE):
+    """{team: rating}: persisted state if it covers the results file, else an in-memory replay."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    memo = _memos.setdefault(path, {"mtime": None, "ratings": None})
+    if memo["mtime"] != mtime:
+        with open(path) as f:
+            lines = [ln.strip() for ln in f if ln.strip()]
+        state = _load_state() if path == RESULTS_FILE else None
+        if (state and state.get("params") == PARAMS and state["applied"] == len(lines)
+                and (not lines or lines[-1] == state.get("last_line"))):
+            r = state["ratings"]
+        else:
+            r = replay([g for g in map(compile_line, lines) if g])[0]
+        memo.update(mtime=mtime, ratings=dict(zip(TEAMS, r)))
+    return memo["ratings"]
+
+
+# ---------------- Routes ----------------
+@nhl_bp.route("/nhl/ratings.json")
+def nhl_ratings_json():
+    season = seasons.selected()
+    ratings = current_ratings(seasons.path("results", season))
+    team = request.args.get("history")
+    if team:
+        team = canon(team)
+        if team not in INDEX:
+            return jsonify({"status": "error", "message": "Unknown team"}), 404
+        return jsonify({"team": team, "season": season, "rating": round(ratings.get(team, PARAMS["start"]), 1),
+                        "history": history(team) if seasons.is_current(season) else []})
+    return jsonify({"params": PARAMS, "season": season,
+                    "ratings": {t: round(v, 1) for t, v in sorted(ratings.items(), key=lambda kv: -kv[1])}})
+
+
+@nhl_bp.route("/nhl/ratings")
+def nhl_ratings_html():
+    path = seasons.path("results", seasons.selected())
+    ratings = current_ratings(path)
+    if not ratings:
+        return f"<pre>File '{os.path.basename(path)}' not found.</pre>"
+    ranked = sorted(ratings.items(), key=lambda kv: -kv[1])
+    rows = "\n".join(
+        (f"<tr style='color:{TH2};'>" if team == "EDM" else "<tr>")
+        + f"<td>{n}</td><td><a href='/nhl/team/{team}'>{team}</a></td><td>{r:.0f}</td>"
+        f"<td>{r - PARAMS['start']:+.0f}</td></tr>"
+        for n, (team, r) in enumerate(ranked, 1)
+    )
+    html = nhl_nav() + f"""
+  <div class="table-container">
+    <table>
+      <caption>Elo Ratings</caption>
+      <tr><th>#</th><th>Team</th><th>Elo</th><th>+/-</th></tr>
+      {rows}
+    </table>
+  </div>"""
+    response = make_response(page(html, "nhl pg-standings", title="NHL Ratings"))
+    response.headers["Cache-Control"] = "public, max-age=80"
+    return response
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Elo ratings: replay speed and parameter search.")
+    ap.add_argument("action", choices=("tune", "bench"))
+    ap.add_argument("--n", type=int, default=1000, help="bench: replays to time")
+    args = ap.parse_args()
+    games = compile_file()
+    if not games:
+        print("No results to rate.")
+        return
+    if args.action == "bench":
+        t0 = time.perf_counter()
+        for _ in range(args.n):
+            replay(games)
+        dt = time.perf_counter() - t0
+        print(f"{args.n} replays of {len(games)} games: {dt:.2f}s ({dt / args.n * 1000:.2f} ms each)")
+        return
+    t0 = time.perf_counter()
+    results = tune(games)
+    print(f"{len(results)} parameter sets in {time.perf_counter() - t0:.2f}s")
+    for loss, p in results[:5]:
+        print(f"  log loss {loss:.4f}  " + "  ".join(f"{k}={p[k]}" for k in ("k", "home", "ot_win", "mov")))
+
+
+if __name__ == "__main__":
+    main()
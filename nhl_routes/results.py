@@ -0,0 +1,132 @@
+# nhl_routes/results.py
+# Reading a season's completed-games file (espn_games_<season>.txt), one game per line:
+#       <gid> YYYY-MM-DD AWAY SCORE @ HOME SCORE [OT|SO]
+# (older lines have no date: <gid> AWAY SCORE @ HOME SCORE [OT|SO])
+# Pages read a season's games from its SQLite store (db.py) when the file is
+# a season file and the store is usable, else by parsing the file.
+import os
+from bisect import bisect_right
+from . import seasons
+
+RESULTS_FILE = seasons.path("results")      # current season (the updater's file)
+
+
+def parse_result_line(line):
+    """Results line -> (gid, day, away, a_score, home, h_score, note) or None.
+    day is 'YYYY-MM-DD' or '' for old undated lines."""
+    parts = line.split()
+    if "@" not in parts:
+        return None
+    at = parts.index("@")
+    if at < 2 or len(parts) < at + 3:
+        return None
+    try:
+        a_score, h_score = int(parts[at - 1]), int(parts[at + 2])
+    except ValueError:
+        return None
+    head = parts[:at - 2]
+    gid = head[0] if head and head[0].isdigit() else ""
+    day = next((p for p in head if len(p) == 10 and p[4] == "-"), "")
+    note = parts[at + 3].upper() if len(parts) > at + 3 else ""
+    return gid, day, parts[at - 2], a_score, parts[at + 1], h_score, note
+
+
+def read_results(path=RESULTS_FILE):
+    """All parseable games in file order."""
+    games = []
+    try:
+        with open(path) as f:
+            for line in f:
+                g = parse_result_line(line)
+                if g:
+                    games.append(g)
+    except FileNotFoundError:
+        pass
+    return games
+
+
+# ---------------- Standings as of any date ----------------
+# Per team: the sorted days it played and, for each of those games, the
+# cumulative totals after it (GP/W/L/OTL/RW/ROW/GF/GA/PTS). Standings on day D
+# are then one bisect per team: O(teams log games), no re-scan of the season.
+# RW = regulation wins, ROW = regulation + overtime wins (no shootouts).
+FIELDS = ("GP", "W", "L", "OTL", "RW", "ROW", "GF", "GA", "PTS")
+ZERO = (0,) * len(FIELDS)
+_seasons = {}               # path -> {"mtime", "data"} (one entry per season partition read)
+
+
+def _result(gf, ga, note):
+    """One team's line for one game: (GP, W, L, OTL, RW, ROW, GF, GA, PTS)."""
+    if gf > ga:
+        return (1, 1, 0, 0, 0 if note in ("OT", "SO") else 1, 0 if note == "SO" else 1, gf, ga, 2)
+    if note in ("OT", "SO"):
+        return (1, 0, 0, 1, 0, 0, gf, ga, 1)
+    return (1, 0, 1, 0, 0, 0, gf, ga, 0)
+
+
+def build_season(games):
+    """games (read_results order) -> {"games": [...], "days": [...], "teams": {abbr: {"days", "cum", "idx"}}}.
+    games is sorted by day; a team's idx lists its offsets into it (the
+    per-team game log), aligned with its days / cum arrays."""
+    games = sorted(games, key=lambda g: g[1])
+    teams = {}
+    for i, (gid, day, away, a_score, home, h_score, note) in enumerate(games):
+        if a_score == h_score:
+            continue  # not a finished game
+        for team, gf, ga in ((away, a_score, h_score), (home, h_score, a_score)):
+            t = teams.setdefault(team, {"days": [], "cum": [], "idx": []})
+            prev = t["cum"][-1] if t["cum"] else ZERO
+            t["days"].append(day)
+            t["cum"].append(tuple(p + r for p, r in zip(prev, _result(gf, ga, note))))
+            t["idx"].append(i)
+    days = sorted({g[1] for g in games if g[1]})
+    return {"games": games, "days": days, "teams": teams}
+
+
+def team_games(team, season=None):
+    """One team's games in date order: an indexed query on the season's store
+    (kept per file version), or the in-memory index."""
+    season = season or load_season()
+    if season is None or team not in season["teams"]:
+        return []
+    store, by_team = season.get("store"), season.get("by_team")
+    if store and team not in by_team:
+        from . import db  # imported here: db imports this module
+        # only while the store still holds the version this season was built from
+        if db.read(db.stamped, "results", season["mtime"], store):
+            by_team[team] = db.read(db.games_for_team, team, store)
+    if by_team and by_team.get(team) is not None:
+        return by_team[team]
+    games = season["games"]
+    return [games[i] for i in season["teams"][team]["idx"]]
+
+
+def load_season(path=RESULTS_FILE):
+    """Cumulative arrays for a results file (rebuilt only when it changes)."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _seasons.get(path)
+    if cached is None or cached["mtime"] != mtime:
+        from . import db  # imported here: db imports this module
+        store = db.synced(path, "results")
+        games = db.read(db.games, store) if store else None
+        if games is None:
+            store, games = None, read_results(path)
+        data = build_season(games)
+        data.update(store=store, mtime=mtime, by_team={})
+        cached = _seasons[path] = {"mtime": mtime, "data": data}
+    return cached["data"]
+
+
+def standings_as_of(day=None, season=None):
+    """{team: {GP, W, ..., PTS}} counting games on or before day ('YYYY-MM-DD', None = all)."""
+    season = season or load_season()
+    if season is None:
+        return {}
+    out = {}
+    for team, t in season["teams"].items():
+        i = len(t["days"]) if day is None else bisect_right(t["days"], day)
+        out[team] = dict(zip(FIELDS, t["cum"][i - 1] if i else ZERO))
+    return out
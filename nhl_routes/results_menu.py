@@ -1,70 +1,75 @@
 # nhl_routes/results_menu.py
+# /nhl/results: the selected season's months; /nhl/results/<mon><year>
+# (e.g. oct2025) lists that month's games from the season's results file,
+# via the parsed season in results.py (cached per file mtime).
 from flask import make_response
-from . import nhl_bp
-from utils import TH1, TH2, TH3, alpha
+import datetime
+from . import nhl_bp, seasons
+from .results import load_season
+from utils import TH2
+from layout import page, nhl_nav
+
+
+def season_months(key):
+    """[(first day of month, slug)] from the season's start to its end."""
+    s = seasons.get(key)
+    out = []
+    d = s["start"].replace(day=1)
+    while d <= s["end"]:
+        out.append((d, d.strftime("%b%Y").lower()))
+        d = (d + datetime.timedelta(days=31)).replace(day=1)
+    return out
+
 
 @nhl_bp.route("/nhl/results")
 def nhl_results_menu():
-    months = [
-        ("October", "/nhl/results/oct2025"),
-        ("November", "/nhl/results/nov2025"),
-        ("December", "/nhl/results/dec2025"),
-        ("January", "/nhl/results/jan2026"),
-        ("February", "/nhl/results/feb2026"),
-        ("March", "/nhl/results/mar2026"),
-        ("April", "/nhl/results/apr2026"),
-    ]
-
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-<meta name="viewport" content="width=device-width,initial-scale=1.0">
-<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Rajdhani:wght@600&display=swap">
-<style>
-  body {{
-    background:{TH3};
-    color:#eee;
-    font-family:'Rajdhani',sans-serif;
-    margin:0;
-    padding:1em;
-  }}
-  a.back {{
-    color:{TH1};
-    font-weight:bold;
-    text-decoration:none;
-    display:inline-block;
-    margin-bottom:1em;
-    font-size:clamp(20px,3.5vw,24px);
-  }}
-  h2 {{
-    color:{TH1};
-    margin:0.3em 0 0.6em;
-  }}
-  ul {{
-    list-style:none;
-    padding:0;
-  }}
-  li {{
-    margin:0.4em 0;
-  }}
-  a.month {{
-    color:{TH2};
-    font-weight:bold;
-    text-decoration:none;
-    font-size:clamp(18px,3vw,20px);
-  }}
-  a.month:hover {{
-    text-decoration:underline;
-  }}
-</style>
-</head>
-<body>
+    key = seasons.selected()
+    html = nhl_nav() + f"""
 <a href="/nhl/more" class="back">← Back</a>
-<h2>2025–26 Season</h2>
+<h2>{seasons.get(key)['label']} Season</h2>
 <ul>
 """
-    for name, link in months:
-        html += f'<li><a href="{link}" class="month">{name}</a></li>\n'
+    for d, slug in season_months(key):
+        html += f'<li><a href="/nhl/results/{slug}" class="month">{d:%B}</a></li>\n'
+
+    html += "</ul>"
+    return make_response(page(html, "nhl pg-results"))
+
+
+@nhl_bp.route("/nhl/results/<slug>")
+def nhl_results_month(slug):
+    try:
+        month = datetime.datetime.strptime(slug, "%b%Y").date()
+    except ValueError:
+        return "<pre>Unknown month (use e.g. /nhl/results/oct2025).</pre>", 404
+    season = load_season(seasons.path("results", seasons.selected()))
+    prefix = month.strftime("%Y-%m")
+    games = sorted((g for g in (season["games"] if season else []) if g[1] and g[1].startswith(prefix)),
+                   key=lambda g: g[1])
+
+    # --- Page body (shell/CSS come prebuilt from layout) ---
+    html = nhl_nav() + f"""
+<a href="/nhl/results" class="back">← Back</a>
+<h2>{month:%B %Y} Games</h2>
+"""
+
+    # --- Table output ---
+    if not games:
+        html += "<p>No data for this month.</p>"
+    else:
+        html += "<table>"
+        html += "<tr><th>Date</th><th>Away</th><th>Score</th><th>Home</th><th>Note</th></tr>"
+        for _, day, away, a_s, home, h_s, note in games:
+            highlight = f" style='color:{TH2};font-weight:bold;'" if ('EDM' in (away, home)) else ""
+            html += (
+                f"<tr{highlight}>"
+                f"<td>{datetime.date.fromisoformat(day):%b %d}</td>"
+                f"<td>{away}</td>"
+                f"<td>{a_s} - {h_s}</td>"
+                f"<td>{home}</td>"
+                f"<td>{note}</td>"
+                f"</tr>"
+            )
+        html += "</table>"
 
-    html += "</ul></body></html>"
-    return make_response(html)
+    return make_response(page(html, "nhl pg-month"))
@@ -0,0 +1,130 @@
+# nhl_routes/rosters.py
+# Roster ingester (writes nhl_rosters_<season>.json).
+# - fetches all 32 team rosters from the NHL API through a bounded pool, each
+#   a conditional GET (upstream.py): a 304 / identical body is not even parsed
+# - players are normalised to {"id", "name", "pos", "number"} (forwards,
+#   defence, goalies; sorted by position group then number); each team keeps
+#   a hash of that list, so a changed payload with the same players (new
+#   headshot URLs, ...) still counts as unchanged
+# - the store is one compact JSON file keyed by ESPN abbreviation:
+#       {"updated": epoch, "teams": {"EDM": {"hash", "fetched", "players": [...]}}}
+#   unchanged and failed teams keep their previous entry as-is, and the file
+#   is only rewritten (new mtime, so players.py re-indexes) if a team changed
+# - each raw roster body is archived per team (archive/rosters/<TEAM>/, see
+#   archive.py), so `python -m nhl_routes.archive` can regenerate the file
+import datetime, hashlib, json, time, zoneinfo
+from concurrent.futures import ThreadPoolExecutor
+from .lease import exclusive, atomic_write
+from .teams import TEAMS, nhl_abbr
+from . import upstream, seasons
+from endpoints import NHL_ROSTER
+
+ROSTERS_FILE = seasons.path("rosters")  # current season
+
+TZ = zoneinfo.ZoneInfo("America/Edmonton")
+WORKERS = 8                 # concurrent roster requests
+GROUPS = (("forwards", "F"), ("defensemen", "D"), ("goalies", "G"))
+
+UNCHANGED = "unchanged"
+
+
+def read_rosters(path=ROSTERS_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"updated": None, "teams": {}}
+
+
+def normalize(data):
+    """NHL roster payload -> [{"id", "name", "pos", "number"}] (group, number order)."""
+    players = []
+    for key, group in GROUPS:
+        members = []
+        for p in data.get(key, []) or []:
+            first = p.get("firstName", {}).get("default", "")
+            last = p.get("lastName", {}).get("default", "")
+            members.append({"id": p.get("id"), "name": f"{first} {last}".strip(),
+                            "pos": p.get("positionCode") or group, "number": p.get("sweaterNumber")})
+        players += sorted(members, key=lambda m: (m["number"] is None, m["number"] or 0, m["name"]))
+    return players
+
+
+def roster_hash(players):
+    return hashlib.blake2b(json.dumps(players, separators=(",", ":")).encode(), digest_size=8).hexdigest()
+
+
+def archive_endpoint(team):
+    """Archive endpoint one team's raw roster bodies are stored under."""
+    return f"rosters/{team}"
+
+
+def _fetch_team(team, skip_unchanged=False):
+    """Fetch one roster -> (team, players | UNCHANGED | None, ms, error)."""
+    t0 = time.perf_counter()
+    try:
+        data, changed = upstream.get_json(NHL_ROSTER.format(team=nhl_abbr(team)), timeout=10,
+                                          scope="rosters", skip_unchanged=skip_unchanged,
+                                          archive=archive_endpoint(team))
+        if not changed:
+            return team, UNCHANGED, round((time.perf_counter() - t0) * 1000), None
+        players = normalize(data)
+    except Exception as e:
+        return team, None, round((time.perf_counter() - t0) * 1000), str(e)
+    return team, players, round((time.perf_counter() - t0) * 1000), None
+
+
+@exclusive("rosters", "Rosters")
+def update_rosters_file(out_file=ROSTERS_FILE, progress=None):
+    """Fetch every team's roster and rewrite the store only if one changed."""
+    store = read_rosters(out_file)
+    old_teams = store.get("teams", {})
+    teams = dict(old_teams)  # failed / unchanged teams keep their previous entry
+    changed, moves = [], []
+    failed = unchanged = done = 0
+
+    def fetch(team):
+        # an unchanged payload only means "keep the old entry" if we have one
+        return _fetch_team(team, skip_unchanged=team in old_teams)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        for team, players, ms, error in pool.map(fetch, TEAMS):
+            done += 1
+            n_changed = 0
+            if players is None:
+                failed += 1
+                print(f"[Rosters] {team} failed: {error}")
+            elif players == UNCHANGED:
+                unchanged += 1
+            else:
+                digest = roster_hash(players)
+                prev = old_teams.get(team)
+                if prev and prev.get("hash") == digest:
+                    unchanged += 1
+                else:
+                    before = {p["id"]: p["name"] for p in (prev or {}).get("players", [])}
+                    after = {p["id"]: p["name"] for p in players}
+                    joined = [after[i] for i in after if i not in before]
+                    left = [before[i] for i in before if i not in after]
+                    if prev:
+                        moves += [f"{team} +{n}" for n in joined] + [f"{team} -{n}" for n in left]
+                    n_changed = len(joined) + len(left) or len(players)
+                    teams[team] = {"hash": digest, "fetched": round(time.time()), "players": players}
+                    changed.append(team)
+            if progress:
+                progress(days_fetched=done, days_total=len(TEAMS),
+                         log={"day": team, "ms": ms, "games": n_changed, "error": error})
+
+    upstream.save()
+    if changed:
+        store = {"updated": round(time.time()), "teams": {t: teams[t] for t in sorted(teams)}}
+        atomic_write(out_file, json.dumps(store, separators=(",", ":")))
+
+    now = datetime.datetime.now(TZ).strftime("%-I:%M %p %b %d, %Y")
+    players = sum(len(t["players"]) for t in teams.values())
+    msg = (f"Rosters: {players} players on {len(teams)} teams; {len(changed)} teams changed, "
+           f"{unchanged} unchanged" + (f", {failed} failed" if failed else "") + f". Updated {now}.")
+    for item in moves:
+        print(f"[Rosters] {item}")
+    print("[Rosters]", msg)
+    return msg
@@ -0,0 +1,171 @@
+# nhl_routes/schedule.py
+# Full-season schedule ingester (writes the current season's espn_schedule_<season>.txt).
+# - fetches every day of the season from ESPN in parallel batches
+# - one line per game, grouped and sorted by day, local (Edmonton) start time:
+#       YYYYMMDD AWAY @ HOME 7:00 PM #<espn game id>
+#   (postponed games show "PPD" instead of a time)
+# - diffs against the previous copy by game id: reports rescheduled /
+#   postponed / added / dropped games and leaves the file untouched (same
+#   mtime, readers' caches stay valid) when nothing changed; unchanged days
+#   keep their previous lines byte-for-byte
+import datetime, time, zoneinfo
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from .lease import exclusive, atomic_write
+from . import upstream, seasons
+from endpoints import ESPN_SCOREBOARD
+from espn import parse_events
+
+SCHEDULE_FILE = seasons.path("schedule")
+
+TZ = zoneinfo.ZoneInfo("America/Edmonton")
+BASE_URL = ESPN_SCOREBOARD
+
+SEASON_START = seasons.get()["start"]
+SEASON_END = seasons.get()["end"]
+WORKERS = 8          # parallel day fetches per batch
+
+
+# ---------------- Read ----------------
+def parse_schedule_line(line):
+    """'YYYYMMDD AWAY @ HOME time... [#gid]' -> (day, away, home, time_text, gid) or None."""
+    parts = line.strip().split()
+    if len(parts) < 4 or parts[2] != "@":
+        return None
+    gid = ""
+    if parts[-1].startswith("#"):
+        gid = parts.pop()[1:]
+    time_text = " ".join(parts[4:]) if len(parts) >= 5 else "TBD"
+    return parts[0], parts[1], parts[3], time_text, gid
+
+
+def read_schedule_days(path=SCHEDULE_FILE):
+    """Return {YYYYMMDD: [raw line, ...]} in file order."""
+    days = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if parse_schedule_line(line):
+                    days.setdefault(line[:8], []).append(line)
+    except FileNotFoundError:
+        pass
+    return days
+
+
+# ---------------- Fetch ----------------
+def schedule_game_lines(data, datestr):
+    """Scoreboard payload for datestr -> [(gid, schedule line)] for regular-season games."""
+    games = []
+    for g in parse_events(data):
+        if g.state == "postponed":
+            game_time = "PPD"
+        else:
+            local = g.start_local(TZ)
+            game_time = local.strftime("%-I:%M %p") if local else "TBD"
+        line = f"{datestr} {g.away} @ {g.home} {game_time}" + (f" #{g.gid}" if g.gid else "")
+        games.append((g.gid, line))
+    return games
+
+
+UNCHANGED = "unchanged"
+
+
+def _fetch_day(d, skip_unchanged=False):
+    """Fetch one day -> (datestr, [(gid, line)] | UNCHANGED, ms, error)."""
+    datestr = d.strftime("%Y%m%d")
+    t0 = time.perf_counter()
+    try:
+        data, changed = upstream.get_json(BASE_URL, params={"dates": datestr}, timeout=10,
+                                          scope="schedule", skip_unchanged=skip_unchanged,
+                                          archive="scoreboard")
+        if not changed:
+            return datestr, UNCHANGED, round((time.perf_counter() - t0) * 1000), None
+        games = schedule_game_lines(data, datestr)
+    except Exception as e:
+        return datestr, None, round((time.perf_counter() - t0) * 1000), str(e)
+    return datestr, games, round((time.perf_counter() - t0) * 1000), None
+
+
+# ---------------- Diff ----------------
+def diff_schedule(old_days, new_days):
+    """Compare two {day: [lines]} maps by game id.
+    Returns (changed_days, report) where report lists moved/postponed/added/dropped gids."""
+    def by_gid(days):
+        out = {}
+        for day, lines in days.items():
+            for line in lines:
+                p = parse_schedule_line(line)
+                if p and p[4]:
+                    out[p[4]] = p
+        return out
+
+    old, new = by_gid(old_days), by_gid(new_days)
+    report = {"rescheduled": [], "postponed": [], "added": [], "dropped": []}
+    for gid, (day, a, h, t, _) in new.items():
+        prev = old.get(gid)
+        if prev is None:
+            report["added"].append(gid)
+        elif t == "PPD" and prev[3] != "PPD":
+            report["postponed"].append(f"{a}@{h} {prev[0]}")
+        elif (prev[0], prev[3]) != (day, t):
+            report["rescheduled"].append(f"{a}@{h} {prev[0]} {prev[3]} -> {day} {t}")
+    report["dropped"] = [gid for gid in old if gid not in new]
+
+    changed = sorted(d for d in set(old_days) | set(new_days) if old_days.get(d) != new_days.get(d))
+    return changed, report
+
+
+# ---------------- Update ----------------
+@exclusive("schedule", "Schedule")
+def update_espn_schedule_file(season_start=SEASON_START, season_end=SEASON_END,
+                              out_file=SCHEDULE_FILE, progress=None):
+    """Fetch the whole regular season and rewrite only what changed."""
+    days = [season_start + timedelta(days=i) for i in range((season_end - season_start).days + 1)]
+    old_days = read_schedule_days(out_file)
+    new_days = dict(old_days)  # failed / unchanged days keep their previous lines
+    failed = fetched = unchanged = 0
+    # an unchanged payload only means "keep the old lines" if we have them
+    fetch = partial(_fetch_day, skip_unchanged=bool(old_days))
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        for i in range(0, len(days), WORKERS):
+            batch = days[i:i + WORKERS]
+            for datestr, games, ms, error in pool.map(fetch, batch):
+                fetched += 1
+                if games is None:
+                    failed += 1
+                    print(f"[Schedule] {datestr} failed: {error}")
+                elif games == UNCHANGED:
+                    unchanged += 1
+                    games = []
+                elif games:
+                    new_days[datestr] = [line for _, line in games]
+                else:
+                    new_days.pop(datestr, None)
+                if progress:
+                    progress(days_fetched=fetched, days_total=len(days),
+                             log={"day": datestr, "ms": ms,
+                                  "games": len(games or []), "error": error})
+
+    upstream.save()
+    changed, report = diff_schedule(old_days, new_days)
+    total = sum(len(v) for v in new_days.values())
+    if changed:
+        atomic_write(out_file, "\n".join(line for d in sorted(new_days) for line in new_days[d]))
+    if out_file == SCHEDULE_FILE:
+        from . import db  # imported here: db imports this module
+        db.mirror(db.replace_schedule, new_days, source=out_file)
+
+    now = datetime.datetime.now(TZ).strftime("%-I:%M %p %b %d, %Y")
+    msg = (f"Schedule: {total} games over {len(new_days)} days; {len(changed)} days changed "
+           f"({len(report['rescheduled'])} rescheduled, {len(report['postponed'])} postponed, "
+           f"{len(report['added'])} new, {len(report['dropped'])} dropped), "
+           f"{unchanged} days unchanged upstream"
+           + (f", {failed} days failed" if failed else "") + f". Updated {now}.")
+    for kind in ("rescheduled", "postponed"):
+        for item in report[kind]:
+            print(f"[Schedule] {kind}: {item}")
+    print("[Schedule]", msg)
+    return msg
@@ -0,0 +1,130 @@
+# nhl_routes/scheduler.py
+# Game-day aware auto updater (replaces the fixed 5-minute / hourly loop).
+# - polls today's scoreboard every POLL_LIVE seconds while a game is live
+# - sleeps until shortly before the next puck drop when games are pending
+# - backs off to IDLE_SLEEP when everything is final or nothing is scheduled
+# - refreshes results + stats only when a game transitions to FINAL
+# - after midnight keeps polling yesterday's scoreboard while any of its
+#   games is unfinished, so a late (western / OT) game is seen going FINAL
+# - a refresh that finds the lease busy (a panel job is running) stays
+#   pending and is retried on the next poll
+import datetime, time
+from datetime import date, timedelta
+from .scoreboard import get_todays_games, parse_scoreboard, BASE_URL, TZ
+from .updater import update_completed_games, update_stats_file
+from .upstream import get_json
+from .lease import last_run
+
+POLL_LIVE = 60              # seconds between polls while games are in progress
+PREGAME_LEAD = 10 * 60      # wake this long before the first puck drop
+MAX_SLEEP = 3 * 3600        # never sleep longer than this (schedule changes)
+IDLE_SLEEP = 3600           # all final / no games today
+CATCHUP_MIN_AGE = 3600      # skip the start-up catch-up if any worker ran one this recently
+
+_states = {}                # day -> {gid: last seen state ("upcoming"/"live"/"final"/"postponed")}
+_pending = []               # finished games whose refresh has not run yet
+DONE = ("final", "postponed")
+
+
+def _start_time(g):
+    try:
+        return datetime.datetime.fromisoformat(g["start"].replace("Z", "+00:00"))
+    except (KeyError, ValueError):
+        return None
+
+
+def next_sleep(games, now=None):
+    """How long to sleep given today's games (seconds)."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    if any(g["state"] == "live" for g in games):
+        return POLL_LIVE
+
+    starts = [_start_time(g) for g in games if g["state"] == "upcoming"]
+    starts = [s for s in starts if s is not None]
+    if starts:
+        wait = (min(starts) - now).total_seconds() - PREGAME_LEAD
+        # a start time in the past means a delayed game: keep polling
+        return int(min(max(wait, POLL_LIVE), MAX_SLEEP))
+    if any(g["state"] == "upcoming" for g in games):
+        return POLL_LIVE  # pending game without a known start time
+
+    # everything final / nothing scheduled: wake hourly (catches day rollover)
+    return IDLE_SLEEP
+
+
+def newly_final(day, games):
+    """Return day's games that turned FINAL since the last poll."""
+    for old in [d for d in _states if d < day - timedelta(days=1)]:
+        del _states[old]  # only today and yesterday are tracked
+    states = _states.setdefault(day, {})
+    finished = []
+    for g in games:
+        prev = states.get(g["gid"])
+        if g["state"] == "final" and prev is not None and prev != "final":
+            finished.append(g)
+        states[g["gid"]] = g["state"]
+    return finished
+
+
+def unfinished(day):
+    """True while a game seen on day is neither final nor postponed."""
+    return any(s not in DONE for s in _states.get(day, {}).values())
+
+
+def fetch_day(day):
+    """One day's scoreboard (not the page cache, which holds today)."""
+    data, _ = get_json(BASE_URL, params={"dates": day.strftime("%Y%m%d")}, timeout=8,
+                       scope="scheduler", archive="scoreboard")
+    return parse_scoreboard(data)
+
+
+def refresh_after_final(games):
+    """Append the finished games to the results file and refresh stats.
+    Returns False if an update held a lease (try again later)."""
+    labels = ", ".join(f"{g['a']}@{g['h']}" for g in games)
+    print(f"[Scheduler] FINAL: {labels} -> refreshing results/stats")
+    started = time.time()
+    # only yesterday + today need scanning (late games finish past midnight)
+    update_completed_games(season_start=date.today() - timedelta(days=1))
+    update_stats_file()
+    # a busy lease returns a message without recording a run
+    return last_run("results", "started") >= started and last_run("stats", "started") >= started
+
+
+def scheduler_loop(sleep):
+    # one full catch-up at start-up (fills any gap while the server was down);
+    # last-run is shared by all workers, so restarts don't rescan the season
+    try:
+        if time.time() - last_run("results") > CATCHUP_MIN_AGE:
+            update_completed_games()
+            update_stats_file()
+    except Exception as e:
+        print(f"[Scheduler] catch-up error: {e}")
+
+    while True:
+        games = []
+        try:
+            today = date.today()
+            yesterday = today - timedelta(days=1)
+            games = get_todays_games(today, max_age=0)
+            _pending.extend(newly_final(today, games))
+            late = unfinished(yesterday)
+            if late:
+                _pending.extend(newly_final(yesterday, fetch_day(yesterday)))
+            if _pending and refresh_after_final(_pending):
+                _pending.clear()
+            wait = next_sleep(games)
+            if not games and _states.get(today):
+                wait = POLL_LIVE * 5  # games seen earlier today: treat as a fetch error
+            if late or _pending:
+                wait = min(wait, POLL_LIVE)
+        except Exception as e:
+            print(f"[Scheduler] loop error: {e}")
+            wait = POLL_LIVE * 5
+        wake = datetime.datetime.now(TZ) + timedelta(seconds=wait)
+        print(f"[Scheduler] {len(games)} games today, next check {wake:%-I:%M %p}")
+        sleep(wait)
+
+
+def register_nhl_scheduler(socketio):
+    socketio.start_background_task(scheduler_loop, socketio.sleep)
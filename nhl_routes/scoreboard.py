@@ -1,203 +1,197 @@
 # nhl_routes/scoreboard.py
-from flask import make_response, request
-import datetime, requests, zoneinfo, os
+from flask import make_response
+import datetime, zoneinfo, os, time
 from . import nhl_bp
-from utils import TH1, TH2, TH3, alpha
+from utils import TH2
+from layout import page, nhl_nav, SOCKETIO_URL
+from endpoints import ESPN_SCOREBOARD
+from espn import parse_events
+from .schedule import SCHEDULE_FILE, parse_schedule_line
+from .upstream import get_json
+from . import db
+
+TZ = zoneinfo.ZoneInfo("America/Edmonton")
+BASE_URL = ESPN_SCOREBOARD
+
+# ---------------- Helper: read schedule file ----------------
+# Per file version (mtime) the index holds each day / team asked for so far,
+# fetched by an indexed query on the season's store (db.py), instead of
+# rescanning the file for each of the 39 upcoming days on every request.
+# Without a usable store the file is parsed once into the full index.
+_schedule_index = {"mtime": None, "store": None, "days": {}, "teams": {}}
+
+
+def _parse_schedule():
+    """The whole file -> ({YYYYMMDD: [(away, home, time_text)]}, {team: [parsed line]})."""
+    days, teams = {}, {}
+    with open(SCHEDULE_FILE) as f:
+        for line in f:
+            p = parse_schedule_line(line)
+            if p:
+                day, away, home, time_text, _gid = p
+                days.setdefault(day, []).append((away, home, time_text))
+                teams.setdefault(away, []).append(p)
+                teams.setdefault(home, []).append(p)
+    for games in teams.values():
+        games.sort(key=lambda p: p[0])
+    return days, teams
+
+
+def load_schedule():
+    """Bring the index up to the schedule file's version; returns it (None if there is no file)."""
+    try:
+        mtime = os.path.getmtime(SCHEDULE_FILE)
+    except OSError:
+        print("[Scoreboard] Schedule file not found:", SCHEDULE_FILE)
+        return None
+    if _schedule_index["mtime"] != mtime:
+        store = db.synced(SCHEDULE_FILE, "schedule")
+        days, teams = _parse_schedule() if store is None else ({}, {})
+        _schedule_index.update(mtime=mtime, store=store, days=days, teams=teams)
+    return _schedule_index
+
+
+def _lookup(part, key, query):
+    index = load_schedule()
+    if index is None:
+        return []
+    if key not in index[part] and index["store"]:
+        rows = db.read(query, key, index["store"])
+        if rows is None:  # store failed: fall back to the parsed file
+            days, teams = _parse_schedule()
+            index.update(store=None, days=days, teams=teams)
+        else:
+            index[part][key] = rows
+    return index[part].get(key, [])
 
-@nhl_bp.route("/nhl")
-def nhl_scoreboard_html():
-    tz = zoneinfo.ZoneInfo("America/Edmonton")
-    base_url = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard"
-
-    # --- Local schedule file path (in main folder) ---
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    SCHEDULE_FILE = os.path.join(BASE_DIR, "espn_schedule_2025_26.txt")
-
-    # ---------------- Helper: read schedule file ----------------
-    def get_schedule_for_day(day):
-        """Return list of (away, home, time_text) for a given date from local file."""
-        datestr = day.strftime("%Y%m%d")
-        games = []
-        try:
-            with open(SCHEDULE_FILE) as f:
-                for line in f:
-                    if line.startswith(datestr):
-                        parts = line.strip().split()
-                        # expected: YYYYMMDD AWAY @ HOME [time...]
-                        if len(parts) >= 4 and parts[2] == "@":
-                            # join everything after HOME so "7:30 PM" stays intact
-                            time_field = " ".join(parts[4:]) if len(parts) >= 5 else "TBD"
-                            games.append((parts[1], parts[3], time_field))  # (away, home, time_text)
-        except FileNotFoundError:
-            print("[Scoreboard] Schedule file not found:", SCHEDULE_FILE)
-        return games
-
-    # ---------------- Helper: fetch today's games (with scores) ----------------
-    def get_todays_games(day):
-        """Fetch current live/final scores for today only."""
-        datestr = day.strftime("%Y%m%d")
-        try:
-            r = requests.get(f"{base_url}?dates={datestr}", timeout=8)
-            r.raise_for_status()
-            data = r.json()
-        except Exception:
-            return []
-
-        games = []
-        for ev in data.get("events", []):
-            if ev.get("season", {}).get("type") != 2:
-                continue
 
-            comp = ev.get("competitions", [{}])[0]
-            teams = comp.get("competitors", [])
-            if len(teams) < 2:
-                continue
+def get_schedule_for_team(team):
+    """Return [(day, away, home, time_text, gid), ...] for one team, in date order."""
+    return _lookup("teams", team, db.schedule_for_team)
 
-            home = next((t for t in teams if t.get("homeAway") == "home"), {})
-            away = next((t for t in teams if t.get("homeAway") == "away"), {})
-            h_name = home.get("team", {}).get("abbreviation", "???")
-            a_name = away.get("team", {}).get("abbreviation", "???")
-            h_score = str(home.get("score", "0"))
-            a_score = str(away.get("score", "0"))
-
-            st = ev.get("status", {}).get("type", {})
-            desc = (st.get("description") or "").lower()
-            short = (st.get("shortDetail") or "").lower()
-            detail = (st.get("detail") or "").lower()
-            lower = f"{desc} {short} {detail}"
-
-            comp_status = comp.get("status", {}).get("type", {})
-            comp_desc = " ".join(
-                str(comp_status.get(k, "")).lower()
-                for k in ("shortDetail", "detail", "description")
-            )
-            lower_all = f"{lower} {comp_desc}"
-
-            try:
-                raw_date = ev.get("date", "")
-                dt_local = None
-                if raw_date:
-                    dt_utc = datetime.datetime.fromisoformat(raw_date.replace("Z", "+00:00"))
-                    dt_local = dt_utc.astimezone(tz)
-
-                if "final" in lower_all:
-                    right = st.get("shortDetail") or comp_status.get("shortDetail") or "FINAL"
-                    state = "final"
-                elif any(word in lower_all for word in ["in progress", "live", "1st", "2nd", "3rd", "ot", "so"]):
-                    right = (
-                        comp_status.get("shortDetail")
-                        or comp_status.get("detail")
-                        or st.get("shortDetail")
-                        or st.get("detail")
-                        or "LIVE"
-                    )
-                    state = "live"
-                else:
-                    if dt_local:
-                        # include minutes + AM/PM + MST
-                        right = dt_local.strftime("%-I:%M %p  ")
-                    else:
-                        right = "TBD"
-                    state = "upcoming"
-            except Exception:
-                right, state = "TBD", "upcoming"
-
-            games.append((a_name, a_score, h_name, h_score, right, state))
-        return games
-
-    # ---------------- HTML header ----------------
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Rajdhani:wght@600&display=swap">
-<style>
-  body {{
-    background:{TH3};
-    color:#eee;
-    font-family:'Rajdhani',sans-serif;
-    margin:0;
-    padding:1em;
-    text-align:left;
-  }}
 
-  /* --- NAVIGATION --- */
-  .nav {{
-    text-align:left;
-    margin-bottom:1.2em;
-  }}
-  .menu-btn {{
-    background:none;
-    color:{TH1};
-    text-decoration:none;
-    font-weight:bold;
-    font-size:clamp(22px,4vw,26px);
-    display:inline-block;
-    margin-bottom:0.5em;
-  }}
-  .submenu {{
-    display:flex;
-    justify-content:flex-start;
-    flex-wrap:wrap;
-    gap:0.6em;
-  }}
-  .submenu a {{
-    background:{alpha(TH1,0.13)};
-    color:{TH1};
-    padding:0.3em 0.8em;
-    border-radius:8px;
-    text-decoration:none;
-    font-weight:bold;
-    font-size:clamp(17px,3.3vw,19px);
-    transition:background 0.2s ease,color 0.2s ease;
-  }}
-  .submenu a:hover {{
-    background:{alpha(TH2,0.25)};
-    color:{TH2};
-  }}
-  .submenu a.active {{
-    background:{TH2};
-    color:#000;
-  }}
-  h3 {{
-    color:{TH1};
-    margin:0.8em 0 0.4em;
-  }}
-  .gamerow {{
-    display:inline-block;
-    width:100%;
-    font-size:clamp(20px,3vw,22px);
-    line-height:1.6em;
-  }}
-  .rev {{
-    vertical-align:middle;
-    margin-right:.35em;
-    transform:scale(1.0);
-    cursor:pointer;
-  }}
-  .gamerow .reveal {{ color:{TH3}; transition:color .15s ease; }}
-  .gamerow .rev:checked ~ .reveal {{ color:#eee; }}
-</style>
-</head>
-<body>
-
-  <!-- Unified Navigation -->
-  <div class="nav">
-    <a href="/" class="menu-btn">← MENU</a>
-    <div class="submenu">
-      <a href="/nhl" class="{'active' if request.path == '/nhl' else ''}">SCORES</a>
-      <a href="/nhl/standings" class="{'active' if request.path == '/nhl/standings' else ''}">STANDINGS</a>
-      <a href="/nhl/stats" class="{'active' if request.path == '/nhl/stats' else ''}">STATS</a>
-      <a href="/nhl/more" class="{'active' if request.path == '/nhl/more' else ''}">MORE</a>
-    </div>
-</div>
+def get_schedule_for_day(day):
+    """Return list of (away, home, time_text) for a given date from local file."""
+    return _lookup("days", day.strftime("%Y%m%d"), db.schedule_on)
 
-  </div>
+
+# ---------------- Helper: parse one scoreboard payload ----------------
+def parse_scoreboard(data):
+    """Return a list of game dicts (gid, a, a_s, h, h_s, right, state, start) from an ESPN scoreboard payload."""
+    games = []
+    for g in parse_events(data):
+        if g.state == "final":
+            right = g.detail or "FINAL"
+        elif g.state == "live":
+            right = g.detail or "LIVE"
+        else:
+            local = g.start_local(TZ)
+            right = "PPD" if g.state == "postponed" else (local.strftime("%-I:%M %p  ") if local else "TBD")
+        games.append({
+            "gid": g.gid,
+            "a": g.away, "a_s": g.a_score or "0",
+            "h": g.home, "h_s": g.h_score or "0",
+            "right": right,
+            "state": g.state,   # upcoming / live / final / postponed
+            "start": g.start,   # ISO UTC puck-drop time
+        })
+    return games
+
+
+# ---------------- Helper: fetch a day's games (with scores) ----------------
+# Page views and the live poller share one short-lived copy, so viewers
+# don't multiply requests to ESPN.
+TODAY_MAX_AGE = 20
+_today_cache = {"day": None, "at": 0.0, "games": []}
+
+
+def get_todays_games(day, max_age=TODAY_MAX_AGE):
+    """Fetch current live/final scores for one day (today on the scoreboard)."""
+    if _today_cache["day"] == day and time.time() - _today_cache["at"] < max_age:
+        return _today_cache["games"]
+
+    datestr = day.strftime("%Y%m%d")
+    try:
+        data, changed = get_json(BASE_URL, params={"dates": datestr}, timeout=8, scope="scoreboard",
+                                 archive="scoreboard")
+    except Exception:
+        return []
+    if changed or _today_cache["day"] != day:
+        games = parse_scoreboard(data)
+    else:
+        games = _today_cache["games"]  # same body as last poll: nothing to re-parse
+    _today_cache.update(day=day, at=time.time(), games=games)
+    return games
+
+
+def game_row(a, a_s, h, h_s, status, state, cid):
+    """One scoreboard row (live/final rows hide scores behind a reveal checkbox)."""
+    row_style = f"color:{TH2};" if (a == 'EDM' or h == 'EDM') else ""
+
+    if state in ("live", "final"):
+        return (
+            f'<div class="gamerow" style="{row_style}">'
+            f'<input id="{cid}" class="rev" type="checkbox">'
+            f'<label for="{cid}">{a} </label>'
+            f'<span class="reveal">{a_s}</span>'
+            f' @ {h} '
+            f'<span class="reveal">{h_s}</span>'
+            f'  -  <span class="reveal">{status}</span>'
+            f'</div>'
+        )
+    # append MST if we have a concrete time
+    time_text = status.strip()
+    if time_text and time_text.upper() != "TBD" and not time_text.upper().endswith(" "):
+        time_text = f"{time_text}  "
+    return f"<div class='gamerow' style='{row_style}'>{a} @ {h}  -  {time_text}</div>"
+
+
+# ---------------- Live updates (see live.py) ----------------
+# Today's rows are wrapped in <div id="g{gid}">; deltas pushed on the /live
+# namespace re-render just those rows, so the page never reloads.
+LIVE_SCRIPT = f"""
+<script src="{SOCKETIO_URL}"></script>
+<script>
+(function(){{
+  if (typeof io === "undefined") return;
+  const edm = "color:{TH2};";
+  function row(g) {{
+    const style = (g.a === "EDM" || g.h === "EDM") ? edm : "";
+    if (g.state === "live" || g.state === "final") {{
+      const cid = "rev_live_" + g.gid;
+      const old = document.getElementById(cid);
+      const checked = old && old.checked ? " checked" : "";
+      return `<div class="gamerow" style="${{style}}">` +
+        `<input id="${{cid}}" class="rev" type="checkbox"${{checked}}>` +
+        `<label for="${{cid}}">${{g.a}} </label>` +
+        `<span class="reveal">${{g.a_s}}</span> @ ${{g.h}} ` +
+        `<span class="reveal">${{g.h_s}}</span>  -  <span class="reveal">${{g.right}}</span></div>`;
+    }}
+    return `<div class='gamerow' style='${{style}}'>${{g.a}} @ ${{g.h}}  -  ${{g.right}}</div>`;
+  }}
+  const socket = io("/live", {{transports:["websocket"]}});
+  socket.on("connect", () => socket.emit("subscribe"));
+  socket.on("delta", msg => {{
+    (msg.games || []).forEach(g => {{
+      const el = document.getElementById("g" + g.gid);
+      if (el) el.innerHTML = row(g);
+    }});
+    const stamp = document.getElementById("updated");
+    if (stamp && msg.time) stamp.textContent = "Last updated: " + msg.time + " MST";
+  }});
+}})();
+</script>
 """
 
+
+@nhl_bp.route("/nhl")
+def nhl_scoreboard_html():
+    # ---------------- Page body (shell/CSS come prebuilt from layout) ----------------
+    html = nhl_nav()
+
     # ---------------- Build scoreboard ----------------
     today = datetime.date.today()
-    now = datetime.datetime.now(tz).strftime("%-I:%M %p")
+    now = datetime.datetime.now(TZ).strftime("%-I:%M %p")
     days_to_show = 40
     gid = 0
 
@@ -205,50 +199,37 @@ def nhl_scoreboard_html():
         day = today + datetime.timedelta(days=offset)
         label = day.strftime("%a, %b %-d")
 
-        # today uses live data, others local
+        html += f"<h3>{label}</h3>\n"
+
+        # today uses live data (and is kept fresh over the socket), others local
         if offset == 0:
             games = get_todays_games(day)
-        else:
-            # include saved time text from schedule file
-            games = [(a, "", h, "", t, "upcoming") for (a, h, t) in get_schedule_for_day(day)]
+            if not games:
+                html += "<div class='gamerow'>No Games Scheduled</div>\n"
+                continue
+            for g in games:
+                cid = f"rev_live_{g['gid']}"
+                line = game_row(g["a"], g["a_s"], g["h"], g["h_s"], g["right"], g["state"], cid)
+                html += f'<div id="g{g["gid"]}">{line}</div>\n'
+            continue
 
-        html += f"<h3>{label}</h3>\n"
+        # include saved time text from schedule file
+        games = get_schedule_for_day(day)
         if not games:
             html += "<div class='gamerow'>No Games Scheduled</div>\n"
             continue
 
-        for (a, a_s, h, h_s, status, state) in games:
+        for (a, h, t) in games:
             gid += 1
-            cid = f"rev_{a}_{h}_{gid}"
-            row_style = f"color:{TH2};" if (a == 'EDM' or h == 'EDM') else ""
-
-            if state in ("live", "final"):
-                line = (
-                    f'<div class="gamerow" style="{row_style}">'
-                    f'<input id="{cid}" class="rev" type="checkbox">'
-                    f'<label for="{cid}">{a} </label>'
-                    f'<span class="reveal">{a_s}</span>'
-                    f' @ {h} '
-                    f'<span class="reveal">{h_s}</span>'
-                    f'  -  <span class="reveal">{status}</span>'
-                    f'</div>'
-                )
-            else:
-                # append MST if we have a concrete time
-                time_text = status.strip()
-                if time_text and time_text.upper() != "TBD" and not time_text.upper().endswith(" "):
-                    time_text = f"{time_text}  "
-                line = f"<div class='gamerow' style='{row_style}'>{a} @ {h}  -  {time_text}</div>"
-            html += line + "\n"
+            html += game_row(a, "", h, "", t, "upcoming", f"rev_{a}_{h}_{gid}") + "\n"
 
     html += f"""
-  <div style="text-align:center;font-size:0.8em;opacity:0.3;margin-top:1em;">
+  <div id="updated" style="text-align:center;font-size:0.8em;opacity:0.3;margin-top:1em;">
     Last updated: {now} MST
   </div>
-</body>
-</html>"""
+{LIVE_SCRIPT}"""
 
-    response = make_response(html)
+    response = make_response(page(html, "nhl pg-scores"))
     response.headers["Cache-Control"] = "public, max-age=40"
     response.headers["Pragma"] = "cache"
     response.headers["Expires"] = "120"
@@ -0,0 +1,201 @@
+# nhl_routes/seasons.py
+# Season partitions: each season's data files live in their own directory,
+#       seasons/<key>/espn_games_<key>.txt, espn_schedule_<key>.txt, ...
+# listed in seasons/manifest.json:
+#       {"current": "2025_26",
+#        "seasons": {"2025_26": {"label": "2025-26", "start": "2025-10-07",
+#                                "end": "2026-04-30", "dir": "seasons/2025_26"}}}
+# - the updaters (results, schedule, stats, rosters) write the current season;
+#   module constants such as results.RESULTS_FILE are its paths, fixed at
+#   import, so restart after switching "current"
+# - pages read the season the visitor picked (selected(): ?season=, then
+#   the "season" cookie set by the selector in the NHL tab bar, then the
+#   current one) and open only that partition's files; the readers' caches
+#   are keyed by path, so browsing an old season never evicts the current one
+# - every NHL response carries Vary: Cookie, so a browser or proxy never
+#   serves one season's page (or tab-bar selector) for another
+# - without a manifest (older checkouts) there is one season, 2025_26, with
+#   its files in the repo root as before
+#   python -m nhl_routes.seasons list
+#   python -m nhl_routes.seasons migrate        root files -> seasons/2025_26/
+#   python -m nhl_routes.seasons add 2026_27 2026-10-07 2027-04-16 [--current]
+import argparse, contextlib, datetime, json, os
+from flask import request
+from . import nhl_bp
+from .lease import atomic_write, lease
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEASONS_DIR = os.path.join(BASE_DIR, "seasons")
+MANIFEST_FILE = os.path.join(SEASONS_DIR, "manifest.json")
+COOKIE = "season"
+
+FILES = {
+    "results": "espn_games_{key}.txt",
+    "schedule": "espn_schedule_{key}.txt",
+    "standings": "espn_standings_{key}.txt",
+    "stats": "nhl_stats_{key}.json",
+    "stats_history": "nhl_stats_history_{key}.jsonl",
+    "rosters": "nhl_rosters_{key}.json",
+    "db": "nhl_{key}.sqlite3",
+}
+LEGACY = {
+    "current": "2025_26",
+    "seasons": {"2025_26": {"label": "2025-26", "start": "2025-10-07", "end": "2026-04-30", "dir": "."}},
+}
+
+_manifest = {"mtime": None, "data": LEGACY}
+_selectors = {}             # (manifest mtime, selected) -> html
+
+
+def load_manifest():
+    """The manifest (LEGACY if there is none); re-read when it changes."""
+    try:
+        mtime = os.path.getmtime(MANIFEST_FILE)
+    except OSError:
+        _manifest.update(mtime=None, data=LEGACY)
+        return LEGACY
+    if _manifest["mtime"] != mtime:
+        with open(MANIFEST_FILE) as f:
+            _manifest.update(mtime=mtime, data=json.load(f))
+        _selectors.clear()
+    return _manifest["data"]
+
+
+def version():
+    """Changes whenever the manifest does (for caches of rendered pages)."""
+    load_manifest()
+    return _manifest["mtime"]
+
+
+def current():
+    return load_manifest()["current"]
+
+
+def keys():
+    """Season keys, newest first."""
+    return sorted(load_manifest()["seasons"], reverse=True)
+
+
+def get(key=None):
+    """{"key", "label", "start": date, "end": date, "dir"} for a season (default: current)."""
+    manifest = load_manifest()
+    key = key or manifest["current"]
+    s = manifest["seasons"][key]
+    return {"key": key, "label": s.get("label", key.replace("_", "-")),
+            "start": datetime.date.fromisoformat(s["start"]),
+            "end": datetime.date.fromisoformat(s["end"]), "dir": s.get("dir", ".")}
+
+
+def path(kind, key=None):
+    """Path of one data file (FILES kind) in a season's partition."""
+    s = get(key)
+    return os.path.normpath(os.path.join(BASE_DIR, s["dir"], FILES[kind].format(key=s["key"])))
+
+
+def selected():
+    """Season key the current request asks for (falls back to the current season)."""
+    try:
+        key = request.args.get("season") or request.cookies.get(COOKIE)
+    except (AttributeError, RuntimeError):
+        key = None
+    return key if key in load_manifest()["seasons"] else current()
+
+
+def is_current(key):
+    return key == current()
+
+
+def selector(key):
+    """Season <select> for the NHL tab bar; picking one sets the cookie and reloads."""
+    load_manifest()
+    cache_key = (_manifest["mtime"], key)
+    if cache_key not in _selectors:
+        options = "".join(
+            f"<option value='{k}'{' selected' if k == key else ''}>{get(k)['label']}</option>" for k in keys()
+        )
+        _selectors[cache_key] = (
+            f"<select class='season-pick' title='Season' onchange=\""
+            f"document.cookie='{COOKIE}='+this.value+';path=/;max-age=31536000';"
+            f"const u=new URL(location.href);u.searchParams.set('season',this.value);location.href=u\">"
+            f"{options}</select>"
+        )
+    return _selectors[cache_key]
+
+
+@nhl_bp.after_request
+def vary_on_season(response):
+    """Pages depend on the season cookie (content and selector): caches must key on it."""
+    response.vary.add("Cookie")
+    return response
+
+
+# ---------------- Manifest maintenance ----------------
+def _write(manifest):
+    os.makedirs(SEASONS_DIR, exist_ok=True)
+    atomic_write(MANIFEST_FILE, json.dumps(manifest, indent=1))
+
+
+def migrate():
+    """Move the legacy root files into seasons/<key>/ and write the manifest."""
+    if os.path.exists(MANIFEST_FILE):
+        return "Already partitioned (manifest exists)."
+    key = LEGACY["current"]
+    target = os.path.join(SEASONS_DIR, key)
+    os.makedirs(target, exist_ok=True)
+    moved = []
+    with contextlib.ExitStack() as held:  # no updater may write while files move
+        for name in ("results", "schedule", "stats", "rosters"):
+            held.enter_context(lease(name))
+        for kind, pattern in FILES.items():
+            name = pattern.format(key=key)
+            for suffix in (("", "-wal", "-shm") if kind == "db" else ("",)):
+                src = os.path.join(BASE_DIR, name + suffix)
+                if os.path.exists(src):
+                    os.replace(src, os.path.join(target, name + suffix))
+                    moved.append(name + suffix)
+        manifest = json.loads(json.dumps(LEGACY))
+        manifest["seasons"][key]["dir"] = os.path.relpath(target, BASE_DIR)
+        _write(manifest)
+    return (f"Moved {len(moved)} files to {os.path.relpath(target, BASE_DIR)}: {', '.join(moved) or '-'}. "
+            "Restart the app.")
+
+
+def add(key, start, end, make_current=False, label=None):
+    manifest = json.loads(json.dumps(load_manifest()))
+    for day in (start, end):
+        datetime.date.fromisoformat(day)  # ValueError on a bad date
+    target = os.path.join(SEASONS_DIR, key)
+    os.makedirs(target, exist_ok=True)
+    manifest["seasons"][key] = {"label": label or key.replace("_", "-"), "start": start, "end": end,
+                                "dir": os.path.relpath(target, BASE_DIR)}
+    if make_current:
+        manifest["current"] = key
+    _write(manifest)
+    return f"Season {key} added" + (" (current; restart the app)" if make_current else "") + "."
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Season partitions and their manifest.")
+    sub = ap.add_subparsers(dest="action", required=True)
+    sub.add_parser("list")
+    sub.add_parser("migrate")
+    p = sub.add_parser("add")
+    p.add_argument("key", help="e.g. 2026_27")
+    p.add_argument("start", help="YYYY-MM-DD")
+    p.add_argument("end", help="YYYY-MM-DD")
+    p.add_argument("--label")
+    p.add_argument("--current", action="store_true")
+    args = ap.parse_args()
+    if args.action == "migrate":
+        print(migrate())
+    elif args.action == "add":
+        print(add(args.key, args.start, args.end, args.current, args.label))
+    else:
+        for k in keys():
+            s = get(k)
+            files = [kind for kind in FILES if os.path.exists(path(kind, k))]
+            print(f"{k}{' *' if is_current(k) else '  '} {s['start']} .. {s['end']}  {s['dir']}  {' '.join(files)}")
+
+
+if __name__ == "__main__":
+    main()
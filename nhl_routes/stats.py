@@ -1,151 +1,138 @@
 # nhl_routes/stats.py
+# /nhl/stats: skater leaders from nhl_stats_<season>.json (written by /nhl/update-stats).
+# Each season's file is parsed once per mtime; at that point every category
+# block and the whole page for each LIMITS entry are rendered, so a request
+# is a dict lookup. Pages carry an ETag (file hash + limit + season +
+# manifest version + CSS hash): revalidations get a 304, and compress.py
+# reuses its encoded body per ETag.
+# On a miss the leaders come from the season's SQLite store (db.py), one
+# indexed query per category, when it is usable; else from the parsed file.
 from flask import make_response, request
-import requests, textwrap, os, json
-from . import nhl_bp
-from utils import TH1, TH2, TH3, alpha
+import requests, textwrap, os, json, hashlib
+from . import nhl_bp, seasons, db
+from utils import TH1, TH2
+from layout import page, nhl_nav, CSS_HASH
+from endpoints import NHL_STATS_LEADERS
 
-# Local cache (written by /nhl/update-stats)
-STATS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nhl_stats_2025_26.json")
+# Local cache (written by /nhl/update-stats; current season)
+STATS_FILE = seasons.path("stats")
 
-@nhl_bp.route("/nhl/stats")
-def nhl_stats_html():
-    url = "https://api-web.nhle.com/v1/skater-stats-leaders/current"
-    limit = int(request.args.get("limit", 15))
+SECTIONS = [("points", "POINTS"), ("goals", "GOALS"), ("assists", "ASSISTS")]
+LIMITS = (15, 25, 50, 100)
+DEFAULT_LIMIT = 15
 
-    # --- Minimal change: try local cache first, else fall back to API ---
-    data = None
-    if os.path.exists(STATS_FILE):
-        try:
-            with open(STATS_FILE, "r") as f:
-                data = json.load(f)
-        except Exception:
-            data = None
+_caches = {}                # path -> {"version", "data", "blocks", "pages", "digest"}
 
-    if data is None:
-        try:
-            # keep original behavior; API may ignore limit param, we still slice below
-            data = requests.get(url, params={"limit": limit}, timeout=8).json()
-        except Exception as e:
-            return f"<pre>Error fetching NHL data: {e}</pre>"
 
-    sections = [("points", "POINTS"), ("goals", "GOALS"), ("assists", "ASSISTS")]
-    out = []
-
-    for key, title in sections:
-        leaders = data.get(key, []) or []
-        out.append(title)
-        out.append("-" * len(title))
-        for p in leaders[:limit]:  # <-- limit still applied exactly as before
-            first = p.get("firstName", {}).get("default", "")
-            last = p.get("lastName", {}).get("default", "")
-            team = p.get("teamAbbrev", "")
-            val = p.get("value", "?")
-            name = f"{first} {last}".strip()
-            if team == "EDM":
-                line = f"<span style='color:{TH2};font-weight:bold'>{name} ({team})  {val}</span>"
-            else:
-                line = f"{name} ({team})  {val}"
-            out.append(line)
-        out.append("")
-
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-<meta name="viewport" content="width=device-width,initial-scale=1.0">
-<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Rajdhani:wght@600&display=swap">
-<style>
-  body {{
-    background:{TH3};
-    color:#eee;
-    font-family:'Rajdhani',sans-serif;
-    margin:0;
-    padding:1em;
-    text-align:left;
-    min-height:100vh;
-    overflow-y:auto;
-    -webkit-overflow-scrolling:touch;
-  }}
-
-  /* --- NAVIGATION --- */
-  .nav {{
-    text-align:left;
-    margin-bottom:1.2em;
-  }}
-  .menu-btn {{
-    background:none;
-    color:{TH1};
-    text-decoration:none;
-    font-weight:bold;
-    font-size:clamp(22px,4vw,26px);
-    display:inline-block;
-    margin-bottom:0.5em;
-  }}
-  .submenu {{
-    display:flex;
-    justify-content:flex-start;
-    flex-wrap:wrap;
-    gap:0.6em;
-  }}
-  .submenu a {{
-    background:{alpha(TH1,0.13)};
-    color:{TH1};
-    padding:0.3em 0.8em;
-    border-radius:8px;
-    text-decoration:none;
-    font-weight:bold;
-    font-size:clamp(17px,3.3vw,19px);
-    transition:background 0.2s ease,color 0.2s ease;
-  }}
-  .submenu a:hover {{
-    background:{alpha(TH2,0.25)};
-    color:{TH2};
-  }}
-  .submenu a.active {{
-    background:{TH2};
-    color:#000;
-  }}
-
-  pre {{
-    font-size:clamp(15px,2.5vw,18px);
-    line-height:1.5em;
-    white-space:pre-wrap;
-    word-break:break-word;
-  }}
-  select {{
-    padding:0.3em;
-    border-radius:6px;
-    font-size:1em;
-  }}
-</style>
-</head>
-<body>
-
-  <div class="nav">
-    <a href="/" class="menu-btn">← MENU</a>
-    <div class="submenu">
-      <a href="/nhl" class="{'active' if request.path == '/nhl' else ''}">SCORES</a>
-      <a href="/nhl/standings" class="{'active' if request.path == '/nhl/standings' else ''}">STANDINGS</a>
-      <a href="/nhl/stats" class="{'active' if request.path == '/nhl/stats' else ''}">STATS</a>
-      <a href="/nhl/more" class="{'active' if request.path == '/nhl/more' else ''}">MORE</a>
-    </div>
-  </div>
+def leader_rows(data, key):
+    """[(first, last, team, value)] for one category of a leaders payload (as db.leaders)."""
+    return [(p.get("firstName", {}).get("default", ""), p.get("lastName", {}).get("default", ""),
+             p.get("teamAbbrev", ""), p.get("value", "?")) for p in data.get(key, []) or []]
+
+
+def render_block(leaders, title, limit):
+    """One category as text lines (EDM highlighted)."""
+    out = [title, "-" * len(title)]
+    for first, last, team, val in leaders[:limit]:
+        name = f"{first} {last}".strip()
+        if team == "EDM":
+            out.append(f"<span style='color:{TH2};font-weight:bold'>{name} ({team})  {val}</span>")
+        else:
+            out.append(f"{name} ({team})  {val}")
+    out.append("")
+    return "\n".join(out)
 
+
+def render_page(blocks, limit, season=None):
+    options = "\n".join(
+        f"      <option value=\"{n}\" {'selected' if limit == n else ''}>{n}</option>" for n in LIMITS
+    )
+    html = nhl_nav("/nhl/stats", season) + f"""
   <form method="get" action="/nhl/stats" style="margin-bottom:1em;">
     <label for="limit" style="color:{TH1};font-weight:bold;">Show top:</label>
     <select name="limit" id="limit" onchange="this.form.submit()">
-      <option value="15" {'selected' if limit==15 else ''}>15</option>
-      <option value="25" {'selected' if limit==25 else ''}>25</option>
-      <option value="50" {'selected' if limit==50 else ''}>50</option>
-      <option value="100" {'selected' if limit==100 else ''}>100</option>
+{options}
     </select>
+    <a href="/nhl/stats/trend" style="margin-left:1em;color:{TH2};">Player trends</a>
   </form>
 
-  <pre>{textwrap.dedent(chr(10).join(out))}</pre>
+  <pre>{textwrap.dedent(chr(10).join(blocks))}</pre>
+"""
+    return page(html, "nhl pg-stats")
+
+
+def _stored_leaders(path):
+    """(file body, {category: leader rows}) from the season's store, or None."""
+    store = db.synced(path, "stats")
+    body = db.read(db.blob, "stats", store) if store else None
+    if body is None:
+        return None
+    rows = {key: db.read(db.leaders, key, max(LIMITS), store) for key, _ in SECTIONS}
+    if any(r is None for r in rows.values()):
+        return None
+    return body.encode(), rows
 
-</body>
-</html>"""
 
-    response = make_response(html)
+def load_stats(path=STATS_FILE, season=None):
+    """Parsed stats file of a season (default: current; None if missing or
+    unreadable); re-parsed and re-rendered only when the file (or the season
+    manifest) changes."""
+    try:
+        version = (os.path.getmtime(path), seasons.version())
+    except OSError:
+        return None
+    cache = _caches.get(path)
+    if cache is None or cache["version"] != version:
+        stored = _stored_leaders(path)
+        try:
+            if stored:
+                raw, rows = stored
+            else:
+                with open(path, "rb") as f:
+                    raw = f.read()
+                rows = None
+            data = json.loads(raw)
+        except (OSError, ValueError) as e:
+            print(f"[Stats] cannot read {os.path.basename(path)}: {e}")
+            return None
+        rows = rows or {key: leader_rows(data, key) for key, _ in SECTIONS}
+        blocks = {(key, n): render_block(rows[key], title, n)
+                  for key, title in SECTIONS for n in LIMITS}
+        season = season or seasons.current()
+        pages = {n: render_page([blocks[key, n] for key, _ in SECTIONS], n, season) for n in LIMITS}
+        cache = _caches[path] = {"version": version, "data": data, "blocks": blocks, "pages": pages,
+                                 "digest": hashlib.blake2b(raw, digest_size=8).hexdigest()}
+    return cache["data"]
+
+
+@nhl_bp.route("/nhl/stats")
+def nhl_stats_html():
+    try:
+        limit = int(request.args.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        limit = DEFAULT_LIMIT
+
+    season = seasons.selected()
+    path = seasons.path("stats", season)
+    data = load_stats(path, season)
+    if data is not None and limit in LIMITS:
+        cache = _caches[path]
+        response = make_response(cache["pages"][limit])
+        response.set_etag(f"{cache['digest']}-{limit}-{season}-{seasons.version()}-{CSS_HASH}")
+        response.headers["Cache-Control"] = "public, max-age=80"
+        return response.make_conditional(request)
+
+    if data is None and seasons.is_current(season):
+        try:
+            # no local file yet: API may ignore limit param, we still slice below
+            data = requests.get(NHL_STATS_LEADERS, params={"limit": limit}, timeout=8).json()
+        except Exception as e:
+            return f"<pre>Error fetching NHL data: {e}</pre>"
+    elif data is None:
+        data = {}  # no leaders were saved for that season
+
+    response = make_response(render_page([render_block(leader_rows(data, key), title, limit)
+                                          for key, title in SECTIONS], limit, season))
     response.headers["Cache-Control"] = "public, max-age=80"
     response.headers["Pragma"] = "cache"
     response.headers["Expires"] = "120"
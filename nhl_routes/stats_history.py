@@ -0,0 +1,270 @@
+# nhl_routes/stats_history.py
+# Leader history: every stats refresh that changes nhl_stats_<season>.json is
+# appended to nhl_stats_history_<season>.jsonl as a delta against the file it
+# replaces, one JSON object per line:
+#       {"t": epoch, "day": "YYYY-MM-DD",
+#        "set": {category: {player_id: value}},    new or changed values
+#        "drop": {category: [player_id, ...]},     fell off the leader list
+#        "names": {player_id: "First Last (TEAM)"}} new players / team changes
+# - the first line (no previous file, or after a lost history) is a full
+#   keyframe: a delta against nothing
+# - trend() scans the file as bytes and only decodes lines that mention the
+#   player's id, so a player's curve never rebuilds a whole snapshot
+# - compact() (POST /nhl/compact-stats) folds each day's deltas into one and
+#   drops empty ones; it holds the 'stats' lease, so no refresh appends meanwhile
+import datetime, json, os, time
+from html import escape
+from flask import jsonify, make_response, request
+from . import nhl_bp, seasons
+from .jobs import submit, job_response
+from .lease import exclusive, atomic_write
+from .stats import SECTIONS, load_stats
+from .players import search
+from layout import page, nhl_nav
+from utils import TH1, TH2
+
+HISTORY_FILE = seasons.path("stats_history")  # current season
+CATEGORIES = [key for key, _ in SECTIONS]
+
+
+def player_id(p):
+    return str(p.get("id") or player_name(p))
+
+
+def player_name(p):
+    first = p.get("firstName", {}).get("default", "")
+    last = p.get("lastName", {}).get("default", "")
+    return f"{first} {last}".strip()
+
+
+def snapshot(data):
+    """Stats file contents -> ({category: {pid: value}}, {pid: label})."""
+    values, names = {}, {}
+    for cat in CATEGORIES:
+        values[cat] = {}
+        for p in data.get(cat, []) or []:
+            pid = player_id(p)
+            values[cat][pid] = p.get("value")
+            names[pid] = f"{player_name(p)} ({p.get('teamAbbrev', '')})"
+    return values, names
+
+
+def diff(old, new):
+    """Delta from snapshot old (None = nothing) to snapshot new, or None if equal."""
+    (old_values, old_names), (values, names) = old or ({}, {}), new
+    delta = {"set": {}, "drop": {}, "names": {}}
+    for cat in CATEGORIES:
+        before, after = old_values.get(cat, {}), values.get(cat, {})
+        changed = {pid: v for pid, v in after.items() if before.get(pid, object()) != v}
+        dropped = [pid for pid in before if pid not in after]
+        if changed:
+            delta["set"][cat] = changed
+        if dropped:
+            delta["drop"][cat] = dropped
+    delta["names"] = {pid: n for pid, n in names.items() if old_names.get(pid) != n}
+    if not delta["set"] and not delta["drop"]:
+        return None
+    return delta
+
+
+def apply(state, delta):
+    """Apply one delta to a snapshot (values, names) in place."""
+    values, names = state
+    for cat, changed in delta.get("set", {}).items():
+        values.setdefault(cat, {}).update(changed)
+    for cat, dropped in delta.get("drop", {}).items():
+        for pid in dropped:
+            values.get(cat, {}).pop(pid, None)
+    names.update(delta.get("names", {}))
+    return state
+
+
+def record(stats_file, new_data, path=HISTORY_FILE, now=None):
+    """Append the delta from the current stats_file (about to be replaced) to
+    new_data. Called by the stats updater with the 'stats' lease held."""
+    old = None
+    if os.path.exists(path) and os.path.getsize(path):
+        try:
+            with open(stats_file) as f:
+                old = snapshot(json.load(f))
+        except (FileNotFoundError, ValueError):
+            old = None  # no usable previous file: write a keyframe
+    delta = diff(old, snapshot(new_data))
+    if delta is None:
+        return False
+    now = now or time.time()
+    delta = {"t": round(now), "day": datetime.date.fromtimestamp(now).isoformat(), **delta}
+    with open(path, "a") as f:
+        f.write(json.dumps(delta, separators=(",", ":")) + "\n")
+    return True
+
+
+def read_deltas(path=HISTORY_FILE):
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def trend(pid, category="points", path=HISTORY_FILE):
+    """[(day, value)] at each change of the player's value (None = off the list).
+    Only lines containing the id are decoded."""
+    needle = json.dumps(pid).encode()
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return []
+    points = []
+    for line in raw.split(b"\n"):
+        if needle not in line:
+            continue
+        delta = json.loads(line)
+        if pid in delta["set"].get(category, {}):
+            value = delta["set"][category][pid]
+        elif pid in delta["drop"].get(category, []):
+            value = None
+        else:
+            continue
+        if points and points[-1][0] == delta["day"]:
+            points[-1] = (delta["day"], value)  # keep the day's last value
+        else:
+            points.append((delta["day"], value))
+    return points
+
+
+@exclusive("stats", "Stats history")
+def compact(path=HISTORY_FILE, progress=None):
+    """Rewrite the history with one delta per day (the day's final state)."""
+    deltas = read_deltas(path)
+    if not deltas:
+        return "No stats history to compact."
+    size = os.path.getsize(path)
+    state = ({}, {})
+    emitted = None  # state as of the last written delta
+    out = []
+    for i, delta in enumerate(deltas):
+        apply(state, delta)
+        last_of_day = i + 1 == len(deltas) or deltas[i + 1]["day"] != delta["day"]
+        if not last_of_day:
+            continue
+        current = ({c: dict(v) for c, v in state[0].items()}, dict(state[1]))
+        d = diff(emitted, current)
+        if d:
+            out.append({"t": delta["t"], "day": delta["day"], **d})
+            emitted = current
+        if progress:
+            progress(days_fetched=len(out), days_total=None)
+    atomic_write(path, "".join(json.dumps(d, separators=(",", ":")) + "\n" for d in out))
+    msg = (f"Compacted stats history: {len(deltas)} -> {len(out)} deltas, "
+           f"{size // 1024} KB -> {os.path.getsize(path) // 1024} KB.")
+    print("[StatsHistory]", msg)
+    return msg
+
+
+@nhl_bp.route("/nhl/compact-stats", methods=["POST"])
+def manual_compact_stats():
+    job, is_new = submit("stats-compact", "Stats history", compact)
+    return job_response(job, is_new)
+
+
+# ---------------- Trend view ----------------
+def resolve_player(query, season=None):
+    """Player id for an id or a (partial) name -> (pid, label) or (None, None)."""
+    _, names = snapshot(load_stats(seasons.path("stats", season), season) or {})
+    if query in names:
+        return query, names[query]
+    hits = search(query, 1)
+    if not hits:
+        return None, None
+    p = hits[0]
+    return p["id"], names.get(p["id"], f"{p['name']} ({p['team']})")
+
+
+def chart(points, width=600, height=200):
+    """Inline SVG step chart of [(day, value)]."""
+    days = [datetime.date.fromisoformat(d) for d, _ in points]
+    values = [v for _, v in points if v is not None]
+    if not values:
+        return ""
+    span = max((days[-1] - days[0]).days, 1)
+    top = max(values) or 1
+    path = []
+    for d, (_, v) in zip(days, points):
+        x = round((d - days[0]).days / span * width, 1)
+        y = round(height - (v or 0) / top * height, 1)
+        path.append(f"H{x} V{y}" if path else f"M{x} {y}")
+    path.append(f"H{width}")
+    return (f"<svg viewBox='0 -10 {width} {height + 20}' width='100%' style='max-width:{width}px'>"
+            f"<path d='{' '.join(path)}' fill='none' stroke='{TH2}' stroke-width='2'/></svg>")
+
+
+@nhl_bp.route("/nhl/stats/trend.json")
+def nhl_stats_trend_json():
+    query = (request.args.get("player") or "").strip()
+    category = request.args.get("cat", "points")
+    if not query or category not in CATEGORIES:
+        return jsonify({"status": "error", "message": "Use ?player=<id or name>&cat=points|goals|assists"}), 400
+    season = seasons.selected()
+    pid, label = resolve_player(query, season)
+    if pid is None:
+        return jsonify({"status": "error", "message": "Unknown player"}), 404
+    return jsonify({"player": pid, "name": label, "category": category, "season": season,
+                    "trend": trend(pid, category, seasons.path("stats_history", season))})
+
+
+@nhl_bp.route("/nhl/stats/trend")
+def nhl_stats_trend_html():
+    query = (request.args.get("player") or "").strip()
+    category = request.args.get("cat", "points")
+    if category not in CATEGORIES:
+        category = "points"
+    season = seasons.selected()
+    pid, label = resolve_player(query, season) if query else (None, None)
+    points = trend(pid, category, seasons.path("stats_history", season)) if pid else []
+
+    options = "".join(f"<option value='{c}' {'selected' if c == category else ''}>{c.title()}</option>"
+                      for c in CATEGORIES)
+    rows = "\n".join(f"{datetime.date.fromisoformat(d):%b %d}  {'-' if v is None else v}"
+                     for d, v in reversed(points))
+    if not query:
+        body = "<p>Enter a player id or name.</p>"
+    elif pid is None:
+        body = "<p>No such player in the current stats.</p>"
+    elif not points:
+        body = f"<h3 style='color:{TH1};'>{escape(label)}</h3><p>No history yet.</p>"
+    else:
+        body = f"<h3 style='color:{TH1};'>{escape(label)}: {category}</h3>{chart(points)}<pre>{rows}</pre>"
+
+    html = nhl_nav("/nhl/stats") + f"""
+  <form method="get" action="/nhl/stats/trend" style="margin-bottom:1em;">
+    <input name="player" value="{escape(query)}" placeholder="Player id or name" list="players" autocomplete="off"
+           oninput="suggest(this.value)">
+    <datalist id="players"></datalist>
+    <select name="cat" onchange="this.form.submit()">{options}</select>
+    <button>Show</button>
+  </form>
+  {body}
+<script>
+let pending = null;
+function suggest(q) {{
+  clearTimeout(pending);
+  if (q.length < 2) return;
+  pending = setTimeout(async () => {{
+    const res = await fetch("/nhl/players?q=" + encodeURIComponent(q));
+    const list = document.getElementById("players");
+    list.innerHTML = "";
+    (await res.json()).results.forEach(p => {{
+      const opt = document.createElement("option");
+      opt.value = p.name;
+      opt.label = p.team;
+      list.appendChild(opt);
+    }});
+  }}, 120);
+}}
+</script>
+"""
+    response = make_response(page(html, "nhl pg-stats", title="NHL Stats Trend"))
+    response.headers["Cache-Control"] = "public, max-age=80"
+    return response
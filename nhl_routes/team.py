@@ -0,0 +1,121 @@
+# nhl_routes/team.py
+# Team pages: /nhl/team (index by division) and /nhl/team/<abbr>.
+# Everything comes from the per-team indexes (results.team_games,
+# scoreboard.get_schedule_for_team), so a page costs O(team games). Pages
+# show the selected season; only the current one has upcoming games.
+from flask import make_response
+import datetime
+from . import nhl_bp, seasons
+from layout import page, nhl_nav
+from .results import load_season, team_games
+from .scoreboard import get_schedule_for_team
+from .ratings import current_ratings
+from .teams import DIVISIONS, INDEX, canon
+
+UPCOMING = 10               # schedule rows shown
+
+
+def game_log(team, season=None):
+    """[(day, home?, opp, gf, ga, 'W'|'L'|'OTL', note, gid)] in date order."""
+    log = []
+    for gid, day, away, a_score, home, h_score, note in team_games(team, season):
+        at_home = team == home
+        gf, ga = (h_score, a_score) if at_home else (a_score, h_score)
+        res = "W" if gf > ga else ("OTL" if note in ("OT", "SO") else "L")
+        log.append((day, at_home, away if at_home else home, gf, ga, res, note, gid))
+    return log
+
+
+def record(log):
+    """'W-L-OTL' for a slice of the game log."""
+    w = sum(1 for g in log if g[5] == "W")
+    otl = sum(1 for g in log if g[5] == "OTL")
+    return f"{w}-{len(log) - w - otl}-{otl}"
+
+
+def streak(log):
+    if not log:
+        return "-"
+    last = log[-1][5]
+    n = 0
+    for g in reversed(log):
+        if g[5] != last:
+            break
+        n += 1
+    return f"{'OT' if last == 'OTL' else last}{n}"
+
+
+@nhl_bp.route("/nhl/team")
+def nhl_team_index():
+    cols = "".join(
+        f"<div class='div'><h3>{name}</h3>"
+        + "".join(f"<a class='month' href='/nhl/team/{t}'>{t}</a><br>" for t in teams)
+        + "</div>"
+        for name, teams in DIVISIONS.items()
+    )
+    html = nhl_nav() + f"<h2>Teams</h2><div class='divs'>{cols}</div>"
+    return make_response(page(html, "nhl pg-month pg-team", title="NHL Teams"))
+
+
+@nhl_bp.route("/nhl/team/<abbr>")
+def nhl_team_html(abbr):
+    team = canon(abbr)
+    if team not in INDEX:
+        return "<pre>Unknown team.</pre>", 404
+
+    key = seasons.selected()
+    path = seasons.path("results", key)
+    season = load_season(path)
+    log = game_log(team, season) if season else []
+    home = [g for g in log if g[1]]
+    away = [g for g in log if not g[1]]
+    pts = sum(2 if g[5] == "W" else 1 if g[5] == "OTL" else 0 for g in log)
+    rating = current_ratings(path).get(team)
+
+    played_ids = {g[7] for g in log if g[7]}
+    last_day = log[-1][0].replace("-", "") if log else ""
+    upcoming = [p for p in (get_schedule_for_team(team) if seasons.is_current(key) else [])
+                if p[4] not in played_ids and p[0] > last_day][:UPCOMING]
+
+    def split_row(label, games):
+        gf = sum(g[3] for g in games)
+        ga = sum(g[4] for g in games)
+        return (f"<tr><td>{label}</td><td>{len(games)}</td><td>{record(games)}</td>"
+                f"<td>{gf}</td><td>{ga}</td><td>{gf - ga:+d}</td></tr>")
+
+    results_rows = "".join(
+        f"<tr><td>{datetime.date.fromisoformat(day).strftime('%b %d') if day else '-'}</td>"
+        f"<td>{'vs' if at_home else '@'} <a href='/nhl/team/{opp}'>{opp}</a></td>"
+        f"<td class='{res.lower()}'>{res}</td><td>{gf} - {ga}</td><td>{note}</td></tr>"
+        for day, at_home, opp, gf, ga, res, note, _ in reversed(log)
+    )
+    upcoming_rows = "".join(
+        f"<tr><td>{datetime.datetime.strptime(day, '%Y%m%d'):%b %d}</td>"
+        f"<td>{'vs ' + a if h == team else '@ ' + h}</td><td>{t}</td></tr>"
+        for day, a, h, t, _ in upcoming
+    )
+
+    html = nhl_nav() + f"""
+<a href="/nhl/team" class="back">← Teams</a>
+<h2>{team}</h2>
+<p class="summary">{record(log)}, {pts} PTS
+  · Last 10: {record(log[-10:])}
+  · Streak: {streak(log)}{f" · Elo {rating:.0f}" if rating else ""}</p>
+
+<table>
+  <tr><th>Split</th><th>GP</th><th>W-L-OTL</th><th>GF</th><th>GA</th><th>DIFF</th></tr>
+  {split_row("Home", home)}
+  {split_row("Away", away)}
+  {split_row("Last 10", log[-10:])}
+  {split_row("Total", log)}
+</table>
+
+<h3>Upcoming</h3>
+{f"<table><tr><th>Date</th><th>Opponent</th><th>Time</th></tr>{upcoming_rows}</table>" if upcoming else "<p>No games scheduled.</p>"}
+
+<h3>Results</h3>
+{f"<table><tr><th>Date</th><th>Opponent</th><th></th><th>Score</th><th>Note</th></tr>{results_rows}</table>" if log else "<p>No games played.</p>"}
+"""
+    response = make_response(page(html, "nhl pg-month pg-team", title=f"NHL {team}"))
+    response.headers["Cache-Control"] = "public, max-age=80"
+    return response
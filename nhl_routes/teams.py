@@ -0,0 +1,32 @@
+# nhl_routes/teams.py
+# League structure for 2025-26 (ESPN abbreviations, as in the data files).
+# The NHL API (stats leaders) spells a few teams differently; see ALIASES.
+
+DIVISIONS = {
+    "Atlantic": ["BOS", "BUF", "DET", "FLA", "MTL", "OTT", "TB", "TOR"],
+    "Metropolitan": ["CAR", "CBJ", "NJ", "NYI", "NYR", "PHI", "PIT", "WSH"],
+    "Central": ["CHI", "COL", "DAL", "MIN", "NSH", "STL", "UTAH", "WPG"],
+    "Pacific": ["ANA", "CGY", "EDM", "LA", "SJ", "SEA", "VAN", "VGK"],
+}
+CONFERENCES = {
+    "Eastern": ["Atlantic", "Metropolitan"],
+    "Western": ["Central", "Pacific"],
+}
+ALIASES = {"LAK": "LA", "NJD": "NJ", "SJS": "SJ", "TBL": "TB", "UTA": "UTAH"}
+
+TEAMS = sorted(t for teams in DIVISIONS.values() for t in teams)
+INDEX = {t: i for i, t in enumerate(TEAMS)}          # abbr -> 0..31 (array position)
+DIVISION_OF = {t: d for d, teams in DIVISIONS.items() for t in teams}
+CONFERENCE_OF = {t: c for c, divs in CONFERENCES.items() for d in divs for t in DIVISIONS[d]}
+NHL_ABBR = {espn: nhl for nhl, espn in ALIASES.items()}   # ESPN -> NHL API spelling (where different)
+
+
+def canon(abbr):
+    """ESPN abbreviation for abbr (accepts NHL API spellings, any case)."""
+    abbr = abbr.upper()
+    return ALIASES.get(abbr, abbr)
+
+
+def nhl_abbr(team):
+    """NHL API abbreviation for an ESPN one (roster URLs)."""
+    return NHL_ABBR.get(team, team)
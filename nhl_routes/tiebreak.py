@@ -0,0 +1,92 @@
+# nhl_routes/tiebreak.py
+# Division / conference / wild-card standings: points, then the NHL tiebreak
+# chain: points % (fewer games played), regulation wins (RW), regulation + OT
+#   wins (ROW), total wins, points % in games among the tied clubs
+#   (head-to-head), goal differential, goals for
+# One sort of the league on the cheap part of the key (PTS .. W); every
+# view is then a filter of that order, and only runs of teams still tied
+# inside a view go through head-to-head, over exactly those teams.
+# Head-to-head comes from the h2h matrix for the current table, or from the
+# per-team game index (results.team_games) for a past date / without NumPy;
+# path is the season's results file the matrix is built from.
+from bisect import bisect_right
+from fractions import Fraction
+from .results import RESULTS_FILE, team_games
+from .teams import DIVISIONS, CONFERENCES, DIVISION_OF, INDEX
+from . import h2h
+
+WILD_CARDS = 2
+DIVISION_SPOTS = 3
+
+
+def points_pct(pts, gp):
+    return Fraction(pts, 2 * gp) if gp else Fraction(0)
+
+
+def _key(st):
+    return (-st["PTS"], -points_pct(st["PTS"], st["GP"]), -st["RW"], -st["ROW"], -st["W"])
+
+
+def head_to_head(group, day=None, season=None, path=RESULTS_FILE):
+    """{team: (points, games)} in games among the teams in group."""
+    matrix = h2h.refresh(path) if day is None else None
+    if matrix is not None:
+        ix = [INDEX[t] for t in group]
+        pts = matrix[h2h.F["PTS"]][ix][:, ix].sum(axis=1).tolist()
+        gp = matrix[h2h.F["GP"]][ix][:, ix].sum(axis=1).tolist()
+        return {t: (pts[k], gp[k]) for k, t in enumerate(group)}
+    out = {}
+    members = set(group)
+    for team in group:
+        games = team_games(team, season)
+        if day is not None:
+            games = games[:bisect_right([g[1] for g in games], day)]
+        pts = gp = 0
+        for _, _, away, a_score, home, h_score, note in games:
+            opp, gf, ga = (home, a_score, h_score) if team == away else (away, h_score, a_score)
+            if opp in members:
+                gp += 1
+                pts += 2 if gf > ga else 1 if note in ("OT", "SO") else 0
+        out[team] = (pts, gp)
+    return out
+
+
+def resolve(order, table, keys, day=None, season=None, path=RESULTS_FILE):
+    """order: a view's teams in league order -> same teams with ties broken."""
+    out = []
+    i = 0
+    while i < len(order):
+        j = i + 1
+        while j < len(order) and keys[order[j]] == keys[order[i]]:
+            j += 1
+        group = order[i:j]
+        if len(group) > 1:
+            hh = head_to_head(group, day, season, path)
+            group.sort(key=lambda t: (-points_pct(*hh[t]), -(table[t]["GF"] - table[t]["GA"]),
+                                      -table[t]["GF"], t))
+        out += group
+        i = j
+    return out
+
+
+def standings_views(table, day=None, season=None, path=RESULTS_FILE):
+    """table: standings_as_of() output ->
+    {"league": [...], "division": {name: [...]}, "conference": {name: [...]},
+     "wildcard": {conference: {"leaders": {division: [...]}, "wildcard": [...]}}}"""
+    keys = {t: _key(st) for t, st in table.items() if t in DIVISION_OF}
+    league = sorted(keys, key=keys.get)
+
+    def view(members):
+        return resolve([t for t in league if t in members], table, keys, day, season, path)
+
+    divisions = {d: view(set(teams)) for d, teams in DIVISIONS.items()}
+    conferences = {}
+    wildcard = {}
+    for conf, divs in CONFERENCES.items():
+        members = {t for d in divs for t in DIVISIONS[d]}
+        conferences[conf] = view(members)
+        leaders = {d: divisions[d][:DIVISION_SPOTS] for d in divs}
+        seeded = {t for teams in leaders.values() for t in teams}
+        wildcard[conf] = {"leaders": leaders, "wildcard": view(members - seeded)}
+    return {"league": view(set(keys)), "division": divisions,
+            "conference": conferences, "wildcard": wildcard}
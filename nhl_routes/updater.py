@@ -1,29 +1,64 @@
 # nhl_routes/updater.py
 import datetime
 import time
-import requests
 import zoneinfo
 import os
+import json
+from functools import partial
 from datetime import date, timedelta
-from flask import jsonify
+from flask import jsonify, request
 from . import nhl_bp
-
-# --- Paths ---
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-SCHEDULE_FILE = os.path.join(BASE_DIR, "espn_schedule_2025_26.txt")
-RESULTS_FILE = os.path.join(BASE_DIR, "espn_games_2025_26.txt")
+from .jobs import submit, job_response
+from .lease import exclusive, atomic_write
+from .schedule import update_espn_schedule_file, SEASON_START, SEASON_END
+from .rosters import update_rosters_file
+from . import upstream, db, ratings, h2h, stats_history, seasons
+from .upstream import get_json
+from endpoints import ESPN_SCOREBOARD, NHL_STATS_LEADERS
+from espn import parse_events
+
+# --- Paths (current season partition, see seasons.py) ---
+SCHEDULE_FILE = seasons.path("schedule")
+RESULTS_FILE = seasons.path("results")
+STATS_FILE = seasons.path("stats")
+# final gids seen per scanned day: {YYYYMMDD: [gid, ...]}; an unchanged day
+# is only skipped while all of them are in the results file
+DAYS_FILE = os.path.join(upstream.CACHE_DIR, f"results_days_{seasons.current()}.json")
 
 TZ = zoneinfo.ZoneInfo("America/Edmonton")
-BASE_URL = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard"
+BASE_URL = ESPN_SCOREBOARD
+STATS_URL = NHL_STATS_LEADERS
 
 
 # ------------------------------------------------------
-#  Update completed games (writes espn_games_2025_26.txt)
+#  Update completed games (writes espn_games_<season>.txt)
 # ------------------------------------------------------
-def update_completed_games(season_start=date(2025, 10, 7), out_file=RESULTS_FILE):
-    """Fetch FINAL games and append new ones to results file."""
+def final_game_lines(data, d, tz=TZ):
+    """Scoreboard payload for day d -> [(gid, results line)] for FINAL regular-season games."""
+    out = []
+    for g in parse_events(data):
+        if g.state != "final" or not g.gid:
+            continue
+        # --- Include date in YYYY-MM-DD format (local puck drop) ---
+        local = g.start_local(tz)
+        date_str = (local.date() if local else d).strftime("%Y-%m-%d")
+        line = f"{g.gid} {date_str} {g.away} {g.a_score or '?'} @ {g.home} {g.h_score or '?'}"
+        if g.note:
+            line += f" {g.note}"
+        out.append((g.gid, line))
+    return out
+
+
+@exclusive("results", "Completed games")
+def update_completed_games(season_start=SEASON_START, out_file=RESULTS_FILE, progress=None, force=False):
+    """Fetch FINAL games and append new ones to results file.
+       progress(**fields), if given, is called after each day (see jobs.py).
+       Days whose payload is unchanged since the last scan are skipped
+       without parsing (see upstream.py), but only while every final game
+       that day had is still in the file (a hand-edited or restored file
+       gets its missing days refetched); force=True rescans everything."""
     tz = TZ
-    today = date.today()
+    today = min(date.today(), SEASON_END)
     base_url = BASE_URL
 
     existing_lines, known_ids = [], set()
@@ -38,76 +73,73 @@ def update_completed_games(season_start=date(2025, 10, 7), out_file=RESULTS_FILE
                 if parts and parts[0].isdigit():
                     known_ids.add(parts[0])
 
+    try:
+        with open(DAYS_FILE) as f:
+            day_gids = {} if force else json.load(f)
+    except (FileNotFoundError, ValueError):
+        day_gids = {}
+
     all_lines = existing_lines[:]
-    added = 0
+    added = skipped = 0
+    days_total = (today - season_start).days + 1
+    days_done = 0
     d = season_start
     while d <= today:
         datestr = d.strftime("%Y%m%d")
+        added_before = added
+        error = None
+        if progress:
+            progress(fetching=datestr, fetch_started=time.time())
+        t0 = time.perf_counter()
         try:
-            resp = requests.get(f"{base_url}?dates={datestr}", timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-
-            for ev in data.get("events", []):
-                gid = ev.get("id")
-                if not gid or gid in known_ids:
-                    continue
-
-                st = ev.get("status", {}).get("type", {})
-                desc = (st.get("description") or "").lower()
-                if "final" not in desc:
-                    continue
-                if ev.get("season", {}).get("type") != 2:
+            # unchanged days can only be skipped if their games are already in the file
+            seen = day_gids.get(datestr)
+            skip_unchanged = seen is not None and known_ids.issuperset(seen)
+            data, changed = get_json(base_url, params={"dates": datestr}, timeout=10,
+                                     scope="results", skip_unchanged=skip_unchanged,
+                                     archive="scoreboard")
+            if not changed and skip_unchanged:
+                skipped += 1
+                data = {}
+
+            finals = final_game_lines(data, d) if data else []
+            if data:
+                day_gids[datestr] = [gid for gid, _ in finals]
+            for gid, line in finals:
+                if gid in known_ids:
                     continue
-
-                comp = ev.get("competitions", [{}])[0]
-                detail_text = " ".join([
-                    str(st.get(x, "")) for x in ("shortDetail", "detail", "description")
-                ] + [
-                    str(comp.get("status", {}).get("type", {}).get(x, "")) for x in ("shortDetail", "detail", "description")
-                ]).lower()
-                note = "SO" if ("shootout" in detail_text or " so" in detail_text or "/so" in detail_text) \
-                    else ("OT" if ("overtime" in detail_text or " ot" in detail_text or "/ot" in detail_text) else "")
-
-                teams = comp.get("competitors", [])
-                if len(teams) < 2:
-                    continue
-                home = next((t for t in teams if t.get("homeAway") == "home"), {})
-                away = next((t for t in teams if t.get("homeAway") == "away"), {})
-
-                h_name = home.get("team", {}).get("abbreviation", "???")
-                a_name = away.get("team", {}).get("abbreviation", "???")
-                h_score = home.get("score", "?")
-                a_score = away.get("score", "?")
-
-                # --- Include date in YYYY-MM-DD format ---
-                try:
-                    raw_date = ev.get("date", "")
-                    if raw_date:
-                        dt_utc = datetime.datetime.fromisoformat(raw_date.replace("Z", "+00:00"))
-                        dt_local = dt_utc.astimezone(tz)
-                        date_str = dt_local.strftime("%Y-%m-%d")
-                    else:
-                        date_str = d.strftime("%Y-%m-%d")
-                except Exception:
-                    date_str = d.strftime("%Y-%m-%d")
-
-                line = f"{gid} {date_str} {a_name} {a_score} @ {h_name} {h_score}"
-                if note:
-                    line += f" {note}"
-
                 all_lines.append(line)
                 known_ids.add(gid)
                 added += 1
         except Exception as e:
+            error = str(e)
             print(f"[Updater] {datestr} error: {e}")
         d += timedelta(days=1)
+        days_done += 1
+        if progress:
+            progress(
+                days_fetched=days_done, days_total=days_total, games_added=added, fetching=None,
+                log={"day": datestr, "ms": round((time.perf_counter() - t0) * 1000),
+                     "games": added - added_before, "error": error},
+            )
 
     if added:
-        with open(out_file, "w") as f:
-            f.write("\n".join(all_lines))
+        atomic_write(out_file, "\n".join(all_lines))
+    if out_file == RESULTS_FILE:  # idempotent; also back-fills a fresh db
+        db.mirror(db.upsert_games, all_lines, source=out_file)
+    os.makedirs(os.path.dirname(DAYS_FILE), exist_ok=True)
+    atomic_write(DAYS_FILE, json.dumps(day_gids))
+    try:
+        ratings.apply_lines(all_lines)  # O(1) per new game
+    except Exception as e:
+        print(f"[Ratings] update failed: {e}")
+    try:
+        h2h.refresh()  # reads only the appended tail
+    except Exception as e:
+        print(f"[H2H] refresh failed: {e}")
+    upstream.save()
     now = datetime.datetime.now(tz).strftime("%-I:%M %p %b %d, %Y")
-    msg = f"Added {added} new games. Total lines: {len(all_lines)}. Updated {now}."
+    msg = f"Added {added} new games. Total lines: {len(all_lines)}. Skipped {skipped} unchanged days. Updated {now}."
     print("[Updater]", msg)
     return msg
 
@@ -115,40 +147,72 @@ def update_completed_games(season_start=date(2025, 10, 7), out_file=RESULTS_FILE
 # ------------------------------------------------------
 #  Manual Flask routes for updates
 # ------------------------------------------------------
+# Long fetches run as background jobs (see jobs.py): the POST returns a job
+# id immediately and the panel polls /nhl/jobs/<id> for progress.
 @nhl_bp.route("/nhl/update-results", methods=["POST"])
 def manual_update_results():
-    msg = update_completed_games()
-    return {"status": "ok", "message": msg}
+    """?force=1 rescans every day, ignoring the conditional-GET cache."""
+    if request.args.get("force") == "1":
+        job, is_new = submit("results", "Completed Games", partial(update_completed_games, force=True))
+    else:
+        job, is_new = submit("results", "Completed Games", update_completed_games)
+    return job_response(job, is_new)
 
 
 @nhl_bp.route("/nhl/update-schedule", methods=["POST"])
 def manual_update_schedule():
-    update_espn_schedule_file()
-    return {"status": "ok", "message": "Schedule updated."}
+    job, is_new = submit("schedule", "Schedule", update_espn_schedule_file)
+    return job_response(job, is_new)
 
 
 @nhl_bp.route("/nhl/update-rosters", methods=["POST"])
 def manual_update_rosters():
-    # Placeholder for future roster fetcher
-    return {"status": "ok", "message": "Roster update coming soon."}
-    
-# in nhl_routes/updater.py
-@nhl_bp.route("/nhl/update-stats", methods=["POST"])
-def manual_update_stats():
-    import json, requests, os
-    STATS_FILE = os.path.join(BASE_DIR, "nhl_stats_2025_26.json")
-    url = "https://api-web.nhle.com/v1/skater-stats-leaders/current"
+    job, is_new = submit("rosters", "Rosters", update_rosters_file)
+    return job_response(job, is_new)
+
+
+# ------------------------------------------------------
+#  Update skater leaders (writes nhl_stats_<season>.json)
+# ------------------------------------------------------
+@exclusive("stats", "Stats")
+def update_stats_file(out_file=STATS_FILE, progress=None):
+    """Fetch current skater leaders and save them to out_file."""
     try:
         # ask for a big batch so your UI can slice down to 15/25/50/100
-        data = requests.get(url, params={"limit": 200}, timeout=12).json()
-        with open(STATS_FILE, "w") as f:
-            json.dump(data, f)
-        msg = "Stats updated successfully."
+        data, changed = get_json(STATS_URL, params={"limit": 200}, timeout=12,
+                                 scope="stats", skip_unchanged=os.path.exists(out_file),
+                                 archive="stats")
+        if changed:
+            try:
+                stats_history.record(out_file, data)  # delta against the file being replaced
+            except Exception as e:
+                print(f"[StatsHistory] snapshot failed: {e}")
+            body = json.dumps(data)
+            atomic_write(out_file, body)
+            if out_file == STATS_FILE:
+                db.mirror(db.save_stats, body, source=out_file)
+            msg = "Stats updated successfully."
+        else:
+            msg = "Stats unchanged since last update."
+        upstream.save()
     except Exception as e:
         msg = f"Error updating stats: {e}"
-    return {"status": "ok", "message": msg}
+    print("[Updater]", msg)
+    return msg
+
+
+@nhl_bp.route("/nhl/update-stats", methods=["POST"])
+def manual_update_stats():
+    job, is_new = submit("stats", "Stats", update_stats_file)
+    return job_response(job, is_new)
+
+
 
 
+@nhl_bp.route("/nhl/upstream-stats")
+def upstream_stats():
+    """Conditional-GET counters (requests, 304s, unchanged bodies, skipped parses)."""
+    return jsonify(upstream.stats_snapshot())
 
 
 @nhl_bp.route("/nhl/rebuild-standings", methods=["POST"])
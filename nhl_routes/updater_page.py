@@ -1,15 +1,16 @@
 # nhl_routes/updater_page.py
 from flask import make_response
 import os, datetime
-from . import nhl_bp
-from utils import TH1, TH2, TH3, alpha
+from . import nhl_bp, seasons
+from layout import page
 
-# --- Local data file paths ---
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-RESULTS_FILE = os.path.join(BASE_DIR, "espn_games_2025_26.txt")
-SCHEDULE_FILE = os.path.join(BASE_DIR, "espn_schedule_2025_26.txt")
-ROSTERS_FILE = os.path.join(BASE_DIR, "nhl_rosters_2025_26.json")
-STATS_FILE = os.path.join(BASE_DIR, "nhl_stats_2025_26.json")
+# --- Local data file paths (the updaters write the current season) ---
+SEASON = seasons.get()
+RESULTS_FILE = seasons.path("results")
+SCHEDULE_FILE = seasons.path("schedule")
+ROSTERS_FILE = seasons.path("rosters")
+STATS_FILE = seasons.path("stats")
+HISTORY_FILE = seasons.path("stats_history")
 
 def fmt_time(path):
     """Format file modified time (or show 'Never')."""
@@ -27,56 +28,72 @@ def nhl_updater_panel():
     schedule_time = fmt_time(SCHEDULE_FILE)
     rosters_time = fmt_time(ROSTERS_FILE)
     stats_time = fmt_time(STATS_FILE)
+    history_time = fmt_time(HISTORY_FILE)
 
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-<meta name="viewport" content="width=device-width,initial-scale=1.0">
-<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Rajdhani:wght@600&display=swap">
-<style>
-  body {{
-    background:{TH3};
-    color:#eee;
-    font-family:'Rajdhani',sans-serif;
-    margin:0;
-    padding:1em;
-  }}
-  a.back {{
-    color:{TH1};
-    font-weight:bold;
-    text-decoration:none;
-    display:inline-block;
-    margin-bottom:1em;
-    font-size:clamp(20px,3.5vw,24px);
-  }}
-  h2 {{ color:{TH1}; margin-top:0.3em; }}
-  .row {{
-    display:flex;
-    align-items:center;
-    flex-wrap:wrap;
-    gap:0.8em;
-    margin-bottom:0.9em;
-  }}
-  button {{
-    background:{TH1};
-    color:#000;
-    font-weight:bold;
-    border:none;
-    border-radius:8px;
-    padding:0.6em 1.2em;
-    font-size:clamp(16px,2.5vw,18px);
-    cursor:pointer;
-    transition:background 0.2s ease;
-  }}
-  button:hover {{ background:{TH2}; }}
-  .stamp {{
-    color:{TH2};
-    font-size:clamp(14px,2.2vw,16px);
-    opacity:0.8;
-  }}
-  #msg {{ color:{TH2}; margin-top:1em; }}
-</style>
+    html = f"""
 <script>
+const SLOW_MS = 3000;   // highlight requests slower than this
+
+function describe(job) {{
+  const p = job.progress || {{}};
+  let text = job.label + ": " + job.state;
+  if (p.days_total) text += " - " + p.days_fetched + "/" + p.days_total + " days";
+  if (p.games_added !== undefined) text += ", " + p.games_added + " games added";
+  text += " (" + job.elapsed + "s)";
+  if (p.fetching) text += " - fetching " + p.fetching + " for " + job.fetch_age + "s";
+  return text;
+}}
+
+let lastSeq = 0;   // highest log seq shown (the server trims old entries)
+
+function addLog(entries) {{
+  const log = document.getElementById('log');
+  entries.filter(e => e.seq > lastSeq).forEach(e => {{
+    lastSeq = e.seq;
+    const line = document.createElement('div');
+    line.textContent = e.day + "  " + String(e.ms).padStart(6) + " ms  " +
+      (e.error ? "ERROR " + e.error : e.games + " new");
+    if (e.error || e.ms > SLOW_MS) line.className = "slow";
+    log.appendChild(line);
+  }});
+  log.scrollTop = log.scrollHeight;
+}}
+
+function finish(job) {{
+  document.getElementById('msg').textContent = job.message || describe(job);
+  setTimeout(() => window.location.reload(), 2500);  // refresh to update timestamps
+}}
+
+// Follow a job over Server-Sent Events; fall back to polling.
+function watchJob(id) {{
+  const msg = document.getElementById('msg');
+  document.getElementById('log').textContent = "";
+  lastSeq = 0;
+  if (!window.EventSource) return pollJob(id);
+  let last = null;
+  const es = new EventSource("/nhl/jobs/" + id + "/stream");
+  es.addEventListener("progress", ev => {{
+    last = JSON.parse(ev.data);
+    addLog(last.log || []);
+    msg.textContent = describe(last);
+    msg.className = (last.fetch_age * 1000 > SLOW_MS) ? "slow" : "";
+  }});
+  es.addEventListener("end", () => {{ es.close(); if (last) finish(last); }});
+  es.onerror = () => {{ es.close(); pollJob(id); }};
+}}
+
+async function pollJob(id) {{
+  const msg = document.getElementById('msg');
+  while (true) {{
+    const r = await fetch("/nhl/jobs/" + id);
+    const job = await r.json();
+    addLog(job.log || []);
+    if (job.state === "done" || job.state === "error") return finish(job);
+    msg.textContent = describe(job);
+    await new Promise(res => setTimeout(res, 1000));
+  }}
+}}
+
 async function runUpdate(endpoint, label) {{
   const msg = document.getElementById('msg');
   msg.textContent = "Updating " + label + "...";
@@ -84,6 +101,10 @@ async function runUpdate(endpoint, label) {{
     const r = await fetch(endpoint, {{ method: "POST" }});
     const j = await r.json();
     msg.textContent = j.message || "Done!";
+    if (j.job) {{
+      watchJob(j.job);   // background job: follow its progress
+      return;
+    }}
     setTimeout(() => msg.textContent = "", 4000);
     setTimeout(() => window.location.reload(), 1000);  // refresh to update timestamps
   }} catch (e) {{
@@ -91,14 +112,13 @@ async function runUpdate(endpoint, label) {{
   }}
 }}
 </script>
-</head>
-<body>
 
 <a href="/nhl/more" class="back">← Back</a>
-<h2>NHL Data Updater</h2>
+<h2>NHL Data Updater: {SEASON['label']} season</h2>
 
 <div class="row">
   <button onclick="runUpdate('/nhl/update-results','Completed Games')">Update Completed Games</button>
+  <button onclick="runUpdate('/nhl/update-results?force=1','Completed Games')">Full Rescan</button>
   <span class="stamp">Last updated: {results_time}</span>
 </div>
 
@@ -122,7 +142,12 @@ async function runUpdate(endpoint, label) {{
   <span class="stamp">Last updated: {stats_time}</span>
 </div>
 
-<div id="msg"></div>
+<div class="row">
+  <button onclick="runUpdate('/nhl/compact-stats','Stats history')">Compact Stats History</button>
+  <span class="stamp">Last updated: {history_time}</span>
+</div>
 
-</body></html>"""
-    return make_response(html)
+<div id="msg"></div>
+<pre id="log"></pre>
+"""
+    return make_response(page(html, "nhl pg-updater"))
@@ -0,0 +1,145 @@
+# nhl_routes/upstream.py
+# Conditional-GET layer for upstream JSON (ESPN / NHL APIs).
+# Per URL we keep the validators (ETag / Last-Modified) and a hash of the last
+# body. A 304, or a 200 whose body hashes the same as last time, is
+# "unchanged": callers either get the cached parsed payload back or, with
+# skip_unchanged=True, no payload at all, so the JSON is never re-parsed.
+# Validators + hashes persist in cache/http_validators.json (shared by
+# restarts and workers); parsed payloads are kept in memory only.
+# Each consumer passes its own scope ("results", "scoreboard", ...): a body
+# one consumer has already seen may still be news to another.
+# With archive=<endpoint>, new bodies are also kept compressed (archive.py);
+# a day with nothing archived yet is fetched unconditionally and stored even
+# if its body is unchanged, so days scanned before the archive existed fill in.
+import hashlib, json, os, threading, time
+from collections import OrderedDict
+from urllib.parse import urlencode
+import requests
+from .lease import atomic_write
+from . import archive as raw_archive
+from espn import loads
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+VALIDATORS_FILE = os.path.join(CACHE_DIR, "http_validators.json")
+MAX_PAYLOADS = 64           # parsed payloads kept in memory (LRU)
+
+_lock = threading.Lock()
+_validators = None          # url -> {"etag", "last_modified", "hash"}
+_payloads = OrderedDict()   # url -> parsed JSON
+_dirty = False
+stats = {"requests": 0, "not_modified": 0, "unchanged_body": 0, "parsed": 0, "skipped_parse": 0}
+
+
+def _load():
+    global _validators
+    if _validators is None:
+        try:
+            with open(VALIDATORS_FILE) as f:
+                _validators = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _validators = {}
+    return _validators
+
+
+def save():
+    """Persist validators (call after a batch of fetches)."""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        atomic_write(VALIDATORS_FILE, json.dumps(_load()))
+        _dirty = False
+
+
+def _key(scope, url, params):
+    url = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+    return f"{scope}|{url}"
+
+
+def _store(archive, day, body):
+    try:
+        raw_archive.store(archive, day, body)
+    except OSError as e:
+        print(f"[Upstream] archive {archive} failed: {e}")
+
+
+def get_json(url, params=None, timeout=10, scope="default", skip_unchanged=False, archive=None):
+    """GET url and return (data, changed).
+
+    changed=False means the body is identical to the previous fetch; data is
+    then the cached payload, or None when skip_unchanged=True.
+    archive names the endpoint the raw body is archived under (dated by
+    params["dates"], else today). Raises like requests on HTTP errors."""
+    global _dirty
+    key = _key(scope, url, params)
+    with _lock:
+        entry = dict(_load().get(key, {}))
+        cached = None if skip_unchanged else _payloads.get(key)
+    can_skip = skip_unchanged or cached is not None
+    day = (params or {}).get("dates")
+    missing = archive is not None and not raw_archive.has(archive, day)
+
+    headers = {}
+    if can_skip and not missing:  # a 304 has no body to archive
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    resp = requests.get(url, params=params, headers=headers, timeout=timeout)
+    with _lock:
+        stats["requests"] += 1
+    if resp.status_code == 304:
+        with _lock:
+            stats["not_modified"] += 1
+            stats["skipped_parse"] += 1
+        return cached, False
+    resp.raise_for_status()
+
+    body_hash = hashlib.blake2b(resp.content, digest_size=16).hexdigest()
+    new_entry = {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "hash": body_hash,
+    }
+    if can_skip and entry.get("hash") == body_hash:
+        if missing:
+            _store(archive, day, resp.content)
+        with _lock:
+            stats["unchanged_body"] += 1
+            stats["skipped_parse"] += 1
+            if new_entry != entry:
+                _validators[key] = new_entry
+                _dirty = True
+        return cached, False
+
+    data = loads(resp.content)
+    if archive:
+        _store(archive, day, resp.content)
+    with _lock:
+        stats["parsed"] += 1
+        _validators[key] = new_entry
+        _dirty = True
+        if not skip_unchanged:  # skip-callers never need the old payload back
+            _payloads[key] = data
+            _payloads.move_to_end(key)
+            while len(_payloads) > MAX_PAYLOADS:
+                _payloads.popitem(last=False)
+    return data, True
+
+
+def forget(url, params=None, scope="default"):
+    """Drop what we know about url (forces a full fetch + parse next time)."""
+    global _dirty
+    key = _key(scope, url, params)
+    with _lock:
+        if _load().pop(key, None) is not None:
+            _dirty = True
+        _payloads.pop(key, None)
+
+
+def stats_snapshot():
+    with _lock:
+        return dict(stats, urls=len(_load()), payloads=len(_payloads), at=time.time())
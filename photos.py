@@ -3,7 +3,8 @@ from flask import Blueprint, request, redirect, url_for
 from werkzeug.utils import secure_filename
 from PIL import Image
 import os, random
-from utils import TH3, TH1, TH2
+from utils import TH1
+from layout import page
 
 photos_bp = Blueprint('photos', __name__)
 
@@ -33,21 +34,14 @@ def cats():
         files = []
 
     if not files:
-        return f"""
-        <!DOCTYPE html><html><head>
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <style>
-          body{{background:{TH3};color:#eee;font-family:monospace;margin:0;padding:1em;text-align:center}}
-          a{{color:{TH1};text-decoration:none;display:inline-block;margin:1em}}
-        </style>
-        </head><body>
+        html = f"""
           <a href="/">← MENU</a>
           <h2>🐈 Gallery</h2>
           <p>No images found in <code>static/cats</code>.</p>
           <a href="/cats/upload" style="background:{TH1};color:#000;padding:0.5em 1em;border:none;border-radius:6px;text-decoration:none;">Upload</a>
-          <p class="msg" style="color:{TH2};font-weight:bold;margin:1em 0;">{msg}</p>
-        </body></html>
+          <p class="msg">{msg}</p>
         """
+        return page(html, "pg-photos")
 
     # --- Load last 10 used photos ---
     prev_batch = []
@@ -69,22 +63,11 @@ def cats():
 
     # --- Build HTML ---
     imgs = "\n".join(
-        f'<img loading="lazy" src="{url_for("static", filename=f"cats/{name}")}" '
-        f'style="width:min(900px,96%);max-width:100%;margin:0.75em auto;display:block;border-radius:12px;"/>'
+        f'<img loading="lazy" src="{url_for("static", filename=f"cats/{name}")}"/>'
         for name in sample
     )
 
     html = f"""
-    <!DOCTYPE html><html><head>
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-      body{{background:{TH3};color:#eee;font-family:monospace;margin:0;padding:1em;text-align:center}}
-      a{{color:{TH1};text-decoration:none;display:inline-block;margin:1em;font-size:1.6em}}
-      h2{{margin:0.5em 0 0.25em}}
-      .buttons{{margin:1em 0}}
-      .msg{{color:{TH2};font-weight:bold;margin:1em 0;}}
-    </style>
-    </head><body>
       <div class="buttons">
         <a href="/">← BACK TO MENU</a>
         <a href="/cats?shuffle=1">🔀 SHUFFLE</a>
@@ -99,9 +82,8 @@ def cats():
         <a href="/cats?shuffle=1">🔀 SHUFFLE</a>
         <a href="/cats/upload">📤 Upload</a>
       </div>
-    </body></html>
     """
-    return html
+    return page(html, "pg-photos")
 
 
 @photos_bp.route("/cats/upload", methods=['GET', 'POST'])
@@ -136,18 +118,7 @@ def cats_upload():
             msg = "No valid files uploaded."
         return redirect(url_for('photos.cats') + f'?msg={msg}')
 
-    html = f"""
-    <!DOCTYPE html><html><head>
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-      body{{background:{TH3};color:#eee;font-family:monospace;margin:0;padding:1em;text-align:center}}
-      a{{color:{TH1};text-decoration:none;display:inline-block;margin:1em}}
-      form{{margin:2em 0;}}
-      input[type="file"]{{margin:1em 0;}}
-      button{{background:{TH1};color:#000;padding:0.7em 1.5em;border:none;border-radius:6px;font-size:1.2em;}}
-      .note{{opacity:0.7;font-size:0.9em;margin-top:1em;}}
-    </style>
-    </head><body>
+    html = """
       <a href="/cats">← Back to Gallery</a>
       <h2>Upload Photos</h2>
       <form method="post" enctype="multipart/form-data">
@@ -158,6 +129,5 @@ def cats_upload():
         <button type="submit">Upload</button>
     </form>
       <a href="/">← MENU</a>
-    </body></html>
     """
-    return html
+    return page(html, "pg-photos")
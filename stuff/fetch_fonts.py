@@ -0,0 +1,27 @@
+# stuff/fetch_fonts.py
+# One-time download of the Rajdhani 600 (latin) woff2 into static/fonts/,
+# so pages never hit fonts.googleapis.com at runtime.
+# Run from the project root on a machine with internet:  python stuff/fetch_fonts.py
+import os, re, requests
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT_DIR = os.path.join(BASE_DIR, "static", "fonts")
+OUT_FILE = os.path.join(OUT_DIR, "rajdhani-600.woff2")
+CSS_URL = "https://fonts.googleapis.com/css2?family=Rajdhani:wght@600&display=swap"
+# Google only hands out woff2 to browsers it recognises
+UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+def main():
+    css = requests.get(CSS_URL, headers={"User-Agent": UA}, timeout=10).text
+    # blocks look like: /* latin */ @font-face { ... src: url(...woff2) ... }
+    blocks = re.findall(r"/\* (\S+) \*/\s*@font-face\s*{(.*?)}", css, re.S)
+    urls = {name: re.search(r"url\((.*?)\)", body).group(1) for name, body in blocks}
+    url = urls.get("latin") or next(iter(urls.values()))
+    data = requests.get(url, timeout=10).content
+    os.makedirs(OUT_DIR, exist_ok=True)
+    with open(OUT_FILE, "wb") as f:
+        f.write(data)
+    print(f"Saved {len(data)} bytes to {OUT_FILE}")
+
+if __name__ == "__main__":
+    main()
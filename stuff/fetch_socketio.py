@@ -0,0 +1,21 @@
+# stuff/fetch_socketio.py
+# One-time download of the Socket.IO browser client into static/js/, so the
+# scoreboard's live updates and the chat never load cdn.socket.io at runtime.
+# Run from the project root on a machine with internet:  python stuff/fetch_socketio.py
+import os, requests
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT_DIR = os.path.join(BASE_DIR, "static", "js")
+OUT_FILE = os.path.join(OUT_DIR, "socket.io.min.js")
+URL = "https://cdn.socket.io/4.7.5/socket.io.min.js"   # client must match the server's protocol (v5)
+
+def main():
+    resp = requests.get(URL, timeout=10)
+    resp.raise_for_status()
+    os.makedirs(OUT_DIR, exist_ok=True)
+    with open(OUT_FILE, "wb") as f:
+        f.write(resp.content)
+    print(f"Saved {len(resp.content)} bytes to {OUT_FILE}")
+
+if __name__ == "__main__":
+    main()
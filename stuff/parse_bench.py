@@ -0,0 +1,136 @@
+# stuff/parse_bench.py
+# Benchmark espn.parse_events against the old per-event code on a full
+# season of scoreboard payloads.
+# Run from the project root:  python stuff/parse_bench.py [rounds]
+# Uses archive/scoreboard/*.json.gz when present (see nhl_routes/archive.py),
+# otherwise a synthetic 2025-26 season shaped like ESPN's payloads.
+import datetime, gzip, json, os, random, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import espn
+from espn import parse_events
+
+ARCHIVE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "archive", "scoreboard")
+TEAMS = ["ANA", "BOS", "BUF", "CGY", "CAR", "CHI", "COL", "CBJ", "DAL", "DET", "EDM", "FLA", "LA", "MIN",
+         "MTL", "NSH", "NJ", "NYI", "NYR", "OTT", "PHI", "PIT", "SJ", "SEA", "STL", "TB", "TOR", "UTA",
+         "VAN", "VGK", "WSH", "WPG"]
+
+
+def synthetic_season():
+    rng = random.Random(7)
+    bodies = []
+    gid = 401800000
+    d = datetime.date(2025, 10, 7)
+    while d <= datetime.date(2026, 4, 16):
+        events = []
+        teams = TEAMS[:]
+        rng.shuffle(teams)
+        for i in range(rng.randint(2, 8)):
+            gid += 1
+            short = rng.choice(["Final"] * 8 + ["Final/OT", "Final/SO"])
+            status = {"type": {"id": "3", "name": "STATUS_FINAL", "state": "post", "completed": True,
+                               "description": "Final", "detail": short, "shortDetail": short},
+                      "period": 3, "clock": 0.0, "displayClock": "0:00"}
+            comp = {"id": str(gid), "status": status, "venue": {"fullName": "Arena " * 3, "address": {"city": "X"}},
+                    "broadcasts": [{"market": "national", "names": ["ESPN+", "SN"]}] * 2,
+                    "competitors": [
+                        {"id": str(i), "homeAway": side, "score": str(rng.randint(0, 6)),
+                         "team": {"abbreviation": t, "displayName": t * 4, "logo": f"https://a.espncdn.com/{t}.png",
+                                  "color": "000000", "links": [{"href": "https://espn.com/nhl/team"}] * 4},
+                         "statistics": [{"name": n, "displayValue": "1"} for n in ("saves", "goals", "assists", "points")],
+                         "leaders": [{"name": "goals", "leaders": [{"value": 1.0, "athlete": {"fullName": "P " * 5}}]}],
+                         "records": [{"summary": "10-5-2"}] * 3}
+                        for side, t in (("home", teams[2 * i]), ("away", teams[2 * i + 1]))]}
+            events.append({"id": str(gid), "date": f"{d.isoformat()}T01:00Z", "name": "A at B",
+                           "season": {"year": 2026, "type": 2, "slug": "regular-season"},
+                           "competitions": [comp], "status": status,
+                           "links": [{"href": "https://espn.com/nhl/game"}] * 6})
+        bodies.append((d, json.dumps({"leagues": [{"name": "NHL"}], "events": events}).encode()))
+        d += datetime.timedelta(days=1)
+    return bodies
+
+
+def load_season():
+    if os.path.isdir(ARCHIVE) and os.listdir(ARCHIVE):
+        out = []
+        for name in sorted(os.listdir(ARCHIVE)):
+            with gzip.open(os.path.join(ARCHIVE, name), "rb") as f:
+                out.append((datetime.datetime.strptime(name[:8], "%Y%m%d").date(), f.read()))
+        return out, "archive"
+    return synthetic_season(), "synthetic"
+
+
+def legacy_lines(body, d, tz=espn.TZ):
+    """The per-event results code as it was before espn.py (json + string scans)."""
+    out = []
+    data = json.loads(body)
+    for ev in data.get("events", []):
+        gid = ev.get("id")
+        st = ev.get("status", {}).get("type", {})
+        if "final" not in (st.get("description") or "").lower():
+            continue
+        if ev.get("season", {}).get("type") != 2:
+            continue
+        comp = ev.get("competitions", [{}])[0]
+        detail_text = " ".join([
+            str(st.get(x, "")) for x in ("shortDetail", "detail", "description")
+        ] + [
+            str(comp.get("status", {}).get("type", {}).get(x, "")) for x in ("shortDetail", "detail", "description")
+        ]).lower()
+        note = "SO" if ("shootout" in detail_text or " so" in detail_text or "/so" in detail_text) \
+            else ("OT" if ("overtime" in detail_text or " ot" in detail_text or "/ot" in detail_text) else "")
+        teams = comp.get("competitors", [])
+        if len(teams) < 2:
+            continue
+        home = next((t for t in teams if t.get("homeAway") == "home"), {})
+        away = next((t for t in teams if t.get("homeAway") == "away"), {})
+        raw_date = ev.get("date", "")
+        date_str = datetime.datetime.fromisoformat(raw_date.replace("Z", "+00:00")).astimezone(tz).strftime("%Y-%m-%d") \
+            if raw_date else d.strftime("%Y-%m-%d")
+        line = f"{gid} {date_str} {away['team']['abbreviation']} {away.get('score', '?')} @ " \
+               f"{home['team']['abbreviation']} {home.get('score', '?')}"
+        out.append(line + (f" {note}" if note else ""))
+    return out
+
+
+def new_lines(body, d, tz=espn.TZ):
+    out = []
+    for g in parse_events(body):
+        if g.state != "final":
+            continue
+        local = g.start_local(tz)
+        line = f"{g.gid} {(local.date() if local else d):%Y-%m-%d} {g.away} {g.a_score} @ {g.home} {g.h_score}"
+        out.append(line + (f" {g.note}" if g.note else ""))
+    return out
+
+
+def timed(fn, season, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for d, body in season:
+            fn(body, d)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    season, source = load_season()
+    games = sum(len(json.loads(b).get("events", [])) for _, b in season)
+    mb = sum(len(b) for _, b in season) / 1e6
+    print(f"{source} season: {len(season)} days, {games} events, {mb:.1f} MB; "
+          f"decoder: {espn.loads.__module__}")
+
+    mismatched = [d for d, b in season if legacy_lines(b, d) != new_lines(b, d)]
+    print(f"output identical on {len(season) - len(mismatched)}/{len(season)} days"
+          + (f" (first diff {mismatched[0]})" if mismatched else ""))
+
+    old = timed(legacy_lines, season, rounds)
+    new = timed(new_lines, season, rounds)
+    print(f"{'legacy per-event code':<24}{old * 1000:9.1f} ms/season")
+    print(f"{'espn.parse_events':<24}{new * 1000:9.1f} ms/season   ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# stuff/render_bench.py
+# Time every page through the Flask test client.
+# Run from the project root:  python stuff/render_bench.py [iterations] [rounds]
+# (compare two checkouts by running it on each; ms/req is the best round)
+# Pages that call upstream (/nhl, /weather) get canned bodies from a
+# stand-in requests.get, so only their parse + render time is measured.
+import datetime, json, os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+# Every route built on the shared page shell (layout.py)
+ROUTES = [
+    "/",
+    "/nhl",
+    "/nhl/standings",
+    "/nhl/stats",
+    "/nhl/more",
+    "/nhl/results",
+    "/nhl/results/oct2025",
+    "/nhl/results/nov2025",
+    "/nhl/results/dec2025",
+    "/nhl/results/jan2026",
+    "/nhl/results/feb2026",
+    "/nhl/results/mar2026",
+    "/nhl/results/apr2026",
+    "/nhl/updater",
+    "/weather",
+    "/game",
+    "/game/prepare",
+    "/game/choose",
+    "/game/play?move=rock",
+    "/cats",
+    "/cats/upload",
+]
+
+
+def _scoreboard():
+    teams = ["EDM", "CGY", "VAN", "SEA", "TOR", "MTL", "BOS", "NYR"]
+    events = []
+    for i, state in enumerate(("post", "in", "pre", "pre")):
+        status = {"type": {"state": state, "description": {"post": "Final", "in": "In Progress",
+                                                           "pre": "Scheduled"}[state],
+                           "detail": "Final/OT" if i == 0 else "", "shortDetail": "Final/OT" if i == 0 else ""},
+                  "period": 2 if state == "in" else 0, "displayClock": "12:04" if state == "in" else ""}
+        events.append({"id": str(401800000 + i), "date": f"{datetime.date.today()}T01:00Z",
+                       "season": {"type": 2}, "status": status,
+                       "competitions": [{"status": status, "competitors": [
+                           {"homeAway": "home", "score": "3", "team": {"abbreviation": teams[2 * i]}},
+                           {"homeAway": "away", "score": "2", "team": {"abbreviation": teams[2 * i + 1]}}]}]})
+    return {"events": events}
+
+
+def _weather():
+    days = [(datetime.date.today() + datetime.timedelta(days=i)).isoformat() for i in range(7)]
+    return {"current_weather": {"temperature": -5.2, "windspeed": 12.0, "winddirection": 270, "weathercode": 3},
+            "hourly": {"time": days, "relative_humidity_2m": [70] * 7},
+            "daily": {"time": days, "temperature_2m_max": [1.0] * 7, "temperature_2m_min": [-8.0] * 7,
+                      "weathercode": [3] * 7}}
+
+
+class _Response:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, data):
+        self._data = data
+        self.content = json.dumps(data).encode()
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+def _canned_get(url, *args, **kwargs):
+    if "open-meteo" in url:
+        return _Response(_weather())
+    if "scoreboard" in url:
+        return _Response(_scoreboard())
+    raise requests.ConnectionError(f"render_bench: no canned body for {url}")
+
+
+requests.get = _canned_get
+from app import app
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    client = app.test_client()
+    print(f"{'route':<26}{'ms/req':>10}{'bytes':>10}")
+    for path in ROUTES:
+        client.get(path)  # warm-up
+        best = None
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            for _ in range(n):
+                r = client.get(path)
+            ms = (time.perf_counter() - t0) * 1000 / n
+            best = ms if best is None else min(best, ms)
+        print(f"{path:<26}{best:>10.3f}{len(r.data):>10}")
+
+if __name__ == "__main__":
+    main()
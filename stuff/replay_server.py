@@ -0,0 +1,169 @@
+# stuff/replay_server.py
+# Local stand-in for the ESPN / NHL / Open-Meteo APIs (no internet needed).
+# Serves recorded payloads with injectable latency and errors so the
+# updater, scoreboard and weather paths can be benchmarked deterministically.
+#
+#   python stuff/replay_server.py [--port 8765] [--latency 80] [--jitter 40]
+#                                 [--error-rate 0.02] [--seed 1] [--record]
+#   UPSTREAM_BASE=http://127.0.0.1:8765 python app.py      (see endpoints.py)
+#
+# Payloads come from:
+#   .../nhl/scoreboard?dates=D      archive/scoreboard/D.json.gz (nhl_routes/archive.py)
+#   .../skater-stats-leaders/...    newest archive/stats/*.json.gz
+#   anything else                   fixtures/<path>/<query>.json.gz
+# Unknown scoreboard days answer {"events": []}; other misses are 404, or
+# with --record are fetched once from the real host and saved as fixtures.
+# Responses carry an ETag and honour If-None-Match, like a caching upstream.
+import argparse, gzip, hashlib, os, random, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from urllib.request import urlopen
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_DIR = os.path.join(BASE_DIR, "archive")
+FIXTURES_DIR = os.path.join(BASE_DIR, "fixtures")
+
+# real hosts by path prefix (for --record)
+REAL_HOSTS = [
+    ("/apis/", "https://site.api.espn.com"),
+    ("/v1/forecast", "https://api.open-meteo.com"),
+    ("/v1/", "https://api-web.nhle.com"),
+]
+EMPTY_DAY = gzip.compress(b'{"events": []}')
+
+
+class Replay:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=None, record=False):
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.error_rate = error_rate
+        self.record = record
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "errors": 0, "not_modified": 0, "misses": 0}
+
+    def fixture_path(self, path, query):
+        q = urlencode(sorted(parse_qsl(query))) or "_"
+        return os.path.join(FIXTURES_DIR, path.strip("/"), re.sub(r"[^\w.=-]", "_", q) + ".json.gz")
+
+    def lookup(self, path, query):
+        """-> gzip body or None."""
+        params = dict(parse_qsl(query))
+        if path.endswith("/nhl/scoreboard"):
+            day = params.get("dates")
+            if day:
+                try:
+                    with open(os.path.join(ARCHIVE_DIR, "scoreboard", f"{day}.json.gz"), "rb") as f:
+                        return f.read()
+                except FileNotFoundError:
+                    pass
+        if "skater-stats-leaders" in path:
+            folder = os.path.join(ARCHIVE_DIR, "stats")
+            names = sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+            if names:
+                with open(os.path.join(folder, names[-1]), "rb") as f:
+                    return f.read()
+        fixture = self.fixture_path(path, query)
+        if os.path.exists(fixture):
+            with open(fixture, "rb") as f:
+                return f.read()
+        if self.record:
+            return self.fetch_and_save(path, query, fixture)
+        if path.endswith("/nhl/scoreboard"):
+            return EMPTY_DAY
+        return None
+
+    def fetch_and_save(self, path, query, fixture):
+        host = next((h for prefix, h in REAL_HOSTS if path.startswith(prefix)), None)
+        if host is None:
+            return None
+        with urlopen(f"{host}{path}" + (f"?{query}" if query else ""), timeout=15) as r:
+            body = gzip.compress(r.read())
+        os.makedirs(os.path.dirname(fixture), exist_ok=True)
+        with open(fixture, "wb") as f:
+            f.write(body)
+        print(f"[Replay] recorded {path}?{query}")
+        return body
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def delay_and_fail(self):
+        """Sleep the injected latency; return True if this request should fail."""
+        with self.lock:
+            wait = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            fail = self.rng.random() < self.error_rate
+        self.count("requests")
+        if fail:
+            self.count("errors")
+        time.sleep(wait)
+        return fail
+
+
+def make_handler(replay, quiet):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == "/_replay/stats":
+                return self.send(200, repr(replay.counts).encode(), "text/plain")
+            if replay.delay_and_fail():
+                return self.send(503, b'{"error": "injected"}')
+            body = replay.lookup(url.path, url.query)
+            if body is None:
+                replay.count("misses")
+                return self.send(404, b'{"error": "no fixture"}')
+
+            etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                replay.count("not_modified")
+                return self.send(304, b"", etag=etag)
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                return self.send(200, body, etag=etag, encoding="gzip")
+            return self.send(200, gzip.decompress(body), etag=etag)
+
+        def send(self, status, body, ctype="application/json", etag=None, encoding=None):
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            if etag:
+                self.send_header("ETag", etag)
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            if not quiet:
+                super().log_message(fmt, *args)
+
+    return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Replay recorded ESPN/NHL/Open-Meteo payloads locally.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="mean added latency (ms)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="+/- uniform jitter (ms)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    ap.add_argument("--seed", type=int, default=None, help="seed for latency/error draws")
+    ap.add_argument("--record", action="store_true", help="fetch + save fixtures on a miss")
+    ap.add_argument("--quiet", action="store_true")
+    args = ap.parse_args()
+
+    replay = Replay(args.latency, args.jitter, args.error_rate, args.seed, args.record)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(replay, args.quiet))
+    print(f"[Replay] serving on http://{args.host}:{args.port}  "
+          f"(latency {args.latency}±{args.jitter} ms, errors {args.error_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"[Replay] {replay.counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 # weather.py
 from flask import Blueprint, make_response
 import requests, datetime, zoneinfo, textwrap
-from utils import TH3, TH1
+from layout import page
+from endpoints import METEO_FORECAST
 
 weather_bp = Blueprint('weather', __name__)
 
@@ -9,7 +10,7 @@ weather_bp = Blueprint('weather', __name__)
 def weather():
     lat, lon = 53.5461, -113.4938
     url = (
-        "https://api.open-meteo.com/v1/forecast?"
+        f"{METEO_FORECAST}?"
         f"latitude={lat}&longitude={lon}"
         "&current_weather=true"
         "&hourly=relative_humidity_2m"
@@ -94,43 +95,11 @@ def weather():
     lines.append(f"Last updated {now} MST")
 
     html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<meta http-equiv="refresh" content="600">
-<style>
-  body {{
-    background:{TH3};
-    color:#eee;
-    font-family: monospace;
-    margin:0;
-    font-size:1.3em;
-    padding:1em;
-    text-align:left;
-  }}
-  a {{
-    color:{TH1};
-    text-decoration:none;
-    display:inline-block;
-    margin-bottom:1em;
-  }}
-  pre {{
-    font-size: clamp(15px, 3vw, 18px);
-    line-height: 1.6em;
-    white-space: pre-wrap;
-    word-break: break-word;
-  }}
-</style>
-</head>
-<body>
   <a href="/">← MENU</a>
   <pre>{textwrap.dedent(chr(10).join(lines))}</pre>
-</body>
-</html>
 """
 
-    response = make_response(html)
+    response = make_response(page(html, "pg-weather", head='<meta http-equiv="refresh" content="600">\n'))
     response.headers["Cache-Control"] = "public, max-age=600"
     response.headers["Pragma"] = "cache"
     response.headers["Expires"] = "90"